@@ -0,0 +1,86 @@
+"""
+Measure how much memory a graph's vertices and edges take up.
+
+The current Vertex and WeightedVertex classes are compared against the
+layout they replaced, rebuilt below: a plain object with a __dict__ and a
+dictionary of neighbor id -> vertex (or -> (vertex, weight) tuple).
+
+Run from the root of the repository:
+    python -m benchmarks.memory_benchmark [num_vertices] [edges_per_vertex]
+"""
+import random
+import sys
+import tracemalloc
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+
+class DictVertex(object):
+    """A vertex that stores its neighbors in a dictionary (the old layout)."""
+
+    def __init__(self, vertex_id):
+        self.id = vertex_id
+        self.neighbors_dict = {}
+
+    def add_neighbor(self, vertex_obj, weight=None):
+        if weight is None:
+            self.neighbors_dict[vertex_obj.id] = vertex_obj
+        else:
+            self.neighbors_dict[vertex_obj.id] = (vertex_obj, weight)
+
+
+def make_edges(vertex_ids, edges_per_vertex, seed=0):
+    """Return random (source, target, weight) triples."""
+    generator = random.Random(seed)
+    return [
+        (source, generator.choice(vertex_ids), generator.random())
+        for source in vertex_ids
+        for _ in range(edges_per_vertex)
+    ]
+
+
+def build_dict_graph(vertex_ids, edges, weighted):
+    """Build a graph out of DictVertex objects."""
+    vertex_dict = {vertex_id: DictVertex(vertex_id) for vertex_id in vertex_ids}
+    for source, target, weight in edges:
+        vertex_dict[source].add_neighbor(
+            vertex_dict[target], weight if weighted else None)
+    return vertex_dict
+
+
+def build_graph(vertex_ids, edges, weighted):
+    """Build a Graph or WeightedGraph."""
+    graph = WeightedGraph() if weighted else Graph()
+    graph.add_vertices(vertex_ids)
+    if weighted:
+        graph.add_edges(edges)
+    else:
+        graph.add_edges((source, target) for source, target, _ in edges)
+    return graph
+
+
+def measure(build, *args):
+    """Return the bytes still allocated after calling build(*args)."""
+    tracemalloc.start()
+    result = build(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main(num_vertices=20000, edges_per_vertex=50):
+    vertex_ids = [f'v{i}' for i in range(num_vertices)]
+    edges = make_edges(vertex_ids, edges_per_vertex)
+    print(f'{num_vertices} vertices, {len(edges)} edges')
+    for weighted in (False, True):
+        old_size = measure(build_dict_graph, vertex_ids, edges, weighted)
+        new_size = measure(build_graph, vertex_ids, edges, weighted)
+        label = 'weighted' if weighted else 'unweighted'
+        print(f'{label:>10}: dict layout {old_size / len(edges):6.1f} B/edge, '
+              f'array layout {new_size / len(edges):6.1f} B/edge '
+              f'({old_size / new_size:.1f}x smaller)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -164,6 +164,158 @@ class BinaryMinHeap(object):
         return (index << 1) + 2  # Shift left to multiply by 2
 
 
+class IndexedBinaryMinHeap(BinaryMinHeap):
+    """IndexedBinaryMinHeap: a BinaryMinHeap of (priority, key) pairs which
+       also remembers the index of every key in the underlying array.
+       The position index makes it possible to look up and lower the
+       priority of a key that is already in the heap (decrease-key) in
+       O(log n) time, instead of inserting a second, stale entry for it.
+       Keys must be hashable, and each key can be in the heap only once.
+       Only the priorities are ever compared, so keys need not be orderable.
+    """
+
+    def __init__(self, items=None):
+        """Initialize this heap and insert the given (priority, key) pairs,
+           if any."""
+        # Map each key -> its index in self.items
+        self.positions = {}
+        super().__init__(items)
+
+    def __repr__(self):
+        """Return a string representation of this heap."""
+        return 'IndexedBinaryMinHeap({})'.format(self.items)
+
+    def __contains__(self, key):
+        """Return True if the given key is in this heap. Running time: O(1)"""
+        return key in self.positions
+
+    def get_priority(self, key):
+        """Return the priority currently stored for the given key.
+           Running time: O(1)"""
+        if key not in self.positions:
+            raise KeyError('Key {} is not in the heap'.format(key))
+        return self.items[self.positions[key]][0]
+
+    def insert(self, item):
+        """Insert the given (priority, key) pair into this heap.
+           Best case running time: O(1), if the priority is the largest so far
+           Worst case running time: O(log(n)), if the priority is the smallest
+                                    so far in the heap
+        """
+        priority, key = item
+        if key in self.positions:
+            raise ValueError('Key {} is already in the heap'.format(key))
+        self.items.append((priority, key))
+        self.positions[key] = self._last_index()
+        self._bubble_up(self._last_index())
+
+    def delete_min(self):
+        """Remove and return the (priority, key) pair with the minimum
+           priority in this heap.
+           Worst case running time: O(log(n)), to bubble the last item down.
+        """
+        if self.size() == 0:
+            raise ValueError('Heap is empty and has no minimum item')
+        min_item = self.items[0]
+        del self.positions[min_item[1]]
+        # Move the last item to the root and bubble down to the leaves
+        last_item = self.items.pop()
+        if self.size() > 0:
+            self.items[0] = last_item
+            self.positions[last_item[1]] = 0
+            self._bubble_down(0)
+        return min_item
+
+    def replace_min(self, item):
+        """Remove and return the minimum (priority, key) pair in this heap,
+           and insert the given pair into this heap.
+           Worst case running time: O(log n), to bubble the new item down.
+        """
+        if self.size() == 0:
+            raise ValueError('Heap is empty and has no minimum item')
+        priority, key = item
+        min_item = self.items[0]
+        if key in self.positions and key != min_item[1]:
+            raise ValueError('Key {} is already in the heap'.format(key))
+        del self.positions[min_item[1]]
+        # Replace the root and bubble down to the leaves
+        self.items[0] = (priority, key)
+        self.positions[key] = 0
+        self._bubble_down(0)
+        return min_item
+
+    def decrease_key(self, key, priority):
+        """Lower the priority of a key that is already in this heap.
+           Worst case running time: O(log n), to bubble the item up.
+        """
+        if key not in self.positions:
+            raise KeyError('Key {} is not in the heap'.format(key))
+        index = self.positions[key]
+        if priority > self.items[index][0]:
+            raise ValueError('New priority {} is larger than the current '
+                             'priority {}'.format(priority, self.items[index][0]))
+        self.items[index] = (priority, key)
+        self._bubble_up(index)
+
+    def insert_or_decrease(self, key, priority):
+        """Insert the key with the given priority, or lower its priority if
+           it is already in the heap with a larger one.
+           Return True if the heap changed, or False otherwise.
+           Worst case running time: O(log n)
+        """
+        if key not in self.positions:
+            self.insert((priority, key))
+            return True
+        if priority < self.items[self.positions[key]][0]:
+            self.decrease_key(key, priority)
+            return True
+        return False
+
+    def _bubble_up(self, index):
+        """Move the item at the given index up until its parent's priority is
+        no larger than its own, keeping the position index up to date.
+        Worst case running time: O(log n), when it bubbles up to the root."""
+        items, positions = self.items, self.positions
+        item = items[index]
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent_item = items[parent_index]
+            if not item[0] < parent_item[0]:
+                break
+            # Move the parent down one level, into the hole
+            items[index] = parent_item
+            positions[parent_item[1]] = index
+            index = parent_index
+        items[index] = item
+        positions[item[1]] = index
+
+    def _bubble_down(self, index):
+        """Move the item at the given index down until both of its children
+        have priorities no smaller than its own, keeping the position index
+        up to date.
+        Worst case running time: O(log n), when it bubbles down to a leaf."""
+        items, positions = self.items, self.positions
+        last = self._last_index()
+        item = items[index]
+        while True:
+            child_index = (index << 1) + 1
+            if child_index > last:
+                break  # This index is a leaf node
+            # Compare against the smaller of the two children
+            right_index = child_index + 1
+            if right_index <= last and items[right_index][0] < items[child_index][0]:
+                child_index = right_index
+            child_item = items[child_index]
+            if not child_item[0] < item[0]:
+                break
+            # Move the child up one level, into the hole
+            items[index] = child_item
+            positions[child_item[1]] = index
+            index = child_index
+        items[index] = item
+        positions[item[1]] = index
+
+
 def test_binary_min_heap():
     # Create a binary min heap of 7 items
     items = [9, 25, 86, 3, 29, 5, 55]
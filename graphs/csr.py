@@ -0,0 +1,394 @@
+from array import array
+from collections import deque
+from graphs.binaryheap import IndexedBinaryMinHeap
+
+
+def single_source_distances(offsets, targets, weights, start):
+    """
+    Return the shortest distance from one vertex to every vertex, working
+    directly on CSR arrays (see CSRGraph). Weighted graphs use Dijkstra's
+    Algorithm; unweighted graphs (weights is None) count hops with a BFS.
+
+    Parameters:
+    offsets (sequence<int>): V + 1 offsets into the targets array.
+    targets (sequence<int>): The neighbor index of every edge.
+    weights (sequence<float>): The weight of every edge, or None.
+    start (int): The index of the start vertex.
+
+    Returns:
+    array('d'): The distance to each vertex index (inf if it is unreachable).
+    """
+    num_vertices = len(offsets) - 1
+    distances = array('d', [float('inf')]) * num_vertices
+    distances[start] = 0
+    if weights is None:
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            next_distance = distances[current] + 1
+            for j in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[j]
+                if next_distance < distances[neighbor]:
+                    distances[neighbor] = next_distance
+                    queue.append(neighbor)
+        return distances
+    settled = bytearray(num_vertices)
+    heap = IndexedBinaryMinHeap()
+    heap.insert((0, start))
+    while not heap.is_empty():
+        min_distance, current = heap.delete_min()
+        settled[current] = 1
+        for j in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[j]
+            if settled[neighbor]:
+                continue
+            new_dist = min_distance + weights[j]
+            if new_dist < distances[neighbor]:
+                distances[neighbor] = new_dist
+                heap.insert_or_decrease(neighbor, new_dist)
+    return distances
+
+
+class CSRGraph(object):
+    """ CSRGraph Class
+    An immutable, array-backed (compressed sparse row) view of a Graph or
+    WeightedGraph.
+
+    Every vertex is given an integer index 0..V-1. The neighbors of the vertex
+    at index i are targets[offsets[i]:offsets[i + 1]], and (for weighted
+    graphs) the matching edge weights are weights[offsets[i]:offsets[i + 1]].
+    Undirected edges are stored once in each direction.
+    """
+
+    def __init__(self, vertex_ids, offsets, targets, weights=None,
+                 is_directed=True):
+        """
+        Initialize the view from already-built arrays.
+
+        Parameters:
+        vertex_ids (list): The id of the vertex at each integer index.
+        offsets (sequence<int>): V + 1 offsets into the targets array.
+        targets (sequence<int>): The neighbor index of every edge.
+        weights (sequence<float>): The weight of every edge, or None if the
+                                   graph is unweighted.
+        is_directed (boolean): Whether the graph is directed.
+        """
+        if len(offsets) != len(vertex_ids) + 1:
+            raise ValueError('There must be exactly one more offset than vertices.')
+        if weights is not None and len(weights) != len(targets):
+            raise ValueError('There must be exactly one weight per edge.')
+        self.__vertex_ids = vertex_ids
+        self.__offsets = offsets
+        self.__targets = targets
+        self.__weights = weights
+        self.__is_directed = is_directed
+        # id -> integer index
+        self.__index = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+
+    @property
+    def vertex_ids(self):
+        """The id of the vertex at each integer index."""
+        return self.__vertex_ids
+
+    @property
+    def offsets(self):
+        """V + 1 offsets into the targets (and weights) array."""
+        return self.__offsets
+
+    @property
+    def targets(self):
+        """The neighbor index of every edge, grouped by source vertex."""
+        return self.__targets
+
+    @property
+    def weights(self):
+        """The weight of every edge, or None if the graph is unweighted."""
+        return self.__weights
+
+    @property
+    def is_directed(self):
+        """Whether the graph is directed."""
+        return self.__is_directed
+
+    def is_weighted(self):
+        """Return True if this view stores edge weights."""
+        return self.__weights is not None
+
+    def num_vertices(self):
+        """Return the number of vertices in the graph."""
+        return len(self.__vertex_ids)
+
+    def num_edges(self):
+        """Return the number of stored edges (undirected edges count twice)."""
+        return len(self.__targets)
+
+    def contains_id(self, vertex_id):
+        """Return True if the vertex id is in the graph."""
+        return vertex_id in self.__index
+
+    def index_of(self, vertex_id):
+        """Return the integer index of the vertex with the given id."""
+        return self.__index[vertex_id]
+
+    def id_of(self, index):
+        """Return the id of the vertex at the given integer index."""
+        return self.__vertex_ids[index]
+
+    def get_neighbors(self, vertex_id):
+        """
+        Return the ids of the neighbors of a vertex.
+
+        Parameters:
+        vertex_id (string): The id of the vertex.
+
+        Returns:
+        list<string>: The ids of the vertex's neighbors.
+        """
+        i = self.__index[vertex_id]
+        targets, vertex_ids = self.__targets, self.__vertex_ids
+        return [
+            vertex_ids[targets[j]]
+            for j in range(self.__offsets[i], self.__offsets[i + 1])
+        ]
+
+    def get_neighbors_with_weights(self, vertex_id):
+        """
+        Return the neighbors of a vertex, along with the edge weights.
+
+        Parameters:
+        vertex_id (string): The id of the vertex.
+
+        Returns:
+        list<tuple>: (neighbor_id, weight) for every edge out of the vertex.
+        """
+        if self.__weights is None:
+            raise ValueError('This graph is not weighted.')
+        i = self.__index[vertex_id]
+        targets, weights = self.__targets, self.__weights
+        return [
+            (self.__vertex_ids[targets[j]], weights[j])
+            for j in range(self.__offsets[i], self.__offsets[i + 1])
+        ]
+
+    def transpose(self):
+        """
+        Return a new CSRGraph with every edge reversed, in O(V + E).
+        Undirected views are their own transpose, so they are returned as is.
+        """
+        if not self.__is_directed:
+            return self
+        offsets, targets, weights = self.__offsets, self.__targets, self.__weights
+        num_vertices = self.num_vertices()
+        # count the edges into each vertex, then turn the counts into offsets
+        reverse_offsets = array('q', [0]) * (num_vertices + 1)
+        for j in range(len(targets)):
+            reverse_offsets[targets[j] + 1] += 1
+        for i in range(num_vertices):
+            reverse_offsets[i + 1] += reverse_offsets[i]
+        # place each edge at the next free slot of its target's row
+        next_slot = array('q', reverse_offsets[:-1])
+        reverse_targets = array('i', [0]) * len(targets)
+        reverse_weights = None
+        if weights is not None:
+            reverse_weights = array('d', [0]) * len(targets)
+        for i in range(num_vertices):
+            for j in range(offsets[i], offsets[i + 1]):
+                slot = next_slot[targets[j]]
+                next_slot[targets[j]] = slot + 1
+                reverse_targets[slot] = i
+                if weights is not None:
+                    reverse_weights[slot] = weights[j]
+        return CSRGraph(self.__vertex_ids, reverse_offsets, reverse_targets,
+                        reverse_weights, is_directed=True)
+
+    def __str__(self):
+        """Return a string representation of the graph."""
+        return (f'CSRGraph with {self.num_vertices()} vertices '
+                f'and {self.num_edges()} edges')
+
+    def __repr__(self):
+        """Return a string representation of the graph."""
+        return self.__str__()
+
+    def _check_ids(self, *vertex_ids):
+        """Raise a KeyError if any of the vertex ids are not in the graph."""
+        for vertex_id in vertex_ids:
+            if vertex_id not in self.__index:
+                raise KeyError("One or both vertices are not in the graph!")
+
+    def _build_path(self, parents, target):
+        """Follow the parent indices back from target, and return the ids on
+           the path in order from the start to the target."""
+        path = list()
+        while target != -1:
+            path.append(self.__vertex_ids[target])
+            target = parents[target]
+        path.reverse()
+        return path
+
+    def bfs_traversal(self, start_id):
+        """
+        Traverse the graph using breadth-first search.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+
+        Returns:
+        list<string>: The ids of all reachable vertices, in the order visited.
+        """
+        self._check_ids(start_id)
+        offsets, targets = self.__offsets, self.__targets
+        start = self.__index[start_id]
+        # Keep a flag per index to denote which vertices we've seen before
+        seen = bytearray(self.num_vertices())
+        seen[start] = 1
+        order = list()
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            order.append(self.__vertex_ids[current])
+            for j in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[j]
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    queue.append(neighbor)
+        return order
+
+    def find_shortest_path(self, start_id, target_id):
+        """
+        Find the shortest path from start_id to target_id. Unweighted views
+        use breadth-first search; weighted views use Dijkstra's Algorithm.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        list<string>: For unweighted views, the vertex ids in the shortest
+                      path, from start to end.
+        tuple: For weighted views, (path, total weight).
+        None if the target cannot be reached from the start.
+        """
+        self._check_ids(start_id, target_id)
+        if self.__weights is None:
+            return self._bfs_shortest_path(start_id, target_id)
+        return self._dijkstra_shortest_path(start_id, target_id)
+
+    def _bfs_shortest_path(self, start_id, target_id):
+        """Return the fewest-hops path from start_id to target_id, or None."""
+        offsets, targets = self.__offsets, self.__targets
+        start, target = self.__index[start_id], self.__index[target_id]
+        # parent index of every discovered vertex (-1 for the start)
+        parents = array('i', [-2]) * self.num_vertices()
+        parents[start] = -1
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                return self._build_path(parents, target)
+            for j in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[j]
+                if parents[neighbor] == -2:
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+        return None
+
+    def _dijkstra_shortest_path(self, start_id, target_id):
+        """Return (path, weight) of the lightest path, or None."""
+        offsets, targets, weights = self.__offsets, self.__targets, self.__weights
+        start, target = self.__index[start_id], self.__index[target_id]
+        distances = array('d', [float('inf')]) * self.num_vertices()
+        parents = array('i', [-1]) * self.num_vertices()
+        settled = bytearray(self.num_vertices())
+        distances[start] = 0
+        heap = IndexedBinaryMinHeap()
+        heap.insert((0, start))
+        while not heap.is_empty():
+            min_distance, current = heap.delete_min()
+            settled[current] = 1
+            if current == target:
+                return self._build_path(parents, target), min_distance
+            for j in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[j]
+                if settled[neighbor]:
+                    continue
+                new_dist = min_distance + weights[j]
+                if new_dist < distances[neighbor]:
+                    distances[neighbor] = new_dist
+                    parents[neighbor] = current
+                    heap.insert_or_decrease(neighbor, new_dist)
+        return None
+
+    def shortest_path_lengths(self, start_id):
+        """
+        Return the shortest distance from one vertex to every vertex: the
+        total weight for weighted views, or the number of hops otherwise.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+
+        Returns:
+        array('d'): The distance to the vertex at each index (inf if it
+                    cannot be reached), in the order of vertex_ids.
+        """
+        self._check_ids(start_id)
+        return single_source_distances(
+            self.__offsets, self.__targets, self.__weights,
+            self.__index[start_id])
+
+    def find_connected_components(self):
+        """
+        Return a 2D list of connected components. Each of the inner lists
+        contains vertex ids. Like Graph.find_connected_components, each
+        component holds the vertices reachable along out-edges from the first
+        vertex (in index order) that is not yet in a component.
+        """
+        offsets, targets = self.__offsets, self.__targets
+        visited = bytearray(self.num_vertices())
+        all_connected_components = list()
+        for root in range(self.num_vertices()):
+            if visited[root]:
+                continue
+            # iterative DFS from this root
+            visited[root] = 1
+            component = list()
+            stack = [root]
+            while stack:
+                current = stack.pop()
+                component.append(self.__vertex_ids[current])
+                for j in range(offsets[current], offsets[current + 1]):
+                    neighbor = targets[j]
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        stack.append(neighbor)
+            all_connected_components.append(component)
+        return all_connected_components
+
+    def topological_sort(self):
+        """
+        Return a list of vertex ids in topological order, using an iterative
+        depth-first search (so long chains cannot exhaust the call stack).
+        """
+        offsets, targets = self.__offsets, self.__targets
+        visited = bytearray(self.num_vertices())
+        # vertices in the order their DFS finished
+        finished = list()
+        for root in range(self.num_vertices()):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            # stack of (vertex index, position of the next edge to follow)
+            stack = [(root, offsets[root])]
+            while stack:
+                current, edge = stack[-1]
+                if edge < offsets[current + 1]:
+                    stack[-1] = (current, edge + 1)
+                    neighbor = targets[edge]
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        stack.append((neighbor, offsets[neighbor]))
+                else:
+                    stack.pop()
+                    finished.append(current)
+        # Reverse the finishing order
+        return [self.__vertex_ids[i] for i in reversed(finished)]
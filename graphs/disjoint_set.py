@@ -0,0 +1,135 @@
+from array import array
+
+
+class DisjointSet(object):
+    """ DisjointSet Class
+    Represents a collection of disjoint sets (a union-find structure).
+
+    Each item is given an integer index, and the sets are stored as a forest
+    in two arrays: the parent index of every item, and an upper bound on the
+    height (the rank) of every root. find uses path compression and union
+    uses union by rank, so any sequence of operations runs in nearly
+    constant amortized time per operation, O(α(n)).
+    """
+
+    def __init__(self, items=None):
+        """
+        Initialize the structure, with each of the given items in its own set.
+
+        Parameters:
+        items (iterable): Hashable items to add, if any.
+        """
+        self.__index = {} # item -> index
+        self.__items = [] # index -> item
+        self.__parents = array('i') # index -> index of parent
+        self.__ranks = bytearray() # index -> rank, if it is a root
+        self.__count = 0
+        if items is not None:
+            for item in items:
+                self.add(item)
+
+    def __len__(self):
+        """Return the number of items in the structure."""
+        return len(self.__items)
+
+    def __contains__(self, item):
+        """Return True if the item is in the structure."""
+        return item in self.__index
+
+    def __repr__(self):
+        """Return a string representation of the sets."""
+        return f'DisjointSet({self.groups()})'
+
+    def add(self, item):
+        """
+        Add an item in a new set of its own, if it is not already present.
+
+        Parameters:
+        item (hashable): The item to add.
+
+        Returns:
+        boolean: True if the item was added, False if it was already present.
+        """
+        if item in self.__index:
+            return False
+        index = len(self.__items)
+        self.__index[item] = index
+        self.__items.append(item)
+        self.__parents.append(index)
+        self.__ranks.append(0)
+        self.__count += 1
+        return True
+
+    def _find_root(self, index):
+        """Return the root index of the set containing index, and point
+           every index on the way directly at the root."""
+        parents = self.__parents
+        root = index
+        while parents[root] != root:
+            root = parents[root]
+        # path compression
+        while parents[index] != root:
+            parents[index], index = root, parents[index]
+        return root
+
+    def find(self, item):
+        """
+        Return the representative item of the set containing an item.
+
+        Parameters:
+        item (hashable): An item in the structure.
+
+        Returns:
+        hashable: The same item for every member of one set.
+        """
+        return self.__items[self._find_root(self.__index[item])]
+
+    def union(self, item1, item2):
+        """
+        Merge the sets containing two items.
+
+        Parameters:
+        item1 (hashable): An item in the structure.
+        item2 (hashable): Another item in the structure.
+
+        Returns:
+        boolean: True if two sets were merged, False if the items were
+                 already in the same set.
+        """
+        root1 = self._find_root(self.__index[item1])
+        root2 = self._find_root(self.__index[item2])
+        if root1 == root2:
+            return False
+        # union by rank: hang the shorter tree under the taller one
+        ranks = self.__ranks
+        if ranks[root1] < ranks[root2]:
+            root1, root2 = root2, root1
+        self.__parents[root2] = root1
+        if ranks[root1] == ranks[root2]:
+            ranks[root1] += 1
+        self.__count -= 1
+        return True
+
+    def connected(self, item1, item2):
+        """Return True if the two items are in the same set."""
+        return (
+            self._find_root(self.__index[item1]) ==
+            self._find_root(self.__index[item2])
+        )
+
+    def count(self):
+        """Return the number of disjoint sets."""
+        return self.__count
+
+    def groups(self):
+        """
+        Return the sets themselves.
+
+        Returns:
+        list<list>: The items of each set, with the sets in the order of
+                    their first-added item.
+        """
+        groups = {}
+        for index, item in enumerate(self.__items):
+            groups.setdefault(self._find_root(index), []).append(item)
+        return list(groups.values())
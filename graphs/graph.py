@@ -1,34 +1,155 @@
+import weakref
+from array import array
 from collections import deque
+from itertools import islice
+from graphs.csr import CSRGraph
+from graphs.disjoint_set import DisjointSet
+
+# vertex colors for depth-first search
+WHITE, GRAY, BLACK = 0, 1, 2
+# events reported by Graph._dfs_events
+ENTER, BACK_EDGE, EXIT = 'enter', 'back_edge', 'exit'
+# past this many neighbors, add_edges checks a vertex for duplicate edges
+# against a set of its neighbor indices, kept only for the one batch
+NEIGHBOR_SCAN_LIMIT = 16
+
+
+def _is_new_neighbor(vertex_obj, neighbor_obj, neighbor_sets):
+    """
+    Return True if neighbor_obj, a vertex of the same graph, is not a neighbor
+    of vertex_obj yet, and note it as one. A short neighbors array is scanned;
+    for a longer one, a set of its indices is built once per batch of edges,
+    in neighbor_sets (vertex -> set), so that adding many edges to a
+    high-degree vertex is not quadratic. The caller drops the sets when done.
+    """
+    neighbors = vertex_obj._neighbors
+    if len(neighbors) <= NEIGHBOR_SCAN_LIMIT:
+        return neighbor_obj._index not in neighbors
+    known = neighbor_sets.get(vertex_obj)
+    if known is None:
+        known = neighbor_sets[vertex_obj] = set(neighbors)
+    if neighbor_obj._index in known:
+        return False
+    known.add(neighbor_obj._index)
+    return True
+
+
+class CycleError(ValueError):
+    """
+    Raised when a directed graph that must be acyclic has a cycle. The ids
+    around the cycle are kept in the `cycle` attribute (in the order of
+    find_cycle), so callers need not parse the message to find them.
+    """
+
+    def __init__(self, cycle):
+        """
+        Parameters:
+        cycle (list<string>): The ids around the cycle, starting and ending
+                              with the same vertex.
+        """
+        super().__init__(f'The graph contains a cycle: {cycle}')
+        self.cycle = cycle
+
 
 class Vertex(object):
     """
     Defines a single vertex and its neighbors.
+
+    The vertices of a graph share one table (a list) of all its vertices, and
+    each vertex knows its own index in that table: the graph's interned
+    integer id for it. Neighbors are stored as an array of those indices,
+    4 bytes per edge, instead of a dictionary of vertex objects. __slots__
+    keeps each vertex from carrying an instance __dict__.
+
+    Adding an edge scans the array for a duplicate, which is O(degree) but
+    runs in C; Graph.add_edges keeps batches on high-degree vertices fast
+    without storing anything more per vertex (see _is_new_neighbor).
+
+    If its graph keeps an in-edge index, a vertex also stores the indices of
+    its predecessors (the vertices with edges to it), in _in_neighbors.
     """
+    __slots__ = ('__id', '_table', '_index', '_neighbors', '_in_neighbors')
 
-    def __init__(self, vertex_id):
+    def __init__(self, vertex_id, vertex_table=None, index=None):
         """
-        Initialize a vertex and its neighbors dictionary.
+        Initialize a vertex and its neighbors array.
         
         Parameters:
         vertex_id (string): A unique identifier to identify this vertex.
+        vertex_table (list<Vertex>): The table of vertices this vertex belongs
+                                     to; a vertex made on its own starts a
+                                     table of its own.
+        index (int): The vertex's place in the table, if it replaces an
+                     existing vertex; new vertices go at the end.
         """
         self.__id = vertex_id
-        self.__neighbors_dict = {} # id -> object
+        self._table = [] if vertex_table is None else vertex_table
+        self._index = len(self._table) if index is None else index
+        if self._index == len(self._table):
+            self._table.append(self)
+        else:
+            self._table[self._index] = self
+        self._neighbors = array('i') # indices into the table
+        self._in_neighbors = None # indices of predecessors, if indexed
+
+    def _index_of(self, vertex_obj):
+        """Return the index of a vertex in this vertex's table, first adding
+           it to the table if it belongs to another one."""
+        if vertex_obj._table is self._table:
+            return vertex_obj._index
+        for index, table_obj in enumerate(self._table):
+            if table_obj is vertex_obj:
+                return index
+        self._table.append(vertex_obj)
+        return len(self._table) - 1
 
     def add_neighbor(self, vertex_obj):
         """
-        Add a neighbor by storing it in the neighbors dictionary.
+        Add a neighbor by storing its index in the neighbors array.
 
         Parameters:
         vertex_obj (Vertex): An instance of Vertex to be stored as a neighbor.
         """
-        neighbor_id = vertex_obj.__id
-        self.__neighbors_dict[neighbor_id] = vertex_obj
+        neighbor_index = self._index_of(vertex_obj)
+        if neighbor_index not in self._neighbors:
+            self._append_neighbor(vertex_obj, neighbor_index)
+
+    def _append_neighbor(self, vertex_obj, index):
+        """Store a vertex, at the given index, that is not a neighbor yet."""
+        self._neighbors.append(index)
+        if vertex_obj._table is self._table:
+            vertex_obj._add_predecessor(self._index)
+
+    def _start_in_edges(self):
+        """Give this vertex an empty list of predecessors to maintain."""
+        self._in_neighbors = array('i')
+
+    def _add_predecessor(self, index):
+        """Record an edge into this vertex, if its in-edges are indexed."""
+        if self._in_neighbors is not None:
+            self._in_neighbors.append(index)
+
+    def _remove_predecessor(self, index):
+        """Forget the edge into this vertex from the given index."""
+        del self._in_neighbors[self._in_neighbors.index(index)]
+
+    def _register_out_edges(self):
+        """Record every edge out of this vertex with the vertex it goes to."""
+        table = self._table
+        for index in self._neighbors:
+            table[index]._add_predecessor(self._index)
+
+    def _hand_over_in_edges(self, vertex_obj):
+        """Give the predecessors of this vertex to vertex_obj, which has
+           replaced it in the table, and withdraw this vertex's out-edges."""
+        vertex_obj._in_neighbors = self._in_neighbors
+        for index in self._neighbors:
+            self._table[index]._remove_predecessor(self._index)
 
     def __str__(self):
         """Output the list of neighbors of this vertex."""
-        neighbor_ids = list(self.__neighbors_dict.keys())
-        return f'{self.__id} adjacent to {neighbor_ids}'
+        neighbor_ids = [neighbor.get_id() for neighbor in self.iter_neighbors()]
+        return f'{self.get_id()} adjacent to {neighbor_ids}'
 
     def __repr__(self):
         """Output the list of neighbors of this vertex."""
@@ -36,26 +157,119 @@ class Vertex(object):
 
     def get_neighbors(self):
         """Return the neighbors of this vertex."""
-        return list(self.__neighbors_dict.values())
+        table = self._table
+        return [table[index] for index in self._neighbors]
+
+    def iter_neighbors(self):
+        """Return an iterator over the neighbors of this vertex, without
+           copying them into a list first."""
+        return map(self._table.__getitem__, self._neighbors)
+
+    def degree(self):
+        """Return the number of neighbors of this vertex (its out-degree)."""
+        return len(self._neighbors)
 
     def get_id(self):
         """Return the id of this vertex."""
         return self.__id
 
 
+class ReversedVertexMixin(object):
+    """
+    Turns a vertex class into a read-only proxy for a vertex of another
+    graph, with every edge pointing the other way: its neighbors are the
+    proxied vertex's predecessors, and vice versa. The proxy reads the arrays
+    of the vertex it wraps, so it shares their storage and sees their changes.
+    """
+    __slots__ = ()
+
+    def __init__(self, vertex_obj, vertex_table):
+        """
+        Wrap a vertex, at the same index of a table of proxies, replacing
+        the proxy for any vertex that held that index before.
+
+        Parameters:
+        vertex_obj (Vertex): A vertex whose graph keeps an in-edge index.
+        vertex_table (list<Vertex>): The table of the reverse graph.
+        """
+        self._vertex = vertex_obj
+        self._table = vertex_table
+        self._index = vertex_obj._index
+        if self._index == len(vertex_table):
+            vertex_table.append(self)
+        else:
+            vertex_table[self._index] = self
+
+    _neighbors = property(lambda self: self._vertex._in_neighbors)
+    _in_neighbors = property(lambda self: self._vertex._neighbors)
+
+    def get_id(self):
+        """Return the id of this vertex."""
+        return self._vertex.get_id()
+
+    def add_neighbor(self, vertex_obj, *args):
+        """A reversed view cannot change; add edges to the original graph."""
+        raise TypeError('A reversed graph is read-only.')
+
+
+class ReversedVertex(ReversedVertexMixin, Vertex):
+    """A Vertex of the reversed view of a directed Graph."""
+    __slots__ = ('_vertex',)
+
+
 class Graph:
     """ Graph Class
     Represents a directed or undirected graph.
     """
-    def __init__(self, is_directed=True):
+    # the class of the vertex objects the graph creates, and of the proxies
+    # for them in its reverse() view
+    vertex_class = Vertex
+    reversed_vertex_class = ReversedVertex
+
+    def __init__(self, is_directed=True, track_in_edges=False,
+                 track_components=False):
         """
         Initialize a graph object with an empty vertex dictionary.
 
         Parameters:
         is_directed (boolean): Whether the graph is directed (edges go in only one direction).
+        track_in_edges (boolean): Whether to keep an index of the edges into
+                                  each vertex from the start. Otherwise it is
+                                  built the first time it is needed (see
+                                  get_predecessors); either way, once built it
+                                  is kept up to date by add_edge.
+        track_components (boolean): Whether to keep the connected components
+                                    of an undirected graph in a DisjointSet
+                                    from the start. Otherwise it is built the
+                                    first time it is needed (see connected),
+                                    and kept up to date from then on.
         """
         self.__vertex_dict = {} # id -> object
+        self.__vertex_table = [] # interned integer id -> object
         self.__is_directed = is_directed
+        # only directed graphs need an in-edge index
+        self.__tracks_in_edges = False
+        if track_in_edges:
+            self._index_in_edges()
+        # the DisjointSet of connected components, once it is asked for
+        self.__components = None
+        if track_components:
+            self._index_components()
+        # the views made by reverse(), which must drop their own caches
+        # whenever this graph changes (see _invalidate_indexes)
+        self.__views = None
+        # whether this graph is such a view, and so read-only
+        self.__is_view = False
+
+    @property
+    def vertex_dict(self):
+        """The dictionary of vertex id -> vertex object."""
+        return self.__vertex_dict
+
+    @property
+    def is_directed(self):
+        """Whether the graph is directed (edges go in only one direction)."""
+        return self.__is_directed
 
     def add_vertex(self, vertex_id):
         """
@@ -67,10 +281,147 @@ class Graph:
         Returns:
         Vertex: The new vertex object.
         """
-        new_vertex = Vertex(vertex_id)
+        self._check_writable()
+        new_vertex = self._new_vertex(vertex_id)
         self.__vertex_dict[vertex_id] = new_vertex
         return new_vertex
 
+    def _check_writable(self):
+        """Raise a TypeError if the graph is a read-only reverse() view."""
+        if self.__is_view:
+            raise TypeError('A reversed graph is read-only.')
+
+    def _new_vertex(self, vertex_id):
+        """Make a vertex object for the graph, interning its id: a new id
+           gets the next integer index, and an id already in the graph keeps
+           the index of the vertex it replaces."""
+        old_vertex = self.__vertex_dict.get(vertex_id)
+        index = None if old_vertex is None else old_vertex._index
+        new_vertex = self.vertex_class(vertex_id, self.__vertex_table, index)
+        if self.__components is not None:
+            self.__components.add(vertex_id)
+        if self.__tracks_in_edges:
+            new_vertex._start_in_edges()
+            if old_vertex is not None:
+                old_vertex._hand_over_in_edges(new_vertex)
+        self._add_to_views(vertex_id, new_vertex)
+        return new_vertex
+
+    def _add_to_views(self, vertex_id, vertex_obj):
+        """Give every reverse() view of the graph a proxy for a vertex just
+           added to it (or replacing one of its vertices), and pass the proxy
+           on to the views of that view in turn."""
+        if self.__views is None:
+            return
+        for view in list(self.__views):
+            proxy = self.reversed_vertex_class(vertex_obj, view.__vertex_table)
+            view.__vertex_dict[vertex_id] = proxy
+            view._add_to_views(vertex_id, proxy)
+
+    def _index_in_edges(self):
+        """Build the in-edge index of a directed graph, in O(V + E), unless it
+           is already being kept."""
+        if self.__tracks_in_edges or not self.__is_directed:
+            return
+        self.__tracks_in_edges = True
+        for vertex_obj in self.__vertex_dict.values():
+            vertex_obj._start_in_edges()
+        for vertex_obj in self.__vertex_dict.values():
+            vertex_obj._register_out_edges()
+
+    def _predecessor_vertices(self, vertex_id):
+        """Return an iterator over the vertex objects with edges to vertex_id."""
+        vertex_obj = self.__vertex_dict[vertex_id]
+        if not self.__is_directed:
+            return vertex_obj.iter_neighbors()
+        self._index_in_edges()
+        return map(vertex_obj._table.__getitem__, vertex_obj._in_neighbors)
+
+    def get_predecessors(self, vertex_id):
+        """
+        Return the ids of the vertices with an edge to the given vertex, in
+        O(in-degree). In undirected graphs these are just its neighbors.
+
+        The first call on a directed graph builds the in-edge index, in
+        O(V + E), unless the graph was made with track_in_edges=True.
+
+        Parameters:
+        vertex_id (string): The id of the vertex.
+
+        Returns:
+        list<string>: The ids of the vertex's predecessors.
+        """
+        return [
+            vertex_obj.get_id() for vertex_obj in self._predecessor_vertices(vertex_id)
+        ]
+
+    def in_degree(self, vertex_id):
+        """Return the number of edges into the vertex with the given id
+           (see get_predecessors)."""
+        vertex_obj = self.__vertex_dict[vertex_id]
+        if not self.__is_directed:
+            return vertex_obj.degree()
+        self._index_in_edges()
+        return len(vertex_obj._in_neighbors)
+
+    def reverse(self):
+        """
+        Return a view of the graph with every edge reversed. The view's
+        vertices read the in-edge index of this graph (building it first, if
+        needed) instead of copying it, so making the view takes O(V) and edges
+        added to this graph later show up in it. So do vertices added later,
+        and a vertex added again under the same id replaces its old proxy.
+        Any results the view caches, such as a WeightedGraph's landmark index,
+        are dropped when this graph changes. Adding vertices or edges to the
+        view itself raises a TypeError. An undirected graph is its own
+        reverse, so it is returned as is.
+
+        Returns:
+        Graph: The reversed view, of the same class as this graph.
+        """
+        if not self.__is_directed:
+            return self
+        self._index_in_edges()
+        view = self.__class__(is_directed=True)
+        view.__tracks_in_edges = True
+        view.__is_view = True
+        for vertex_obj in self.__vertex_table:
+            self.reversed_vertex_class(vertex_obj, view.__vertex_table)
+        for vertex_id, vertex_obj in self.__vertex_dict.items():
+            view.__vertex_dict[vertex_id] = view.__vertex_table[vertex_obj._index]
+        # hold the views weakly, so that a dropped view is not kept alive
+        if self.__views is None:
+            self.__views = weakref.WeakSet()
+        self.__views.add(view)
+        return view
+
+    def _invalidate_indexes(self):
+        """Drop the indexes derived from the graph, after it changes. A Graph
+           keeps none of its own, but the views made by reverse() may, and
+           they change along with it."""
+        if self.__views is not None:
+            for view in list(self.__views):
+                view._invalidate_indexes()
+
+    def add_vertices(self, vertex_ids):
+        """
+        Add a new vertex object to the graph for each of the given keys.
+
+        Parameters:
+        vertex_ids (iterable<string>): The unique identifiers for the new vertices.
+
+        Returns:
+        List<Vertex>: The new vertex objects, in the order given.
+        """
+        self._check_writable()
+        vertex_dict = self.__vertex_dict
+        new_vertices = list()
+        for vertex_id in vertex_ids:
+            new_vertex = self._new_vertex(vertex_id)
+            vertex_dict[vertex_id] = new_vertex
+            new_vertices.append(new_vertex)
+        return new_vertices
+
     def get_vertex(self, vertex_id):
         """Return the vertex if it exists."""
         if vertex_id not in self.__vertex_dict:
@@ -87,6 +438,7 @@ class Graph:
         vertex_id1 (string): The unique identifier of the first vertex.
         vertex_id2 (string): The unique identifier of the second vertex.
         """
+        self._check_writable()
         # store both vertex 1 and vertex 2 in a variable
         vertex_1, vertex_2 = (
             self.__vertex_dict[vertex_id1], 
@@ -97,6 +449,169 @@ class Graph:
         # if the graph is undirected, make the edge go both ways
         if self.__is_directed is False:
             vertex_2.add_neighbor(vertex_1)
+            self._track_edges(((vertex_id1, vertex_id2),))
+
+    def add_edges(self, edges, create_missing=False):
+        """
+        Add many edges at once. All endpoints are validated in one pass
+        before any edge is added, so a bad batch leaves the graph unchanged.
+
+        Parameters:
+        edges (iterable<tuple>): (vertex_id1, vertex_id2) pairs, one per edge.
+        create_missing (boolean): Whether to add vertices for endpoints that
+                                  are not in the graph yet, instead of raising.
+        """
+        self._check_writable()
+        edges = list(edges)
+        self._add_missing_endpoints(edges, create_missing)
+        # add the edges, with the lookups hoisted out of the loop
+        vertex_dict = self.__vertex_dict
+        is_undirected = self.__is_directed is False
+        neighbor_sets = {} # only for this batch (see _is_new_neighbor)
+        for vertex_id1, vertex_id2 in edges:
+            vertex_1, vertex_2 = vertex_dict[vertex_id1], vertex_dict[vertex_id2]
+            if _is_new_neighbor(vertex_1, vertex_2, neighbor_sets):
+                vertex_1._append_neighbor(vertex_2, vertex_2._index)
+            if is_undirected and _is_new_neighbor(vertex_2, vertex_1, neighbor_sets):
+                vertex_2._append_neighbor(vertex_1, vertex_1._index)
+        self._track_edges(edges)
+
+    def _track_edges(self, edges):
+        """Merge the connected components joined by a batch of new edges,
+           if the components are being kept (see connected)."""
+        components = self.__components
+        if components is not None:
+            for edge in edges:
+                components.union(edge[0], edge[1])
+
+    def _index_components(self):
+        """Build the DisjointSet of connected components, in O(V + E), unless
+           it is already being kept. Only undirected graphs have one."""
+        if self.__is_directed:
+            raise ValueError(
+                'Only undirected graphs track connected components; '
+                'see strongly_connected_components.')
+        if self.__components is None:
+            self.__components = DisjointSet(self.__vertex_dict)
+            self._track_edges(self.iter_edges())
+        return self.__components
+
+    def connected(self, vertex_id1, vertex_id2):
+        """
+        Return True if there is a path between two vertices of an undirected
+        graph, in O(α(V)) amortized time.
+
+        The first call builds the components in O(V + E), unless the graph was
+        made with track_components=True; from then on add_vertex and add_edge
+        keep them up to date, so no traversal is needed between edges.
+
+        Parameters:
+        vertex_id1 (string): The id of one vertex.
+        vertex_id2 (string): The id of another vertex.
+
+        Returns:
+        boolean: Whether the vertices are in the same connected component.
+        """
+        return self._index_components().connected(vertex_id1, vertex_id2)
+
+    def component_of(self, vertex_id):
+        """Return a representative vertex id of the connected component that
+           holds vertex_id: the same id for every vertex in it (see connected)."""
+        return self._index_components().find(vertex_id)
+
+    def component_count(self):
+        """Return the number of connected components of an undirected graph,
+           including lone vertices (see connected)."""
+        return self._index_components().count()
+
+    def _add_missing_endpoints(self, edges, create_missing, edge_size=2):
+        """
+        Check the size and endpoints of a batch of edges against the graph in
+        a single set-based pass, and add vertices for any missing ones if
+        allowed. Nothing is added if any edge has the wrong size.
+
+        Parameters:
+        edges (list<tuple>): Edges whose first two items are vertex ids.
+        create_missing (boolean): Whether to add missing vertices, or raise.
+        edge_size (int): How many items each edge must have.
+        """
+        endpoints = set()
+        for edge in edges:
+            if len(edge) != edge_size:
+                raise ValueError(
+                    f'Each edge needs {edge_size} items, but got {edge!r}.')
+            endpoints.add(edge[0])
+            endpoints.add(edge[1])
+        missing_ids = endpoints.difference(self.__vertex_dict)
+        if not missing_ids:
+            return
+        if not create_missing:
+            raise self._missing_vertex_error(missing_ids)
+        # keep the order in which the new ids first appear in the batch
+        new_ids = list()
+        for edge in edges:
+            for vertex_id in edge[:2]:
+                if vertex_id in missing_ids:
+                    missing_ids.discard(vertex_id)
+                    new_ids.append(vertex_id)
+        self.add_vertices(new_ids)
+
+    def _missing_vertex_error(self, missing_ids):
+        """Return the error raised when edges refer to unknown vertices."""
+        return KeyError(f'Vertices not in the graph: {sorted(map(str, missing_ids))}')
+
+    def iter_edges(self):
+        """
+        Lazily enumerate every edge in the graph exactly once, in O(V + E).
+        An undirected edge is only reported from whichever of its endpoints
+        was added to the graph first, so (A, B) never also shows up as (B, A).
+
+        Returns:
+        generator<tuple>: (vertex_id1, vertex_id2) for every edge.
+        """
+        order = None
+        if self.__is_directed is False:
+            order = {vertex_id: i for i, vertex_id in enumerate(self.__vertex_dict)}
+        for i, (vertex_id, vertex_obj) in enumerate(self.__vertex_dict.items()):
+            for neighbor in vertex_obj.iter_neighbors():
+                neighbor_id = neighbor.get_id()
+                if order is None or order[neighbor_id] >= i:
+                    yield vertex_id, neighbor_id
+
+    def edge_list(self, as_arrays=False):
+        """
+        Return every edge in the graph exactly once (see iter_edges).
+
+        Parameters:
+        as_arrays (boolean): Whether to return the edges as columns of
+                             integer vertex indices, rather than as tuples.
+
+        Returns:
+        list<tuple>: (vertex_id1, vertex_id2) for every edge, or if as_arrays
+                     is True, a tuple (vertex_ids, sources, targets) where
+                     sources[i] and targets[i] are the indices into vertex_ids
+                     of the ends of edge i. The index columns are array('q')
+                     objects, which numpy.asarray wraps without copying.
+        """
+        if not as_arrays:
+            return list(self.iter_edges())
+        return self._edge_arrays(self.iter_edges(), with_weights=False)
+
+    def _edge_arrays(self, edges, with_weights):
+        """Split edge tuples into columns (see edge_list). If with_weights is
+           True, the third item of each tuple goes into an array('d') of
+           weights, which is returned as a fourth column."""
+        vertex_ids = list(self.__vertex_dict)
+        index = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+        sources, targets, weights = array('q'), array('q'), array('d')
+        for edge in edges:
+            sources.append(index[edge[0]])
+            targets.append(index[edge[1]])
+            if with_weights:
+                weights.append(edge[2])
+        if with_weights:
+            return vertex_ids, sources, targets, weights
+        return vertex_ids, sources, targets
 
     def get_vertices(self):
         """
@@ -110,6 +625,29 @@ class Graph:
     def contains_id(self, vertex_id):
         return vertex_id in self.__vertex_dict
 
+    def to_csr(self):
+        """
+        Return an immutable, array-backed (compressed sparse row) copy of the
+        graph. Later changes to the graph are not reflected in the copy.
+
+        Returns:
+        CSRGraph: The frozen view, with vertices indexed in insertion order.
+        """
+        vertex_ids = list(self.__vertex_dict.keys())
+        index = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+        offsets, targets = array('q', [0]), array('i')
+        for vertex_obj in self.__vertex_dict.values():
+            targets.extend(
+                index[neighbor.get_id()] for neighbor in vertex_obj.iter_neighbors()
+            )
+            offsets.append(len(targets))
+        return CSRGraph(vertex_ids, offsets, targets,
+                        is_directed=self.__is_directed)
+
+    def freeze(self):
+        """Return an immutable CSRGraph copy of the graph (see to_csr)."""
+        return self.to_csr()
+
     def __str__(self):
         """Return a string representation of the graph."""
         return f'Graph with vertices: {self.get_vertices()}'
@@ -118,81 +656,254 @@ class Graph:
         """Return a string representation of the graph."""
         return self.__str__()
 
-    def bfs_traversal(self, start_id):
+    def iter_bfs(self, start_id, with_info=False):
         """
-        Traverse the graph using breadth-first search.
+        Lazily traverse the graph using breadth-first search. Each vertex's
+        neighbors are only looked at once the caller asks for more vertices,
+        so the caller can stop early without paying for the whole traversal.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        with_info (boolean): Whether to also yield the depth and parent of
+                             each vertex.
+
+        Returns:
+        generator: The vertex ids in BFS order, or (vertex_id, depth, parent_id)
+                   tuples if with_info is True (the start vertex's parent is None).
         """
         if not self.contains_id(start_id):
             raise KeyError("One or both vertices are not in the graph!")
+        return self._bfs_generator(start_id, with_info)
 
+    def _bfs_generator(self, start_id, with_info):
+        """Yield the vertices reachable from start_id, in BFS order."""
         # Keep a set to denote which vertices we've seen before
         seen = set()
         seen.add(start_id)
-
-        # Keep a queue so that we visit vertices in the appropriate order
+        # Keep a queue of (vertex, depth, parent id) to visit in order
         queue = deque()
-        queue.append(self.get_vertex(start_id))
-
+        queue.append((self.__vertex_dict[start_id], 0, None))
         while queue:
-            current_vertex_obj = queue.popleft()
+            current_vertex_obj, depth, parent_id = queue.popleft()
             current_vertex_id = current_vertex_obj.get_id()
+            # Hand the current vertex to the caller
+            yield (current_vertex_id, depth, parent_id) if with_info else current_vertex_id
+            # Add its neighbors to the queue
+            for neighbor in current_vertex_obj.iter_neighbors():
+                neighbor_id = neighbor.get_id()
+                if neighbor_id not in seen:
+                    seen.add(neighbor_id)
+                    queue.append((neighbor, depth + 1, current_vertex_id))
 
-            # Process current node
-            print('Processing vertex {}'.format(current_vertex_id))
+    def iter_dfs(self, start_id, with_info=False):
+        """
+        Lazily traverse the graph using (preorder) depth-first search, with an
+        explicit stack so that deep graphs cannot exhaust the call stack.
 
-            # Add its neighbors to the queue
-            for neighbor in current_vertex_obj.get_neighbors():
-                if neighbor.get_id() not in seen:
-                    seen.add(neighbor.get_id())
-                    queue.append(neighbor)
+        Parameters:
+        start_id (string): The id of the start vertex.
+        with_info (boolean): Whether to also yield the depth and parent of
+                             each vertex.
+
+        Returns:
+        generator: The vertex ids in DFS order, or (vertex_id, depth, parent_id)
+                   tuples if with_info is True (the start vertex's parent is None).
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        return self._dfs_generator(start_id, with_info)
+
+    def _dfs_generator(self, start_id, with_info):
+        """Yield the vertices reachable from start_id, in DFS order."""
+        start_vertex_obj = self.__vertex_dict[start_id]
+        seen = set()
+        seen.add(start_id)
+        yield (start_id, 0, None) if with_info else start_id
+        # stack of (vertex, iterator over the neighbors left to explore)
+        stack = [(start_vertex_obj, start_vertex_obj.iter_neighbors())]
+        while stack:
+            current_vertex_obj, neighbors = stack[-1]
+            for neighbor in neighbors:
+                neighbor_id = neighbor.get_id()
+                if neighbor_id not in seen:
+                    seen.add(neighbor_id)
+                    if with_info:
+                        yield neighbor_id, len(stack), current_vertex_obj.get_id()
+                    else:
+                        yield neighbor_id
+                    # go deeper before looking at the remaining neighbors
+                    stack.append((neighbor, neighbor.iter_neighbors()))
+                    break
+            else:
+                # every neighbor explored, so move back "up" the stack
+                stack.pop()
+
+    def iter_bfs_layers(self, start_id):
+        """
+        Lazily traverse the graph one BFS level at a time.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
 
-        return # everything has been processed
+        Returns:
+        generator<list<string>>: The ids of the vertices at distance 0, 1, 2, ...
+                                 from the start vertex, one list per distance.
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        return self._layers_generator([start_id])
+
+    def _layers_generator(self, start_ids):
+        """Yield the BFS levels outward from all of start_ids at once."""
+        # drop duplicate start ids, but keep their order
+        layer = list(dict.fromkeys(start_ids))
+        seen = set(layer)
+        while layer:
+            yield layer
+            # the next layer holds the unseen neighbors of this one
+            next_layer = list()
+            for vertex_id in layer:
+                for neighbor in self.__vertex_dict[vertex_id].iter_neighbors():
+                    neighbor_id = neighbor.get_id()
+                    if neighbor_id not in seen:
+                        seen.add(neighbor_id)
+                        next_layer.append(neighbor_id)
+            layer = next_layer
 
-    def find_shortest_path(self, start_id, target_id):
+    def bfs_traversal(self, start_id):
         """
-        Find and return the shortest path from start_id to target_id.
+        Traverse the graph using breadth-first search.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+
+        Returns:
+        list<string>: The ids of all reachable vertices, in the order visited.
+        """
+        return list(self.iter_bfs(start_id))
+
+    def find_shortest_path(self, start_id, target_id, bidirectional=False):
+        """
+        Find and return the shortest path from start_id to target_id, using
+        breadth-first search with a single parent pointer per vertex.
 
         Parameters:
         start_id (string): The id of the start vertex.
         target_id (string): The id of the target (end) vertex.
+        bidirectional (boolean): Whether to search from both ends at once,
+                                 which visits far fewer vertices on large graphs.
+                                 On a directed graph, the first such search
+                                 builds the in-edge index (see get_predecessors),
+                                 which every later add_edge then keeps up to
+                                 date, at the cost of a second array of indices
+                                 per vertex.
 
         Returns:
         list<string>: A list of all vertex ids in the shortest path, from start to end.
         """
         if not self.contains_id(start_id) or not self.contains_id(target_id):
             raise KeyError("One or both vertices are not in the graph!")
+        if bidirectional:
+            return self._bidirectional_shortest_path(start_id, target_id)
 
-        # vertex keys we've seen before and their paths from the start vertex
-        vertex_id_to_path = {
-            start_id: [start_id] # only one thing in the path
+        # vertex keys we've seen before, and the vertex we reached them from
+        vertex_id_to_parent = {
+            start_id: None
         }
 
         # queue of vertices to visit next
-        queue = deque() 
+        queue = deque()
         queue.append(self.get_vertex(start_id))
 
-        # while queue is not empty
-        while queue:
-            current_vertex_obj = queue.pop() # vertex obj to visit next
+        # while queue is not empty, and the target has not been found
+        while queue and target_id not in vertex_id_to_parent:
+            current_vertex_obj = queue.popleft() # vertex obj to visit next
             current_vertex_id = current_vertex_obj.get_id()
 
-            # found target, can stop the loop early
-            if current_vertex_id == target_id:
-                break
-
-            neighbors = current_vertex_obj.get_neighbors()
-            for neighbor in neighbors:
-                if neighbor.get_id() not in vertex_id_to_path:
-                    current_path = vertex_id_to_path[current_vertex_id]
-                    # extend the path by 1 vertex
-                    next_path = current_path + [neighbor.get_id()]
-                    vertex_id_to_path[neighbor.get_id()] = next_path
+            for neighbor in current_vertex_obj.iter_neighbors():
+                if neighbor.get_id() not in vertex_id_to_parent:
+                    vertex_id_to_parent[neighbor.get_id()] = current_vertex_id
                     queue.append(neighbor)
 
-        if target_id not in vertex_id_to_path: # path not found
+        if target_id not in vertex_id_to_parent: # path not found
             return None
 
-        return vertex_id_to_path[target_id]
+        return self._build_path(vertex_id_to_parent, target_id)
+
+    def _bidirectional_shortest_path(self, start_id, target_id):
+        """
+        Find the shortest path by growing one BFS level at a time from the
+        start (along edges) and from the target (against edges), always
+        expanding the smaller frontier, until the two searches meet.
+        """
+        if start_id == target_id:
+            return [start_id]
+        backward_neighbors = self._predecessor_ids
+        # parent pointers for each side; each search's seen set is its keys
+        forward_parents, backward_parents = {start_id: None}, {target_id: None}
+        forward_frontier, backward_frontier = [start_id], [target_id]
+
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting_id = self._expand_frontier(
+                    forward_frontier, self._neighbor_ids,
+                    forward_parents, backward_parents)
+            else:
+                backward_frontier, meeting_id = self._expand_frontier(
+                    backward_frontier, backward_neighbors,
+                    backward_parents, forward_parents)
+            # the first vertex seen by both searches lies on a shortest path
+            if meeting_id is not None:
+                path = self._build_path(forward_parents, meeting_id)
+                vertex_id = backward_parents[meeting_id]
+                while vertex_id is not None:
+                    path.append(vertex_id)
+                    vertex_id = backward_parents[vertex_id]
+                return path
+
+        return None # path not found
+
+    def _expand_frontier(self, frontier, neighbors_of, parents, other_parents):
+        """
+        Advance one side of a bidirectional BFS by one level.
+
+        Returns:
+        tuple: (list<string>, string) the next frontier, and the id of a vertex
+               the other side has already seen (or None if they did not meet).
+        """
+        next_frontier = list()
+        for vertex_id in frontier:
+            for neighbor_id in neighbors_of(vertex_id):
+                if neighbor_id not in parents:
+                    parents[neighbor_id] = vertex_id
+                    if neighbor_id in other_parents:
+                        return next_frontier, neighbor_id
+                    next_frontier.append(neighbor_id)
+        return next_frontier, None
+
+    def _neighbor_ids(self, vertex_id):
+        """Lazily yield the ids of the vertices that vertex_id has edges to."""
+        return (
+            neighbor.get_id()
+            for neighbor in self.__vertex_dict[vertex_id].iter_neighbors()
+        )
+
+    def _predecessor_ids(self, vertex_id):
+        """Lazily yield the ids of the vertices with edges to vertex_id."""
+        return (
+            vertex_obj.get_id() for vertex_obj in self._predecessor_vertices(vertex_id)
+        )
+
+    def _build_path(self, vertex_id_to_parent, target_id):
+        """Walk the parent pointers back from target_id to the start vertex,
+           and return the ids along the way in order from start to target."""
+        path = list()
+        vertex_id = target_id
+        while vertex_id is not None:
+            path.append(vertex_id)
+            vertex_id = vertex_id_to_parent[vertex_id]
+        path.reverse()
+        return path
 
     def find_vertices_n_away(self, start_id, target_distance):
         """
@@ -200,6 +911,7 @@ class Graph:
         In this implementation, if a vertex has multiple paths that differ in distance
         from the starting vertex, then only the shortest distance is used to determine if
         should be returned or not.
+        Each vertex is expanded at most once, so this runs in O(V + E) for any distance.
         
         Arguments:
         start_id (string): The id of the start vertex.
@@ -208,177 +920,389 @@ class Graph:
         Returns:
         list<string>: All vertex ids that are `target_distance` away from the start vertex
         """
-        # check to make sure we have a valid start_id
-        if not self.contains_id(start_id):
-            raise KeyError("One or both vertices are not in the graph!")
-        # Store the starting vertex in a variable 
-        starting_vertex_obj = self.get_vertex(start_id)
+        return self.find_vertices_n_away_many([start_id], target_distance)
 
-        # Keep a count of steps taken from start so far
-        steps = -1
+    def find_vertices_n_away_many(self, start_ids, target_distance):
+        """
+        Find and return all vertices whose distance from the nearest of several
+        start vertices is exactly n, using a single multi-source BFS.
 
-        # Keep a dict of Vertex ids, mapped to their distances from the start
-        vertex_distances = dict()
+        Arguments:
+        start_ids (iterable<string>): The ids of the start vertices.
+        target_distance (integer): The distance from the start vertices we are looking for
 
-        # queue of vertices to visit next
-        queue = deque() 
-        queue.append(starting_vertex_obj)
-
-        # Perform a BFS, for only up to the nodes that lie up to
-        # a "target_distance" away from the start (only shortest path considered)
-        while steps < target_distance:
-            # init a list of neighbors to process after this iteration
-            neighbors = list()
-            # Dequeue all the vertices in the queue
-            while len(queue) > 0:
-                current_vertex_obj = queue.popleft()
-                current_vertex_id = current_vertex_obj.get_id()
-                # add the current vertex to the dict
-                if current_vertex_id not in vertex_distances:
-                    vertex_distances[current_vertex_id] = steps + 1
-                # Keep track of vertices to process on next iteration
-                neighbors.extend(current_vertex_obj.get_neighbors())
-            # enqueue the vertices to visit on the next iteration
-            for neighbor in neighbors:
-                queue.append(neighbor)
-            # Increment the steps taken so far
-            steps += 1
-        
-        # Return the ids of the vertices a target distance away
-        return [
-            vertex_id for vertex_id in vertex_distances if
-            vertex_distances[vertex_id] == target_distance
-        ]
+        Returns:
+        list<string>: All vertex ids that are `target_distance` away from the start vertices
+        """
+        rings = self.find_vertex_rings_many(start_ids, target_distance)
+        # the BFS may run out of vertices before reaching the target distance
+        if target_distance < 0 or len(rings) <= target_distance:
+            return list()
+        return rings[target_distance]
 
-    def is_bipartite(self):
-        """Return True if the graph is bipartite, False otherwise."""
-        # init a queue
-        queue = deque()
-        # keep track of objects seen so far
-        seen = set()
-        # keep track of groups in dict
-        vertex_groups = dict()
-        # pick a random vertex to start
-        start_id = list(self.__vertex_dict.keys())[0]
-        # enqueue the starting vertex, and assign it a group
-        queue.append((self.__vertex_dict[start_id], 0))
-        vertex_groups[start_id] = 0
-        # perform BFS
-        while queue:
-            # process the vertex at the front of the queue
-            current_vertex_obj, current_group_num = queue.pop()
-            # print(f'Current group num: {current_vertex_obj, current_group_num}')
-            current_vertex_id = current_vertex_obj.get_id()
-            seen.add(current_vertex_id)
-            # enqueue the neighbors, and assign them a group
-            neighbors = current_vertex_obj.get_neighbors()
-            for neighbor in neighbors:
-                # if you hit a vertex that has a number already,
-                # AND which different from what's allowed, return FALSE
-                neighbor_id = neighbor.get_id()
-                # print(vertex_groups)
-                if neighbor_id in vertex_groups.keys():
-                    neighbor_group_num = vertex_groups[neighbor.get_id()]
-                    if neighbor_group_num == current_group_num:
-                        return False
-                # enqueue neighbors and assign groups: 
-                # neighbors should be of different groups
-                elif neighbor.get_id() not in seen:
-                    group_to_assign = 1 if current_group_num == 0 else 0
-                    vertex_groups[neighbor_id] = group_to_assign
-                    queue.appendleft((neighbor, group_to_assign))
-        return True
-
-    def dfs_for_cc(self, vertex, visited, connected):
-        """Returns a list of all verticies within one set of
-           connected components in a Graph object.
-
-           Parameters:
-           vertex(Vertex): the vertex we begin with
-           visited(set): all other Vertex objects visited in the overall
-                         graph so far
-           connected(list): collection of vertices visted so far in this
-                            set of connected components
-
-           Returns: list: all verticies within one set of
-           connected components in a graph
-        
+    def find_vertex_rings(self, start_id, max_distance):
+        """
+        Find all vertices up to n distance away in one pass, grouped by distance.
+
+        Arguments:
+        start_id (string): The id of the start vertex.
+        max_distance (integer): The largest distance from the start vertex to look at
+
+        Returns:
+        list<list<string>>: The vertex ids 0, 1, ..., max_distance away from the
+                            start vertex (shorter if the BFS runs out of vertices)
+        """
+        return self.find_vertex_rings_many([start_id], max_distance)
+
+    def find_vertex_rings_many(self, start_ids, max_distance):
+        """
+        Find all vertices up to n distance away from the nearest of several start
+        vertices in one pass, grouped by distance.
+
+        Arguments:
+        start_ids (iterable<string>): The ids of the start vertices.
+        max_distance (integer): The largest distance from the start vertices to look at
+
+        Returns:
+        list<list<string>>: The vertex ids 0, 1, ..., max_distance away from the
+                            start vertices (shorter if the BFS runs out of
+                            vertices, and empty if max_distance is negative)
+        """
+        start_ids = list(start_ids)
+        # check to make sure we have valid start ids
+        for start_id in start_ids:
+            if not self.contains_id(start_id):
+                raise KeyError("One or more vertices are not in the graph!")
+        # no vertex is a negative distance away, so there is nothing to search
+        if max_distance < 0:
+            return list()
+        # only expand the layers that will be returned
+        return list(islice(self._layers_generator(start_ids), max_distance + 1))
+
+    def is_bipartite(self, return_witness=False):
+        """
+        Return True if the graph is bipartite, False otherwise: whether its
+        vertices can be split into two sides with every edge going between
+        the sides. Every component is 2-colored by a breadth-first search,
+        in one O(V + E) pass that stops at the first edge whose ends get the
+        same color. Edge directions are ignored: on a directed graph the
+        edges into each vertex are used too, read from the in-edge index if
+        the graph keeps one (see get_predecessors). Otherwise they are
+        collected just for this call, so the check never starts the index,
+        but that pre-pass always costs O(V + E), even when the very first
+        edge settles the answer; make the graph with track_in_edges=True to
+        skip it.
+
+        Parameters:
+        return_witness (boolean): Whether to also return evidence for the answer.
+
+        Returns:
+        boolean: If return_witness is False.
+        tuple: (True, [list<string>, list<string>]) with the ids on each side,
+               or (False, list<string>) with the ids around an odd cycle,
+               starting and ending with the same vertex, e.g.
+               ['A', 'B', 'C', 'A'].
+        """
+        table = self.__vertex_table
+        # color of each vertex index: 0 until it is reached, then 1 or 2
+        colors = bytearray(len(table))
+        # the index each vertex was reached from, to trace an odd cycle
+        parents = array('i', [-1]) * len(table) if return_witness else None
+        # without an in-edge index, the edges into index i come from
+        # in_sources[in_offsets[i]:in_offsets[i + 1]] instead
+        in_offsets = in_sources = None
+        if self.__is_directed and not self.__tracks_in_edges:
+            in_offsets, in_sources = self._in_edge_arrays()
+        # the in-edges of the current vertex are in_edges[in_start:in_stop];
+        # an undirected graph has none beyond its neighbors
+        in_edges, in_start, in_stop = in_sources, 0, 0
+        for root in self.__vertex_dict.values():
+            if colors[root._index]:
+                continue
+            colors[root._index] = 1
+            queue = deque([root._index])
+            while queue:
+                current = queue.popleft()
+                vertex_obj = table[current]
+                neighbor_color = 3 - colors[current]
+                if in_sources is not None:
+                    in_start, in_stop = in_offsets[current], in_offsets[current + 1]
+                elif self.__is_directed:
+                    in_edges = vertex_obj._in_neighbors
+                    in_stop = len(in_edges)
+                for neighbor in vertex_obj._neighbors:
+                    if not colors[neighbor]:
+                        colors[neighbor] = neighbor_color
+                        if parents is not None:
+                            parents[neighbor] = current
+                        queue.append(neighbor)
+                    elif colors[neighbor] != neighbor_color:
+                        return self._not_bipartite(parents, current, neighbor)
+                for slot in range(in_start, in_stop):
+                    neighbor = in_edges[slot]
+                    if not colors[neighbor]:
+                        colors[neighbor] = neighbor_color
+                        if parents is not None:
+                            parents[neighbor] = current
+                        queue.append(neighbor)
+                    elif colors[neighbor] != neighbor_color:
+                        return self._not_bipartite(parents, current, neighbor)
+        if not return_witness:
+            return True
+        sides = [list(), list()]
+        for vertex_id, vertex_obj in self.__vertex_dict.items():
+            sides[colors[vertex_obj._index] - 1].append(vertex_id)
+        return True, sides
+
+    def _in_edge_arrays(self):
+        """
+        Collect the edges into each vertex of a directed graph, in O(V + E),
+        without starting its in-edge index: the edges are counting-sorted by
+        target into CSR-style arrays, which the caller drops when done.
+
+        Returns:
+        tuple: (offsets, sources) where the indices of the vertices with an
+               edge to vertex index i are sources[offsets[i]:offsets[i + 1]].
+        """
+        vertices = self.__vertex_dict.values()
+        offsets = array('q', [0]) * (len(self.__vertex_table) + 1)
+        # count the edges into each vertex, then sum up the counts
+        for vertex_obj in vertices:
+            for neighbor in vertex_obj._neighbors:
+                offsets[neighbor + 1] += 1
+        for index in range(1, len(offsets)):
+            offsets[index] += offsets[index - 1]
+        # place each edge in the next free slot of its target
+        sources = array('i', [0]) * offsets[-1]
+        free_slots = offsets[:-1]
+        for vertex_obj in vertices:
+            for neighbor in vertex_obj._neighbors:
+                sources[free_slots[neighbor]] = vertex_obj._index
+                free_slots[neighbor] += 1
+        return offsets, sources
+
+    def _not_bipartite(self, parents, index1, index2):
+        """Return the answer of is_bipartite for an edge between two vertices
+           of the same color: False, with the odd cycle it closes if parents
+           are being kept for a witness."""
+        if parents is None:
+            return False
+        return False, self._odd_cycle(parents, index1, index2)
+
+    def _odd_cycle(self, parents, index1, index2):
+        """
+        Return the ids around the odd cycle closed by an edge between two
+        vertices of the same color in a breadth-first search tree: up the
+        tree from index1 to the lowest common ancestor, then down to index2.
         """
-        # visit this vertex
-        visited.add(vertex)
-        connected.append(vertex.get_id())
-        # iterate over neighbors
-        neighbors = vertex.get_neighbors()
-        for n in neighbors:
-            if n not in visited:
-                self.dfs_for_cc(n, visited, connected)
-        return connected
+        # the ancestors of index1, and their position on its path to the root
+        path1 = [index1]
+        while parents[path1[-1]] != -1:
+            path1.append(parents[path1[-1]])
+        position = {index: i for i, index in enumerate(path1)}
+        # climb from index2 until meeting the path from index1
+        path2 = [index2]
+        while path2[-1] not in position:
+            path2.append(parents[path2[-1]])
+        cycle = path1[:position[path2[-1]] + 1] + path2[-2::-1] + [index1]
+        table = self.__vertex_table
+        return [table[index].get_id() for index in cycle]
+
+    def _dfs_events(self, start_id, colors):
+        """
+        Iterative depth-first search from start_id, shared by the DFS-based
+        algorithms. An explicit stack replaces recursion, so paths of any
+        length are fine, and vertices are colored WHITE (not seen yet),
+        GRAY (on the current path) or BLACK (finished) in `colors`.
+
+        Parameters:
+        start_id (string): The id of a WHITE vertex to start from.
+        colors (dict): vertex id -> color, shared between calls so that a
+                       whole graph can be covered one root at a time.
+
+        Returns:
+        generator<tuple>: (event, vertex_id, other_id) tuples, where event is
+            ENTER (other_id is the parent, or None for start_id),
+            BACK_EDGE (an edge from vertex_id to other_id, which is GRAY), or
+            EXIT (other_id is the parent; vertex_id is now BLACK).
+        """
+        colors[start_id] = GRAY
+        yield ENTER, start_id, None
+        # stack of (vertex id, iterator over the neighbors left to explore)
+        stack = [(start_id, self._neighbor_ids(start_id))]
+        while stack:
+            vertex_id, neighbors = stack[-1]
+            for neighbor_id in neighbors:
+                color = colors.get(neighbor_id, WHITE)
+                if color == WHITE:
+                    colors[neighbor_id] = GRAY
+                    yield ENTER, neighbor_id, vertex_id
+                    # go deeper before looking at the remaining neighbors
+                    stack.append((neighbor_id, self._neighbor_ids(neighbor_id)))
+                    break
+                elif color == GRAY:
+                    yield BACK_EDGE, vertex_id, neighbor_id
+            else:
+                # every neighbor explored, so move back "up" the stack
+                stack.pop()
+                colors[vertex_id] = BLACK
+                yield EXIT, vertex_id, stack[-1][0] if stack else None
 
     def find_connected_components(self):
         """Return a 2D list of connected components.
            Each of the inner lists contains vertex ids.
            A connected component of a graph is a set
            of vertices for which there is a path between any pair of vertices.
+           For directed graphs, see strongly_connected_components.
 
         """
-        # set for all previous seen vertices
-        visited = set()
+        # colors of all previously seen vertices
+        colors = dict()
         # execute DFS - find all connected components
         all_connected_components = list()
-        for vertex in self.__vertex_dict.values():
-            if vertex not in visited:
-                components = list()
-                self.dfs_for_cc(vertex, visited, components)
+        for vertex_id in self.__vertex_dict:
+            if vertex_id not in colors:
+                components = [
+                    entered_id for event, entered_id, _ in
+                    self._dfs_events(vertex_id, colors) if event == ENTER
+                ]
                 all_connected_components.append(components)
         # return the connected components
         return all_connected_components
 
-    def dfs_for_cycles(self, start_vertex, visited, current_path):
-        """Recursive implements DFS, specifically for finding out
-           whether the path in a graph leads back where it began.
-
-           Parameters:
-           start_vertex(Vertex): the vertex from where we begin
-           visited(set): all vertices visited so far in the overall graph
-           current_path: all vertices visted within this set of connected components
+    def strongly_connected_components(self):
+        """
+        Find the strongly connected components of the graph with Tarjan's
+        Algorithm, in O(V + E): the largest groups of vertices with a path
+        from every vertex in the group to every other. An explicit stack
+        replaces recursion, so paths of any length are fine. In an undirected
+        graph these are its connected components.
 
-           Returns: bool
+        Returns:
+        list<list<string>>: The vertex ids in each component. The components
+                            come in topological order: no edge leads from a
+                            component to one listed before it.
+        """
+        # the order each vertex was discovered in, and the lowest discovery
+        # number reachable from it through its DFS subtree and one more edge
+        discovered, low_links = dict(), dict()
+        # vertices whose component is not settled yet, in discovery order
+        unassigned, is_unassigned = list(), set()
+        # Tarjan's Algorithm finds the components in reverse topological order
+        components = list()
+        for root_id in self.__vertex_dict:
+            if root_id in discovered:
+                continue
+            discovered[root_id] = low_links[root_id] = len(discovered)
+            unassigned.append(root_id)
+            is_unassigned.add(root_id)
+            # stack of (vertex id, iterator over the neighbors left to explore)
+            stack = [(root_id, self._neighbor_ids(root_id))]
+            while stack:
+                vertex_id, neighbors = stack[-1]
+                for neighbor_id in neighbors:
+                    if neighbor_id not in discovered:
+                        discovered[neighbor_id] = low_links[neighbor_id] = len(discovered)
+                        unassigned.append(neighbor_id)
+                        is_unassigned.add(neighbor_id)
+                        # go deeper before looking at the remaining neighbors
+                        stack.append((neighbor_id, self._neighbor_ids(neighbor_id)))
+                        break
+                    elif neighbor_id in is_unassigned:
+                        low_links[vertex_id] = min(
+                            low_links[vertex_id], discovered[neighbor_id])
+                else:
+                    stack.pop()
+                    if stack:
+                        parent_id = stack[-1][0]
+                        low_links[parent_id] = min(
+                            low_links[parent_id], low_links[vertex_id])
+                    # a vertex that reaches nothing older is its component's root
+                    if low_links[vertex_id] == discovered[vertex_id]:
+                        position = len(unassigned) - 1
+                        while unassigned[position] != vertex_id:
+                            position -= 1
+                        component = unassigned[position:]
+                        del unassigned[position:]
+                        is_unassigned.difference_update(component)
+                        components.append(component)
+        components.reverse()
+        return components
 
+    def condensation(self):
         """
-        has_a_cycle = False
-       # visit this vertex
-        visited.add(start_vertex)
-        current_path.append(start_vertex)
-        neighbors = start_vertex.get_neighbors()
-        for neighbor in neighbors:
-            if neighbor not in current_path:
-                has_a_cycle = self.dfs_for_cycles(neighbor, visited, current_path)
-            elif neighbor in current_path:
-                return True
-        # remove the vertex we move back "up" the call stack
-        current_path.remove(start_vertex)
-        # catch a cycle that's found at the end of a path, after returning
-        # from that stack frame
-        if has_a_cycle is True:
-            return has_a_cycle
+        Build the condensation of the graph: a directed acyclic graph with one
+        vertex per strongly connected component, and an edge between two
+        components wherever an edge of this graph joins them. Reachability and
+        topological questions can then be answered on the (often far smaller)
+        condensation. Runs in O(V + E).
 
+        Returns:
+        tuple: (Graph, list<list<string>>) the condensation, whose vertex ids
+               are the integers 0..k-1, and the vertex ids in each component,
+               so that components[i] are the members of vertex i. The
+               components are in topological order (see
+               strongly_connected_components).
+        """
+        components = self.strongly_connected_components()
+        component_of = dict()
+        for component_number, component in enumerate(components):
+            for vertex_id in component:
+                component_of[vertex_id] = component_number
+        condensed = Graph(is_directed=True)
+        condensed.add_vertices(range(len(components)))
+        for component_number, component in enumerate(components):
+            # each edge between two components is only added once
+            targets = dict()
+            for vertex_id in component:
+                for neighbor_id in self._neighbor_ids(vertex_id):
+                    target = component_of[neighbor_id]
+                    if target != component_number:
+                        targets[target] = None
+            condensed.add_edges((component_number, target) for target in targets)
+        return condensed, components
 
     def contains_cycle(self):
-        """Returns True if the Graph contains a cycle."""
-        # init a visited set
-        visited = set()
-        # iterate over all vertices
-        for vertex in self.__vertex_dict.values():
-            # execute DFS on every unvisited vertex
-            if vertex not in visited:
-                # keep track of vetices visited so far
-                current_path = list()
-                contains_cycle = self.dfs_for_cycles(vertex, visited, current_path)
-                # cycle found in one of the connected components
-                if contains_cycle is True:
-                    return contains_cycle
+        """Returns True if the Graph contains a cycle.
+           In an undirected graph, going back along the edge just taken
+           does not count as a cycle.
+        """
+        return self.find_cycle() is not None
+
+    def find_cycle(self):
+        """
+        Find a cycle in the graph, if it has one, with a depth-first search.
+        In an undirected graph, going back along the edge just taken does not
+        count as a cycle.
+
+        Returns:
+        list<string>: The ids of the vertices around the cycle, starting and
+                      ending with the same vertex, e.g. ['A', 'B', 'C', 'A'].
+                      None if the graph has no cycle.
+        """
+        # colors of all previously seen vertices
+        colors = dict()
+        # the vertex each vertex was reached from
+        parents = dict()
+        # execute DFS on every unvisited vertex
+        for vertex_id in self.__vertex_dict:
+            if vertex_id in colors:
+                continue
+            for event, current_id, other_id in self._dfs_events(vertex_id, colors):
+                if event == ENTER:
+                    parents[current_id] = other_id
+                # an edge back onto the current path closes a cycle
+                elif event == BACK_EDGE:
+                    if self.__is_directed or parents[current_id] != other_id:
+                        # walk up the path, from current_id back to other_id
+                        cycle = [current_id]
+                        while cycle[-1] != other_id:
+                            cycle.append(parents[cycle[-1]])
+                        cycle.reverse()
+                        cycle.append(other_id)
+                        return cycle
         # after all connected components traversed
-        return False
+        return None
 
     def find_path_dfs_iter(self, start_id, target_id):
         """
@@ -394,7 +1318,7 @@ class Graph:
             # Pop a node from the stack.
             node = self.__vertex_dict[stack.pop()]
             # For each of the node’s neighbors:
-            for neighbor in node.get_neighbors():
+            for neighbor in node.iter_neighbors():
                 neighbor_id = neighbor.get_id()
                 # If the neighbor has already been visited, skip it.
                 if neighbor_id not in distances:
@@ -406,35 +1330,68 @@ class Graph:
         # Look up the target node in distances
         return distances[target_id]
 
-    def dfs_for_top_sort(self, vertex, solution_stack, visited):
-        """This is recursive. Don't forget it!"""
-        neighbors = vertex.get_neighbors()
-        visited.add(vertex)
-        # visit neighbors
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                self.dfs_for_top_sort(neighbor, solution_stack, visited)
-        # visit this vertex
-        solution_stack.append(vertex)
-        return visited, solution_stack
-
     def topological_sort(self):
         """Return a list of vertex ids in topological order."""
-        # Create a stack to hold the vertices
+        # Create a stack to hold the vertices, in the order they finish
         solution_stack = list()
-        # set of visited vertices; only DFS on vertices not visited yet
-        visited = set()
+        # colors of visited vertices; only DFS on vertices not visited yet
+        colors = dict()
         # For each unvisited vertex, execute a DFS from that vertex
-        for vertex in self.__vertex_dict.values():
-            if vertex not in visited:
-                visited, solution_stack = (
-                    self.dfs_for_top_sort(vertex, solution_stack, visited)
+        for vertex_id in self.__vertex_dict:
+            if vertex_id not in colors:
+                solution_stack.extend(
+                    finished_id for event, finished_id, _ in
+                    self._dfs_events(vertex_id, colors) if event == EXIT
                 )
         # Reverse the contents of the stack
-        solution = list()
-        for i in range(len(self.__vertex_dict)):
-            solution.append(solution_stack.pop().get_id())
-        return solution
+        solution_stack.reverse()
+        return solution_stack
+
+    def topological_levels(self):
+        """
+        Group the vertices of a directed acyclic graph into levels, using
+        Kahn's Algorithm. The first level holds every vertex with no edges
+        into it; each later level holds the vertices whose predecessors are
+        all in earlier levels. So all the vertices in one level can be
+        handled at the same time (e.g. a wave of jobs run in parallel), once
+        the levels before it are done. Runs in O(V + E).
+
+        Returns:
+        list<list<string>>: The vertex ids in each level, in order.
+
+        Raises:
+        ValueError: If the graph is undirected.
+        CycleError: If the graph has a cycle, which it carries as a list of
+                    ids in its `cycle` attribute (see find_cycle). It is a
+                    ValueError, too.
+        """
+        if self.__is_directed is False:
+            raise ValueError('Only a directed graph has a topological order.')
+        # count the edges into each vertex that are not yet accounted for
+        in_degrees = dict.fromkeys(self.__vertex_dict, 0)
+        for vertex_id in self.__vertex_dict:
+            for neighbor_id in self._neighbor_ids(vertex_id):
+                in_degrees[neighbor_id] += 1
+        levels = list()
+        level = [
+            vertex_id for vertex_id, in_degree in in_degrees.items() if in_degree == 0
+        ]
+        num_placed = 0
+        while level:
+            levels.append(level)
+            num_placed += len(level)
+            # a vertex is ready once the last of its predecessors is placed
+            next_level = list()
+            for vertex_id in level:
+                for neighbor_id in self._neighbor_ids(vertex_id):
+                    in_degrees[neighbor_id] -= 1
+                    if in_degrees[neighbor_id] == 0:
+                        next_level.append(neighbor_id)
+            level = next_level
+        # vertices on (or after) a cycle never run out of predecessors
+        if num_placed < len(self.__vertex_dict):
+            raise CycleError(self.find_cycle())
+        return levels
 
     def choose_color(self, vertex_id, vertex_id_color):
         pass
@@ -448,7 +1405,7 @@ class Graph:
             # assign the current vertex a color if not already given
             if vertex_id not in vertex_id_color:
                 # make sure it's not one of the neighbors' colors
-                neighbors = self.get_vertex(vertex_id).get_neighbors()
+                neighbors = self.get_vertex(vertex_id).iter_neighbors()
                 neighbors_colors = set()
                 for neighbor in neighbors:
                     neighbor_id = neighbor.get_id()
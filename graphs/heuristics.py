@@ -0,0 +1,64 @@
+import math
+
+# mean radius of the Earth, in kilometers
+EARTH_RADIUS_KM = 6371.0088
+
+
+def euclidean_distance(point1, point2):
+    """Return the straight-line distance between two points, given as
+       coordinate tuples of the same length."""
+    return math.dist(point1, point2)
+
+
+def haversine_distance(point1, point2, radius=EARTH_RADIUS_KM):
+    """
+    Return the great-circle distance between two points on a sphere.
+
+    Parameters:
+    point1 (tuple): (latitude, longitude) of the first point, in degrees.
+    point2 (tuple): (latitude, longitude) of the second point, in degrees.
+    radius (float): The radius of the sphere; the default gives kilometers
+                    on the Earth.
+
+    Returns:
+    float: The distance, in the same unit as the radius.
+    """
+    lat1, lon1 = map(math.radians, point1)
+    lat2, lon2 = map(math.radians, point2)
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * radius * math.asin(min(1.0, math.sqrt(a)))
+
+
+METRICS = {
+    'euclidean': euclidean_distance,
+    'haversine': haversine_distance,
+}
+
+
+def coordinate_heuristic(coordinates, metric='euclidean', scale=1):
+    """
+    Make an A* heuristic out of a table of vertex coordinates.
+
+    The estimate is only a lower bound on the true cost (as A* needs it to
+    be, to find shortest paths) if no edge weighs less than `scale` times
+    the distance between its ends.
+
+    Parameters:
+    coordinates (dict): vertex id -> coordinate tuple.
+    metric (string or callable): 'euclidean', 'haversine', or a function
+                                 of two coordinate tuples.
+    scale (float): Multiplies every distance, e.g. to convert kilometers
+                   to travel time.
+
+    Returns:
+    callable: heuristic(vertex_id, target_id) -> estimated cost.
+    """
+    distance = METRICS[metric] if isinstance(metric, str) else metric
+
+    def heuristic(vertex_id, target_id):
+        return scale * distance(coordinates[vertex_id], coordinates[target_id])
+
+    return heuristic
@@ -0,0 +1,208 @@
+import struct
+import sys
+from array import array
+from graphs.csr import single_source_distances
+
+MAGIC = b'GRAPHALT'
+VERSION = 1
+HEADER = struct.Struct('<8sHHxxxxqq')
+
+# flag bits
+DIRECTED = 1
+
+INFINITY = float('inf')
+
+
+class LandmarkIndex(object):
+    """ LandmarkIndex Class
+    Precomputed distances to and from a few landmark vertices, for ALT
+    (A*, Landmarks and Triangle inequality) shortest path queries.
+
+    For any landmark L, the triangle inequality gives two lower bounds on
+    the distance from v to t:
+        d(L, t) - d(L, v)    (forward distances, from the landmark)
+        d(v, L) - d(t, L)    (backward distances, to the landmark)
+    The largest of these bounds over all landmarks is used as the A*
+    estimate. In undirected graphs the two sets of distances are the same.
+    """
+
+    def __init__(self, vertex_ids, landmarks, forward, backward, is_directed=True):
+        """
+        Initialize the index from already-computed distances.
+
+        Parameters:
+        vertex_ids (list): The id of the vertex at each integer index.
+        landmarks (list<int>): The indices of the landmark vertices.
+        forward (list<array>): For each landmark, its distance to every vertex.
+        backward (list<array>): For each landmark, every vertex's distance to it.
+        is_directed (boolean): Whether the graph is directed.
+        """
+        self.__vertex_ids = vertex_ids
+        self.__index = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+        self.__landmarks = list(landmarks)
+        self.__forward = forward
+        self.__backward = backward
+        self.__is_directed = is_directed
+
+    @classmethod
+    def build(cls, csr, num_landmarks=4, strategy='farthest'):
+        """
+        Choose landmarks and compute their distance arrays, with one search
+        per landmark in each direction.
+
+        Parameters:
+        csr (CSRGraph): A frozen, weighted view of the graph.
+        num_landmarks (int): How many landmarks to choose, at most V.
+        strategy (string): 'farthest' picks each landmark as far as possible
+                           from the ones picked so far (covering every
+                           component first); 'degree' picks the vertices with
+                           the most edges.
+
+        Returns:
+        LandmarkIndex: The new index.
+        """
+        if strategy not in ('farthest', 'degree'):
+            raise ValueError(f'Unknown landmark strategy: {strategy}')
+        num_landmarks = min(num_landmarks, csr.num_vertices())
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+        if strategy == 'degree':
+            landmarks = sorted(
+                range(csr.num_vertices()),
+                key=lambda i: offsets[i] - offsets[i + 1])[:num_landmarks]
+            forward = [
+                single_source_distances(offsets, targets, weights, landmark)
+                for landmark in landmarks
+            ]
+        else:
+            landmarks, forward = cls._farthest_landmarks(csr, num_landmarks)
+        backward = forward
+        if csr.is_directed:
+            reverse = csr.transpose()
+            backward = [
+                single_source_distances(
+                    reverse.offsets, reverse.targets, reverse.weights, landmark)
+                for landmark in landmarks
+            ]
+        return cls(csr.vertex_ids, landmarks, forward, backward, csr.is_directed)
+
+    @staticmethod
+    def _farthest_landmarks(csr, num_landmarks):
+        """Pick landmarks by farthest-point sampling from the first vertex.
+           Returns the landmark indices and their forward distance arrays."""
+        landmarks, forward = list(), list()
+        if num_landmarks == 0:
+            return landmarks, forward
+        # the distance from each vertex to its nearest landmark so far
+        nearest = single_source_distances(
+            csr.offsets, csr.targets, csr.weights, 0)
+        while len(landmarks) < num_landmarks:
+            # vertices no landmark reaches (inf) come first
+            candidate = max(range(csr.num_vertices()), key=nearest.__getitem__)
+            if nearest[candidate] == 0:
+                break  # every remaining vertex is already a landmark
+            distances = single_source_distances(
+                csr.offsets, csr.targets, csr.weights, candidate)
+            landmarks.append(candidate)
+            forward.append(distances)
+            if len(landmarks) == 1:
+                nearest = array('d', distances)
+            else:
+                for i in range(len(nearest)):
+                    if distances[i] < nearest[i]:
+                        nearest[i] = distances[i]
+        return landmarks, forward
+
+    @property
+    def landmarks(self):
+        """The ids of the landmark vertices."""
+        return [self.__vertex_ids[landmark] for landmark in self.__landmarks]
+
+    def num_vertices(self):
+        """Return the number of vertices the index covers."""
+        return len(self.__vertex_ids)
+
+    def lower_bound(self, vertex_id, target_id):
+        """
+        Return a lower bound on the distance from one vertex to another.
+
+        Parameters:
+        vertex_id (string): The id of the vertex to start from.
+        target_id (string): The id of the target vertex.
+
+        Returns:
+        float: The bound; inf if the landmarks prove there is no path.
+        """
+        v, t = self.__index[vertex_id], self.__index[target_id]
+        bound = 0
+        for distances in self.__forward:
+            # skip landmarks that cannot reach v, they tell us nothing
+            if distances[v] != INFINITY and distances[t] - distances[v] > bound:
+                bound = distances[t] - distances[v]
+        for distances in self.__backward:
+            # skip landmarks that t cannot reach, they tell us nothing
+            if distances[t] != INFINITY and distances[v] - distances[t] > bound:
+                bound = distances[v] - distances[t]
+        return bound
+
+    def save(self, filename):
+        """
+        Write the index to the specified filename, so it can be stored next
+        to the graph it was built for.
+
+        Parameters:
+        filename (string): The relative path of the file to be written
+        """
+        flags = DIRECTED if self.__is_directed else 0
+        sections = [array('q', self.__landmarks)] + list(self.__forward)
+        if self.__is_directed:
+            sections.extend(self.__backward)
+        with open(filename, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, flags, self.num_vertices(),
+                                len(self.__landmarks)))
+            for section in sections:
+                section = array(section.typecode, section)
+                if sys.byteorder != 'little':
+                    section.byteswap()
+                f.write(section.tobytes())
+
+    @classmethod
+    def load(cls, filename, vertex_ids):
+        """
+        Read an index written by save.
+
+        Parameters:
+        filename (string): The relative path of the file to be loaded
+        vertex_ids (list): The id of the vertex at each integer index, in the
+                           order of the graph's CSR view.
+
+        Returns:
+        LandmarkIndex: The index.
+        """
+        with open(filename, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError('This file is not a landmark index')
+            magic, version, flags, num_vertices, num_landmarks = (
+                HEADER.unpack(header)
+            )
+            if magic != MAGIC:
+                raise ValueError('This file is not a landmark index')
+            if version != VERSION:
+                raise ValueError(f'Unsupported landmark index version: {version}')
+            if num_vertices != len(vertex_ids):
+                raise ValueError('This landmark index was built for a different graph')
+
+            def read_array(typecode, length):
+                """Read the next section of the file into an array."""
+                values = array(typecode)
+                values.fromfile(f, length)
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                return values
+
+            landmarks = read_array('q', num_landmarks)
+            forward = [read_array('d', num_vertices) for _ in landmarks]
+            backward = forward
+            if flags & DIRECTED:
+                backward = [read_array('d', num_vertices) for _ in landmarks]
+        return cls(vertex_ids, landmarks, forward, backward, bool(flags & DIRECTED))
@@ -0,0 +1,175 @@
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+from graphs.csr import CSRGraph, single_source_distances
+
+# The graph arrays and output file of the current worker process, set up
+# once per worker by _init_worker.
+_worker_state = {}
+
+
+def _share_array(values, typecode):
+    """Copy a sequence of numbers into a new block of shared memory.
+
+    Returns:
+    tuple: (SharedMemory, string, int) the block, the typecode to read it
+           with, and the number of values in it.
+    """
+    values = values if isinstance(values, array) else array(typecode, values)
+    data = memoryview(values).cast('B')
+    # a block must be at least one byte long
+    block = SharedMemory(create=True, size=max(len(data), 1))
+    block.buf[:len(data)] = data
+    return block, values.typecode, len(values)
+
+
+def _open_output(out, num_rows, num_columns, create=False):
+    """Memory-map the output matrix file, first creating it at the right
+       size if asked to. Returns None if the matrix would be empty."""
+    size = 8 * num_rows * num_columns
+    if create:
+        with open(out, 'wb') as f:
+            f.truncate(size)
+    if size == 0:
+        return None
+    with open(out, 'r+b') as f:
+        return mmap.mmap(f.fileno(), size)
+
+
+def _init_worker(blocks, out, num_rows, num_columns):
+    """
+    Attach a worker process to the shared graph arrays (and output file).
+
+    Parameters:
+    blocks (list<tuple>): (name, typecode, length) of the offsets, targets
+                          and (if weighted) weights blocks.
+    out (string): The path of the output matrix file, or None.
+    num_rows (int): The number of sources, i.e. rows in the output matrix.
+    num_columns (int): The number of vertices, i.e. columns in the output matrix.
+    """
+    arrays = list()
+    for name, typecode, length in blocks:
+        block = SharedMemory(name=name)
+        # keep the block open for as long as the worker lives
+        _worker_state.setdefault('blocks', []).append(block)
+        arrays.append(block.buf[:length * array(typecode).itemsize].cast(typecode))
+    if len(arrays) == 2:
+        arrays.append(None)
+    _worker_state['arrays'] = arrays
+    _worker_state['columns'] = num_columns
+    if out is not None:
+        _worker_state['out'] = _open_output(out, num_rows, num_columns)
+
+
+def _distances_task(row, source):
+    """
+    Run one single-source search in a worker process.
+
+    Returns:
+    tuple: (int, array('d')) the row number, and the distances from the
+           source; when writing to an output file, the distances are
+           written to its row instead and None is returned with the row.
+    """
+    offsets, targets, weights = _worker_state['arrays']
+    distances = single_source_distances(offsets, targets, weights, source)
+    out = _worker_state.get('out')
+    if out is None:
+        return row, distances
+    row_bytes = 8 * _worker_state['columns']
+    out[row * row_bytes:(row + 1) * row_bytes] = distances.tobytes()
+    return row, None
+
+
+def multi_source_shortest_paths(graph, sources, workers=None, out=None):
+    """
+    Compute the shortest distances from many sources to every vertex, fanning
+    the sources out over a pool of worker processes.
+
+    The graph is frozen into CSR arrays, which are copied once into shared
+    memory; every worker attaches to the same copy when it starts, so no
+    vertex objects are pickled. Results are yielded as soon as each source
+    finishes, so they arrive in no particular order.
+
+    Parameters:
+    graph (Graph or CSRGraph): The graph to search; Graph and WeightedGraph
+                               objects are frozen with to_csr() first.
+    sources (iterable<string>): The ids of the source vertices.
+    workers (int): How many processes to use; defaults to os.cpu_count().
+                   With 1 worker, the searches run in this process.
+    out (string): Optional path of a file to hold the distance matrix, as
+                  float64 values in row-major order: one row per source (in
+                  the order given) and one column per vertex. The file is
+                  memory-mapped, and workers write their rows straight into it.
+
+    Returns:
+    generator<tuple>: (source_id, distances) pairs, where distances[i] is the
+                      distance to the vertex at index i of the CSR view (the
+                      order vertices were added to the graph), or inf if it is
+                      unreachable. With `out`, distances is a view of the
+                      source's row of the mapped file.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.to_csr()
+    sources = list(sources)
+    for source_id in sources:
+        if not csr.contains_id(source_id):
+            raise KeyError("One or more vertices are not in the graph!")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('There must be at least one worker.')
+    return _multi_source_generator(csr, sources, workers, out)
+
+
+def _multi_source_generator(csr, sources, workers, out):
+    """Yield the results of multi_source_shortest_paths."""
+    num_columns = csr.num_vertices()
+    out_map = None
+    if out is not None:
+        out_map = _open_output(out, len(sources), num_columns, create=True)
+    out_view = memoryview(out_map).cast('d') if out_map is not None else None
+
+    def result(row, distances):
+        """Pair a finished row with its source id, reading it from the file
+           if it was written there."""
+        if out_view is not None:
+            distances = out_view[row * num_columns:(row + 1) * num_columns]
+        return sources[row], distances
+
+    if workers == 1:
+        # no pool: run the searches in this process, one at a time
+        for row, source_id in enumerate(sources):
+            distances = csr.shortest_path_lengths(source_id)
+            if out_map is not None:
+                start = row * 8 * num_columns
+                out_map[start:start + 8 * num_columns] = distances.tobytes()
+            yield result(row, distances)
+        return
+
+    columns = [(csr.offsets, 'q'), (csr.targets, 'i')]
+    if csr.is_weighted():
+        columns.append((csr.weights, 'd'))
+    shared = [_share_array(values, typecode) for values, typecode in columns]
+    try:
+        blocks = [
+            (block.name, typecode, length) for block, typecode, length in shared
+        ]
+        with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker,
+                initargs=(blocks, out, len(sources), num_columns)) as executor:
+            futures = [
+                executor.submit(_distances_task, row, csr.index_of(source_id))
+                for row, source_id in enumerate(sources)
+            ]
+            try:
+                for future in as_completed(futures):
+                    yield result(*future.result())
+            finally:
+                # stop any searches not yet started if the caller stops early
+                for future in futures:
+                    future.cancel()
+    finally:
+        for block, _, _ in shared:
+            block.close()
+            block.unlink()
@@ -1,72 +1,204 @@
-from graphs.graph import Graph, Vertex
+import math
+from array import array
 from collections import deque
-from graphs.binaryheap import BinaryMinHeap
+from graphs.graph import Graph, Vertex, ReversedVertexMixin, _is_new_neighbor
+from graphs.csr import CSRGraph
+from operator import itemgetter
+from graphs.binaryheap import IndexedBinaryMinHeap
+from graphs.disjoint_set import DisjointSet
+from graphs.heuristics import coordinate_heuristic
+from graphs.landmarks import LandmarkIndex
+from graphs.parallel import multi_source_shortest_paths
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# the largest weight for which method='auto' picks Dial's bucket queue over
+# the binary heap; past it, most of the V * C bucket scans are wasted
+DIAL_MAX_WEIGHT = 100
+
+SHORTEST_PATH_METHODS = ('auto', 'dijkstra', '0-1', 'dial')
+
+
+# the bounds of an array('q'), and of the ints an array('d') stores exactly
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+FLOAT_EXACT_INT = 2 ** 53
+
+
+def _fits_float(weight):
+    """Return True if storing weight in an array('d') keeps its exact value."""
+    if isinstance(weight, float):
+        return True
+    return isinstance(weight, int) and -FLOAT_EXACT_INT <= weight <= FLOAT_EXACT_INT
+
+
+def _append_weight(weights, weight):
+    """Append a weight to the weights of some edges, and return the container
+       used: an array('q') while every weight is an int within 64 bits, an
+       array('d') while every weight is a float (or an int a float holds
+       exactly), and a plain list for anything else, e.g. 2 ** 70, Fraction
+       or Decimal, so that no weight is ever rounded."""
+    if isinstance(weights, array):
+        if weights.typecode == 'q' and not (
+                isinstance(weight, int) and INT64_MIN <= weight <= INT64_MAX):
+            if _fits_float(weight) and all(map(_fits_float, weights)):
+                weights = array('d', weights)
+            else:
+                weights = list(weights)
+        elif weights.typecode == 'd' and not _fits_float(weight):
+            # the ints stored so far are floats by now, and stay floats
+            weights = list(weights)
+    weights.append(weight)
+    return weights
+
+
+def _is_whole_weight(weight):
+    """Return True if a weight is a non-negative integer value. Infinite and
+       NaN weights are not, and ints too large for a float still are."""
+    if isinstance(weight, int):
+        return weight >= 0
+    return weight >= 0 and math.isfinite(weight) and weight == int(weight)
+
 
 class WeightedVertex(Vertex):
-    def __init__(self, vertex_id):
+    """
+    Defines a single vertex, its neighbors and the weights of the edges to
+    them. The weights are kept parallel to the neighbor indices: in an
+    array('q') while every weight is an int that fits in 64 bits, then in an
+    array('d') while every weight fits in a float; any other weight (such as
+    2 ** 70, a Fraction or a Decimal) moves them to a list, which keeps it
+    exactly as given.
+    """
+    __slots__ = ('_weights', '_in_weights')
+
+    def __init__(self, vertex_id, vertex_table=None, index=None):
         '''
         Initialize a vertex and its neighbors.
 
         Parameters:
         vertex_id (string): A unique identifier to identify this vertex.
+        vertex_table (list<Vertex>): The table of vertices this vertex belongs to.
+        index (int): The vertex's place in the table, if it replaces an
+                     existing vertex.
         '''
-        self.id = vertex_id
-        self.neighbors_dict = {} # id -> (obj, weight)
-        # super(Vertex, self).__init__(vertex_id)
+        super().__init__(vertex_id, vertex_table, index)
+        self._weights = array('q') # weight of the edge to each neighbor
+        self._in_weights = None # weight of the edge from each predecessor
+
+    @property
+    def id(self):
+        """The id of this vertex."""
+        return self.get_id()
+
+    @property
+    def neighbors_dict(self):
+        """A new dictionary of neighbor id -> (obj, weight)."""
+        return {
+            neighbor.get_id(): (neighbor, weight)
+            for neighbor, weight in self.iter_neighbors_with_weights()
+        }
 
     def add_neighbor(self, vertex_obj, weight):
         """
-        Add a neighbor along a weighted edge by storing it in the neighbors dictionary.
+        Add a neighbor along a weighted edge by storing its index and the weight.
 
         Parameters:
         vertex_obj (Vertex): An instance of Vertex to be stored as a neighbor.
         weight (int): The edge weight from self -> neighbor.
         """
-        """neighbor_id = vertex_obj.__id
-        self.__neighbors_dict[neighbor_id] = (vertex_obj, weight)"""
-        if vertex_obj.get_id() in self.neighbors_dict.keys():
-            return # it's already a neighbor
+        neighbor_index = self._index_of(vertex_obj)
+        if neighbor_index not in self._neighbors:
+            self._append_neighbor(vertex_obj, neighbor_index, weight)
 
-        self.neighbors_dict[vertex_obj.get_id()] = (vertex_obj, weight)
+    def _append_neighbor(self, vertex_obj, index, weight):
+        """Store a vertex, at the given index, that is not a neighbor yet,
+           along with the weight of the edge to it."""
+        self._weights = _append_weight(self._weights, weight)
+        self._neighbors.append(index)
+        if vertex_obj._table is self._table:
+            vertex_obj._add_predecessor(self._index, weight)
 
-    def get_neighbors(self):
-        """Return the neighbors of this vertex as a list of neighbor ids."""
-        neighbor_ids = [
-            neighbor for neighbor, weight 
-            in list(self.neighbors_dict.values())
-        ]
-        return neighbor_ids
+    def _start_in_edges(self):
+        """Give this vertex empty lists of predecessors and weights to maintain."""
+        super()._start_in_edges()
+        self._in_weights = array('q')
+
+    def _add_predecessor(self, index, weight):
+        """Record an edge into this vertex, if its in-edges are indexed."""
+        if self._in_neighbors is not None:
+            self._in_neighbors.append(index)
+            self._in_weights = _append_weight(self._in_weights, weight)
+
+    def _remove_predecessor(self, index):
+        """Forget the edge into this vertex from the given index."""
+        position = self._in_neighbors.index(index)
+        del self._in_neighbors[position]
+        del self._in_weights[position]
+
+    def _register_out_edges(self):
+        """Record every edge out of this vertex with the vertex it goes to."""
+        table = self._table
+        for index, weight in zip(self._neighbors, self._weights):
+            table[index]._add_predecessor(self._index, weight)
+
+    def _hand_over_in_edges(self, vertex_obj):
+        """Give the predecessors of this vertex to vertex_obj, which has
+           replaced it in the table, and withdraw this vertex's out-edges."""
+        vertex_obj._in_weights = self._in_weights
+        super()._hand_over_in_edges(vertex_obj)
 
     def get_neighbors_with_weights(self):
-        """Return the neighbors of this vertex as a list of tuples of (neighbor_id, weight)."""
-        return list(self.neighbors_dict.values())
+        """Return the neighbors of this vertex as a list of tuples of (neighbor, weight)."""
+        return list(self.iter_neighbors_with_weights())
 
-    def get_id(self):
-        """Return the id of this vertex."""
-        return self.id
+    def iter_neighbors_with_weights(self):
+        """Return an iterator over (neighbor, weight) tuples, without copying
+           the neighbors into a list first."""
+        return zip(self.iter_neighbors(), self._weights)
 
     def __str__(self):
         """Output the list of neighbors of this vertex."""
-        neighbor_ids = [neighbor.get_id() for neighbor in self.get_neighbors()]
+        neighbor_ids = [neighbor.get_id() for neighbor in self.iter_neighbors()]
         return f'{self.id} adjacent to {neighbor_ids}'
 
     def __repr__(self):
         """Output the list of neighbors of this vertex."""
-        neighbor_ids = [neighbor.get_id() for neighbor in self.get_neighbors()]
-        return f'{self.id} adjacent to {neighbor_ids}'
+        return self.__str__()
+
+
+class ReversedWeightedVertex(ReversedVertexMixin, WeightedVertex):
+    """A WeightedVertex of the reversed view of a directed WeightedGraph."""
+    __slots__ = ('_vertex',)
+
+    _weights = property(lambda self: self._vertex._in_weights)
+    _in_weights = property(lambda self: self._vertex._weights)
 
 
 class WeightedGraph(Graph):
-    def __init__(self, is_directed=True):
+    vertex_class = WeightedVertex
+    reversed_vertex_class = ReversedWeightedVertex
+
+    def __init__(self, is_directed=True, track_in_edges=False,
+                 track_components=False):
         '''
         Initialize a weighted graph object with an empty vertex dictionary.
 
         Parameters:
         is_directed (boolean): Whether the graph is directed (edges go in only one direction).
+        track_in_edges (boolean): Whether to keep an index of the edges into
+                                  each vertex from the start (see Graph).
+        track_components (boolean): Whether to keep the connected components
+                                    of an undirected graph from the start
+                                    (see Graph).
         '''
-        self.vertex_dict = {} # id -> object
-        self.is_directed = is_directed
-        # super().__init__(is_directed)
+        super().__init__(is_directed, track_in_edges, track_components)
+        # optional precomputed landmark distances for ALT queries, which
+        # go stale (and are dropped) as soon as the graph changes
+        self.landmark_index = None
+        # (whether all weights are non-negative integers, the largest weight)
+        self._weight_stats = None
 
     def add_vertex(self, vertex_id):
         """
@@ -78,8 +210,8 @@ class WeightedGraph(Graph):
         Returns:
         Vertex: The new vertex object.
         """
-        new_vertex = WeightedVertex(vertex_id)
-        self.vertex_dict[vertex_id] = new_vertex
+        new_vertex = super().add_vertex(vertex_id)
+        self._invalidate_indexes()
         return new_vertex
 
     def add_edge(self, vertex_id1, vertex_id2, weight):
@@ -90,107 +222,176 @@ class WeightedGraph(Graph):
         vertex_id1 (string): The unique identifier of the first vertex.
         vertex_id2 (string): The unique identifier of the second vertex.
         """
+        self._check_writable()
         # make sure the vertices are included in the graph
-        all_ids = list(self.vertex_dict.keys())
-        if (vertex_id1 not in all_ids) or (vertex_id2 not in all_ids):
+        if (vertex_id1 not in self.vertex_dict) or (vertex_id2 not in self.vertex_dict):
             raise ValueError('One or both vertices not found.')
         # store pointers to the vertices in memory
         vertex1, vertex2 = (
             self.vertex_dict[vertex_id1],
             self.vertex_dict[vertex_id2]
         )
+        self._invalidate_indexes()
         # add the edge between vertex 1 and 2
         vertex1.add_neighbor(vertex2, weight)
         # if undirected, add the same edge the reverse as well
         if self.is_directed is False:
             vertex2.add_neighbor(vertex1, weight)
+            self._track_edges(((vertex_id1, vertex_id2),))
+
+    def add_vertices(self, vertex_ids):
+        """
+        Add a new vertex object to the graph for each of the given keys.
+
+        Parameters:
+        vertex_ids (iterable<string>): The unique identifiers for the new vertices.
+
+        Returns:
+        List<WeightedVertex>: The new vertex objects, in the order given.
+        """
+        new_vertices = super().add_vertices(vertex_ids)
+        self._invalidate_indexes()
+        return new_vertices
+
+    def add_edges(self, edges, create_missing=False):
+        """
+        Add many weighted edges at once. All endpoints are validated in one
+        pass before any edge is added, so a bad batch leaves the graph unchanged.
+
+        Parameters:
+        edges (iterable<tuple>): (vertex_id1, vertex_id2, weight) triples.
+        create_missing (boolean): Whether to add vertices for endpoints that
+                                  are not in the graph yet, instead of raising.
+        """
+        self._check_writable()
+        edges = list(edges)
+        self._add_missing_endpoints(edges, create_missing, edge_size=3)
+        self._invalidate_indexes()
+        # add the edges, with the lookups hoisted out of the loop
+        vertex_dict = self.vertex_dict
+        is_undirected = self.is_directed is False
+        neighbor_sets = {} # only for this batch (see _is_new_neighbor)
+        for vertex_id1, vertex_id2, weight in edges:
+            vertex1, vertex2 = vertex_dict[vertex_id1], vertex_dict[vertex_id2]
+            if _is_new_neighbor(vertex1, vertex2, neighbor_sets):
+                vertex1._append_neighbor(vertex2, vertex2._index, weight)
+            if is_undirected and _is_new_neighbor(vertex2, vertex1, neighbor_sets):
+                vertex2._append_neighbor(vertex1, vertex1._index, weight)
+        self._track_edges(edges)
+
+    def _invalidate_indexes(self):
+        """Drop the indexes derived from the graph, after it changes."""
+        self.landmark_index = None
+        self._weight_stats = None
+        super()._invalidate_indexes()
+
+    def _missing_vertex_error(self, missing_ids):
+        """Return the error raised when edges refer to unknown vertices."""
+        return ValueError(f'Vertices not found: {sorted(map(str, missing_ids))}')
+
+    def to_csr(self):
+        """
+        Return an immutable, array-backed (compressed sparse row) copy of the
+        graph, including the edge weights. Later changes to the graph are not
+        reflected in the copy.
+
+        Returns:
+        CSRGraph: The frozen view, with vertices indexed in insertion order.
+        """
+        vertex_ids = list(self.vertex_dict.keys())
+        index = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+        offsets, targets, weights = array('q', [0]), array('i'), array('d')
+        for vertex_obj in self.vertex_dict.values():
+            for neighbor, weight in vertex_obj.iter_neighbors_with_weights():
+                targets.append(index[neighbor.get_id()])
+                weights.append(weight)
+            offsets.append(len(targets))
+        return CSRGraph(vertex_ids, offsets, targets, weights,
+                        is_directed=self.is_directed)
 
     '''Kruskal's Algorithm'''
 
-    def sort_edges(self, start_id):
-        """
-        Traverse the graph using breadth-first search.
-        Outputs a list of all edges in the graph,
-        sorted by weight.
-        """
-        # set for denoting the previously visited vertices
-        seen = set()
-        seen.add(start_id)
-        # queue for visiting vertices in the appropriate order
-        queue = deque()
-        queue.append(self.vertex_dict[start_id])
-        # list of edges
-        edges = list()
-        # execute BFS
-        while queue:
-            current_vertex_obj = queue.popleft()
-            current_vertex_id = current_vertex_obj.get_id()
-            # Process current node
-            neighbor_weights = list(current_vertex_obj.neighbors_dict.values())
-            for neighbor, weight in neighbor_weights:
-                # form the possible element to add to the list
-                weight_edge = (weight, current_vertex_id, neighbor.id)
-                reverse_weight_edge = (weight, neighbor.id, current_vertex_id)
-                # add if it's not already inside
-                if weight_edge not in edges and reverse_weight_edge not in edges:
-                    edges.append(weight_edge)
-            # Add its neighbors to the queue
-            for neighbor in current_vertex_obj.get_neighbors():
-                if neighbor.get_id() not in seen:
-                    seen.add(neighbor.get_id())
-                    queue.append(neighbor)
-        # now need to sort by weights
-        edges.sort()
-        # everything processed
-        return edges
+    def iter_edges(self):
+        """
+        Lazily enumerate every edge in the graph exactly once, in O(V + E).
+        An undirected edge is only reported from whichever of its endpoints
+        was added to the graph first, so (A, B, w) never also shows up as (B, A, w).
 
-    def union(self, parent_map, vertex_id1, vertex_id2):
-        """Combine vertex_id1 and vertex_id2 into the same group."""
-        vertex1_root = self.find(parent_map, vertex_id1)
-        vertex2_root = self.find(parent_map, vertex_id2)
-        parent_map[vertex1_root] = vertex2_root
+        Returns:
+        generator<tuple>: (vertex_id1, vertex_id2, weight) for every edge.
+        """
+        order = None
+        if self.is_directed is False:
+            order = {vertex_id: i for i, vertex_id in enumerate(self.vertex_dict)}
+        for i, (vertex_id, vertex_obj) in enumerate(self.vertex_dict.items()):
+            for neighbor, weight in vertex_obj.iter_neighbors_with_weights():
+                neighbor_id = neighbor.get_id()
+                if order is None or order[neighbor_id] >= i:
+                    yield vertex_id, neighbor_id, weight
 
+    def edge_list(self, as_arrays=False):
+        """
+        Return every edge in the graph exactly once (see iter_edges).
+
+        Parameters:
+        as_arrays (boolean): Whether to return the edges as columns of
+                             integer vertex indices and weights, rather than
+                             as tuples.
+
+        Returns:
+        list<tuple>: (vertex_id1, vertex_id2, weight) for every edge, or if
+                     as_arrays is True, a tuple (vertex_ids, sources, targets,
+                     weights) where sources[i] and targets[i] are the indices
+                     into vertex_ids of the ends of edge i, and weights[i] is
+                     its weight. The columns are array('q') and array('d')
+                     objects, which numpy.asarray wraps without copying.
+        """
+        if not as_arrays:
+            return list(self.iter_edges())
+        return self._edge_arrays(self.iter_edges(), with_weights=True)
 
-    def find(self, parent_map, vertex_id):
-        """Get the root (or, group label) for vertex_id."""
-        if(parent_map[vertex_id] == vertex_id):
-            return vertex_id
-        return self.find(parent_map, parent_map[vertex_id])
+    def sort_edges(self, start_id=None):
+        """
+        Outputs a list of all edges in the graph, as tuples of
+        (weight, start_id, dest_id), sorted by weight.
+        Edges of equal weight keep the order of iter_edges.
+
+        Parameters:
+        start_id (string): Unused; every component's edges are included.
+        """
+        edges = [
+            (weight, vertex_id1, vertex_id2)
+            for vertex_id1, vertex_id2, weight in self.iter_edges()
+        ]
+        # now need to sort by weights
+        edges.sort(key=itemgetter(0))
+        return edges
 
     def minimum_spanning_tree_kruskal(self):
         """
         Use Kruskal's Algorithm to return a list of edges, as tuples of 
         (start_id, dest_id, weight) in the graph's minimum spanning tree.
+        If the graph is not connected, the edges of a minimum spanning
+        forest (one tree per connected component) are returned.
         """
         # Create a list of all edges in the graph, sort them by weight 
-        start_id = list(self.vertex_dict.keys())[0]  # O(V)
-        edges = self.sort_edges(start_id)  # O(V + E)
-        # Use dictionary 'parent_map' to map vertex -> its "parent". 
-        # Initialized so that each vertex is its own parent.
-        parent_map = dict()
-        for vertex_obj in self.vertex_dict.values():
-            parent_map[vertex_obj.id] = vertex_obj.id  # O(V)
+        edges = self.sort_edges()  # O(V + E log E)
+        # Track which vertices are already connected in a disjoint set,
+        # initialized so that each vertex is in a set of its own.
+        components = DisjointSet(self.vertex_dict)  # O(V)
         # Create an empty list to hold the solution (i.e. all edges in the 
         # final spanning tree)
         mst_edges = list()
-        # Build the MST - loop until we have # edges = # vertices - 1
-        index = 0
-        while len(mst_edges) < len(self.vertex_dict) - 1:
-            # get the smallest edge
-            next_edge = edges[index]
-            # determine if the edge can be added (must be in different sets)
-            weight, vertex1_id, vertex2_id = next_edge
-            if self.find(parent_map, vertex1_id) != self.find(parent_map, vertex2_id):
+        # Build the MST - scan the edges from lightest to heaviest, until we
+        # have # edges = # vertices - 1
+        for weight, vertex1_id, vertex2_id in edges:  # O(E α(V))
+            # the edge can be added if its vertices are in different sets,
+            # in which case union puts them in the same one
+            if components.union(vertex1_id, vertex2_id):
                 # rearrange the edge
-                mst_edge = (vertex1_id, vertex2_id, weight)
-                mst_edges.append(mst_edge)
-                # remove it from the list of possible edges
-                edges.remove(next_edge)
-                # put the vertices of the edge in the same union
-                self.union(parent_map, vertex1_id, vertex2_id)
-            # if vertices in the same set, skip over and index next edge
-            else:
-                index += 1
+                mst_edges.append((vertex1_id, vertex2_id, weight))
+                if len(mst_edges) == len(self.vertex_dict) - 1:
+                    break
         # Return the solution list
         return sorted(mst_edges)
     
@@ -198,113 +399,581 @@ class WeightedGraph(Graph):
 
     def minimum_spanning_tree_prim(self):
         """
-        Use Prim's Algorithm to return the total weight of all edges in the
-        graph's spanning tree.
+        Use Prim's Algorithm to find the edges in the graph's minimum spanning
+        tree, and their total weight. Vertices outside the tree wait in an
+        IndexedBinaryMinHeap keyed by the weight of their lightest edge into
+        the tree, so this runs in O(E log V).
 
-        Assume that the graph is connected.
+        If the graph is not connected, a tree is grown from the first vertex
+        of every component, giving a minimum spanning forest.
+
+        Returns:
+        tuple: (list<tuple>, number) the MST edges as tuples of
+               (start_id, dest_id, weight), sorted like those of
+               minimum_spanning_tree_kruskal, and the total weight.
         """
-        # initialize all vertex distances to INFINITY away
-        vertex_to_weight = dict()
-        for vertex_obj in self.vertex_dict.values():  # O(V)
-            vertex_to_weight[vertex_obj] = float('inf')
-        # Choose one vertex and set its weight to 0
-        start_vertex = list(vertex_to_weight.keys())[0]  # O(1)
-        vertex_to_weight[start_vertex] = 0
+        # vertices already in the tree
+        in_tree = set()
+        # the tree vertex at the other end of each vertex's lightest edge
+        vertex_to_parent = dict()
+        # order vertices were added to the graph, to orient undirected edges
+        order = {vertex_id: i for i, vertex_id in enumerate(self.vertex_dict)}
+        mst_edges = list()
         # Calculate total weight of MST
-        weight = 0
-        while len(list(vertex_to_weight.items())) > 0:  # V iterations
-            # A Get the minimum-weighted remaining vertex
-            min_distance = min(list(vertex_to_weight.values()))  # O(V)
-            min_vertex = None
-            for vertex_obj, vertex_weight in vertex_to_weight.items():
-                if vertex_weight == min_distance:
-                    min_vertex = vertex_obj
-            # remove it from the dictionary
-            del vertex_to_weight[min_vertex]
-            # add its weight to the total MST weight
-            weight += min_distance
-            # B: Update that vertex's neighbors
-            # print(vertex_to_weight)
-            for neighbor, edge_weight in min_vertex.neighbors_dict.values():
-                if neighbor in vertex_to_weight:
-                    current_distance = vertex_to_weight[neighbor]
+        total_weight = 0
+        heap = IndexedBinaryMinHeap()
+        for root_id in self.vertex_dict:
+            if root_id in in_tree:
+                continue
+            # Choose one vertex per component and set its weight to 0
+            heap.insert((0, root_id))
+            vertex_to_parent[root_id] = None
+            while not heap.is_empty():
+                # A: Get the minimum-weighted remaining vertex
+                weight, vertex_id = heap.delete_min()
+                in_tree.add(vertex_id)
+                # add its edge to the tree, and its weight to the total
+                parent_id = vertex_to_parent[vertex_id]
+                if parent_id is not None:
+                    if self.is_directed is False and order[vertex_id] < order[parent_id]:
+                        mst_edges.append((vertex_id, parent_id, weight))
+                    else:
+                        mst_edges.append((parent_id, vertex_id, weight))
+                    total_weight += weight
+                # B: Update that vertex's neighbors
+                vertex_obj = self.vertex_dict[vertex_id]
+                for neighbor, edge_weight in vertex_obj.iter_neighbors_with_weights():
+                    neighbor_id = neighbor.get_id()
                     # Update ONLY to reduce the weight of the distance
-                    if edge_weight < current_distance:
-                        vertex_to_weight[neighbor] = edge_weight
-        # Return total weight of MST
-        return weight
+                    if neighbor_id not in in_tree and (
+                        heap.insert_or_decrease(neighbor_id, edge_weight)
+                    ):
+                        vertex_to_parent[neighbor_id] = vertex_id
+        # Return the MST edges and their total weight
+        return sorted(mst_edges), total_weight
 
     '''Shortest Path Finding'''
 
-    def find_shortest_path(self, start_id, target_id):
+    def find_shortest_path(self, start_id, target_id, bidirectional=False,
+                           method='dijkstra'):
         """
-        Use Dijkstra's Algorithm to return the total weight
-        of the shortest path from a start vertex 
-        to a destination.
+        Use Dijkstra's Algorithm to find the shortest path from a start vertex
+        to a destination. Vertices wait in an IndexedBinaryMinHeap keyed by
+        their tentative distance, so this runs in O((V + E) log V).
+
+        Graphs whose weights are small non-negative integers can skip the heap:
+        a 0-1 BFS handles weights of 0 and 1 in O(V + E), and Dial's bucket
+        queue handles weights up to C in O(V + E + D), where D <= V * C is the
+        length of the path.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+        bidirectional (boolean): Whether to search forward from the start and
+                                 backward from the target at the same time,
+                                 which settles far fewer vertices on large
+                                 sparse graphs. On a directed graph, the first
+                                 such search builds the in-edge index (see
+                                 get_predecessors), which every later add_edge
+                                 then keeps up to date, at the cost of a second
+                                 pair of arrays per vertex.
+        method (string): 'dijkstra' (the binary heap), '0-1' (a deque, for
+                         weights of 0 or 1 only), 'dial' (buckets, for
+                         non-negative integer weights only), or 'auto' to pick
+                         the fastest of these the weights allow.
+
+        Returns:
+        tuple: (list<string>, number) of all vertex ids in the shortest path,
+               from start to end, and the total weight of that path.
+               None if the target cannot be reached from the start.
         """
-        # A: initialize all vertex distances to INFINITY away
-        vertex_to_weight = dict()
-        for vertex_obj in self.vertex_dict.values():
-            vertex_to_weight[vertex_obj] = float('inf')
+        if method not in SHORTEST_PATH_METHODS:
+            raise ValueError(f'Unknown shortest path method: {method}')
+        if start_id not in self.vertex_dict or target_id not in self.vertex_dict:
+            raise KeyError("One or both vertices are not in the graph!")
+        if bidirectional:
+            if method not in ('auto', 'dijkstra'):
+                raise ValueError('The bidirectional search only uses Dijkstra.')
+            return self._bidirectional_dijkstra(start_id, target_id)
+        if method != 'dijkstra':
+            is_integral, max_weight = self.weight_stats()
+            if method == 'auto':
+                if is_integral and max_weight <= 1:
+                    method = '0-1'
+                elif is_integral and max_weight <= DIAL_MAX_WEIGHT:
+                    method = 'dial'
+            elif not is_integral or (method == '0-1' and max_weight > 1):
+                raise ValueError(f'The weights of this graph do not suit {method}.')
+            if method == '0-1':
+                return self._zero_one_bfs(start_id, target_id)
+            if method == 'dial':
+                return self._dial_shortest_path(start_id, target_id, max_weight)
+        # A: the best known distances, and the vertex we came from to get them
+        vertex_to_weight = {start_id: 0}
+        vertex_to_parent = {start_id: None}
+        # vertices whose shortest distance is final
+        settled = set()
         # B: Calculate Shortest Paths From starting vertex
-        start_vertex = self.vertex_dict[start_id]
-        vertex_to_weight[start_vertex] = 0
-        while len(list(vertex_to_weight.items())) > 0:
+        heap = IndexedBinaryMinHeap()
+        heap.insert((0, start_id))
+        while not heap.is_empty():
             # Get the minimum-distance remaining vertex
-            min_distance = min(list(vertex_to_weight.values()))
-            min_vertex = None
-            # find the min vertex
-            for vertex in vertex_to_weight:
-                if vertex_to_weight[vertex] == min_distance:
-                    min_vertex = vertex
-            # If target found, return its distance
-            if min_vertex.id == target_id:
-                return vertex_to_weight[min_vertex]
-            # B: Update that vertex's neighbors
-            neighbor_weights = (
-                list(min_vertex.neighbors_dict.values())
-            )
-            for neighbor, weight in neighbor_weights:
-                if neighbor in vertex_to_weight:
-                    current_distance = vertex_to_weight[neighbor]
-                    # Update ONLY to reduce the weight of the distance
-                    new_dist = weight + vertex_to_weight[min_vertex]
-                    if new_dist < current_distance:
-                        vertex_to_weight[neighbor] = new_dist
-            # remove the min vertex from the dict
-            del vertex_to_weight[min_vertex]
+            min_distance, min_vertex_id = heap.delete_min()
+            settled.add(min_vertex_id)
+            # If target found, return its path and distance
+            if min_vertex_id == target_id:
+                path = self._build_path(vertex_to_parent, target_id)
+                return path, min_distance
+            # C: Update that vertex's neighbors
+            min_vertex = self.vertex_dict[min_vertex_id]
+            for neighbor, weight in min_vertex.iter_neighbors_with_weights():
+                neighbor_id = neighbor.get_id()
+                if neighbor_id in settled:
+                    continue
+                # Update ONLY to reduce the weight of the distance
+                new_dist = min_distance + weight
+                if new_dist < vertex_to_weight.get(neighbor_id, float('inf')):
+                    vertex_to_weight[neighbor_id] = new_dist
+                    vertex_to_parent[neighbor_id] = min_vertex_id
+                    heap.insert_or_decrease(neighbor_id, new_dist)
         # target vertex NOT FOUND
         return None
 
+    def weight_stats(self):
+        """
+        Summarize the edge weights, for choosing a shortest path method. The
+        scan is O(V + E), and its result is kept until the graph changes.
+
+        Returns:
+        tuple: (boolean, number) whether every weight is a non-negative
+               integer, and the largest weight (0 if there are no edges).
+        """
+        if self._weight_stats is None:
+            is_integral, max_weight = True, 0
+            for vertex_obj in self.vertex_dict.values():
+                for _, weight in vertex_obj.iter_neighbors_with_weights():
+                    if weight > max_weight:
+                        max_weight = weight
+                    if is_integral and not _is_whole_weight(weight):
+                        is_integral = False
+            self._weight_stats = (is_integral, max_weight)
+        return self._weight_stats
+
+    def _zero_one_bfs(self, start_id, target_id):
+        """
+        Find the shortest path when every weight is 0 or 1. A deque stands in
+        for the heap: 0-edges lead to the front, 1-edges to the back, so the
+        deque stays sorted by distance. A vertex may be queued twice; only its
+        first (closest) exit counts.
+        """
+        vertex_to_weight = {start_id: 0}
+        vertex_to_parent = {start_id: None}
+        settled = set()
+        queue = deque([start_id])
+        while queue:
+            vertex_id = queue.popleft()
+            if vertex_id in settled:
+                continue
+            settled.add(vertex_id)
+            distance = vertex_to_weight[vertex_id]
+            if vertex_id == target_id:
+                return self._build_path(vertex_to_parent, target_id), distance
+            for neighbor, weight in self.vertex_dict[vertex_id].iter_neighbors_with_weights():
+                neighbor_id = neighbor.get_id()
+                new_dist = distance + weight
+                if new_dist < vertex_to_weight.get(neighbor_id, float('inf')):
+                    vertex_to_weight[neighbor_id] = new_dist
+                    vertex_to_parent[neighbor_id] = vertex_id
+                    if weight == 0:
+                        queue.appendleft(neighbor_id)
+                    else:
+                        queue.append(neighbor_id)
+        # target vertex NOT FOUND
+        return None
+
+    def _dial_shortest_path(self, start_id, target_id, max_weight):
+        """
+        Find the shortest path when every weight is an integer from 0 to
+        max_weight, using Dial's bucket queue. Every vertex waiting to be
+        settled sits in the bucket for its distance; since no waiting distance
+        is more than max_weight past the current one, max_weight + 1 buckets
+        used in a circle are enough. Entries left behind by a shorter distance
+        are skipped when their bucket comes up.
+        """
+        num_buckets = int(max_weight) + 1
+        buckets = [list() for _ in range(num_buckets)]
+        buckets[0].append(start_id)
+        vertex_to_weight = {start_id: 0}
+        vertex_to_parent = {start_id: None}
+        settled = set()
+        distance, waiting = 0, 1
+        while waiting:
+            bucket = buckets[distance % num_buckets]
+            # 0-edges add to this same bucket while it is being emptied
+            while bucket:
+                vertex_id = bucket.pop()
+                waiting -= 1
+                if vertex_id in settled or vertex_to_weight[vertex_id] != distance:
+                    continue
+                settled.add(vertex_id)
+                if vertex_id == target_id:
+                    return self._build_path(vertex_to_parent, target_id), distance
+                for neighbor, weight in self.vertex_dict[vertex_id].iter_neighbors_with_weights():
+                    neighbor_id = neighbor.get_id()
+                    new_dist = distance + int(weight)
+                    if new_dist < vertex_to_weight.get(neighbor_id, float('inf')):
+                        vertex_to_weight[neighbor_id] = new_dist
+                        vertex_to_parent[neighbor_id] = vertex_id
+                        buckets[new_dist % num_buckets].append(neighbor_id)
+                        waiting += 1
+            distance += 1
+        # target vertex NOT FOUND
+        return None
+
+    def _bidirectional_dijkstra(self, start_id, target_id):
+        """
+        Run Dijkstra's Algorithm forward from the start and backward (over the
+        reverse adjacency) from the target, always advancing the side whose
+        next vertex is closer. Every edge relaxed into a vertex the other
+        side has reached gives a candidate path; the search stops once the
+        two next distances add up to no less than the best candidate, since
+        no shorter path can be found after that.
+        """
+        backward_neighbors = self._weighted_predecessor_ids
+        # one search state per side: (neighbors, distances, parents, heap, settled)
+        forward = (self._weighted_neighbor_ids, {start_id: 0}, {start_id: None},
+                   IndexedBinaryMinHeap([(0, start_id)]), set())
+        backward = (backward_neighbors, {target_id: 0}, {target_id: None},
+                    IndexedBinaryMinHeap([(0, target_id)]), set())
+        # the best path found so far, and the vertex where its halves meet
+        best_distance, meeting_id = (0, start_id) if start_id == target_id else (float('inf'), None)
+
+        while not forward[3].is_empty() and not backward[3].is_empty():
+            forward_min, backward_min = forward[3].get_min()[0], backward[3].get_min()[0]
+            # stopping criterion: no unsettled pair can beat the best path
+            if forward_min + backward_min >= best_distance:
+                break
+            side, other = (forward, backward) if forward_min <= backward_min else (backward, forward)
+            neighbors_of, distances, parents, heap, settled = side
+            min_distance, min_vertex_id = heap.delete_min()
+            settled.add(min_vertex_id)
+            for neighbor_id, weight in neighbors_of(min_vertex_id):
+                new_dist = min_distance + weight
+                if neighbor_id not in settled and new_dist < distances.get(neighbor_id, float('inf')):
+                    distances[neighbor_id] = new_dist
+                    parents[neighbor_id] = min_vertex_id
+                    heap.insert_or_decrease(neighbor_id, new_dist)
+                # an edge into the other search's territory completes a path
+                if neighbor_id in other[1]:
+                    total = min(new_dist, distances[neighbor_id]) + other[1][neighbor_id]
+                    if total < best_distance:
+                        best_distance, meeting_id = total, neighbor_id
+
+        if meeting_id is None: # target vertex NOT FOUND
+            return None
+        # join the two halves of the path at the meeting vertex
+        path = self._build_path(forward[2], meeting_id)
+        vertex_id = backward[2][meeting_id]
+        while vertex_id is not None:
+            path.append(vertex_id)
+            vertex_id = backward[2][vertex_id]
+        return path, best_distance
+
+    def _weighted_neighbor_ids(self, vertex_id):
+        """Lazily yield (neighbor id, weight) for every edge out of vertex_id."""
+        return (
+            (neighbor.get_id(), weight) for neighbor, weight
+            in self.vertex_dict[vertex_id].iter_neighbors_with_weights()
+        )
+
+    def _weighted_predecessor_ids(self, vertex_id):
+        """Lazily yield (predecessor id, weight) for every edge into vertex_id."""
+        if not self.is_directed:
+            return self._weighted_neighbor_ids(vertex_id)
+        self._index_in_edges()
+        vertex_obj = self.vertex_dict[vertex_id]
+        table = vertex_obj._table
+        return (
+            (table[index].get_id(), weight) for index, weight
+            in zip(vertex_obj._in_neighbors, vertex_obj._in_weights)
+        )
+
+    def get_predecessors_with_weights(self, vertex_id):
+        """
+        Return the vertices with an edge to the given vertex, along with the
+        edge weights (see get_predecessors).
+
+        Parameters:
+        vertex_id (string): The id of the vertex.
+
+        Returns:
+        list<tuple>: (predecessor_id, weight) for every edge into the vertex.
+        """
+        return list(self._weighted_predecessor_ids(vertex_id))
+
+    def find_shortest_path_astar(self, start_id, target_id, heuristic=None,
+                                 metric='euclidean'):
+        """
+        Use the A* Algorithm to find the shortest path from a start vertex to
+        a destination. It works like Dijkstra's Algorithm on the same indexed
+        heap, but orders vertices by distance so far plus a heuristic estimate
+        of the distance left, so far fewer vertices are settled when the
+        estimate is good.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+        heuristic (callable or dict): Either heuristic(vertex_id, target_id),
+            returning a lower bound on the distance left, or a dict of vertex
+            id -> coordinates measured with `metric`. None gives an estimate
+            of 0 everywhere, which is plain Dijkstra.
+        metric (string): 'euclidean' or 'haversine', for a coordinates dict.
+
+        Returns:
+        tuple: (list<string>, number) of all vertex ids in the shortest path,
+               from start to end, and the total weight of that path.
+               None if the target cannot be reached from the start.
+        """
+        if heuristic is None:
+            estimate = lambda vertex_id: 0
+        elif callable(heuristic):
+            estimate = lambda vertex_id: heuristic(vertex_id, target_id)
+        else:
+            distance = coordinate_heuristic(heuristic, metric)
+            estimate = lambda vertex_id: distance(vertex_id, target_id)
+        return self._astar(start_id, target_id, estimate)
+
+    def _astar(self, start_id, target_id, estimate):
+        """
+        A* search from start_id to target_id, where estimate(vertex_id) is a
+        lower bound on the distance from vertex_id to the target.
+        A vertex is looked at again if a shorter path to it turns up later,
+        so the result is exact even if the estimate is not consistent.
+        """
+        if start_id not in self.vertex_dict or target_id not in self.vertex_dict:
+            raise KeyError("One or both vertices are not in the graph!")
+        # the best known distances, and the vertex we came from to get them
+        vertex_to_weight = {start_id: 0}
+        vertex_to_parent = {start_id: None}
+        # estimates are computed at most once per vertex
+        vertex_to_estimate = dict()
+        heap = IndexedBinaryMinHeap()
+        heap.insert((estimate(start_id), start_id))
+        while not heap.is_empty():
+            # Get the most promising remaining vertex
+            _, min_vertex_id = heap.delete_min()
+            min_distance = vertex_to_weight[min_vertex_id]
+            # If target found, return its path and distance
+            if min_vertex_id == target_id:
+                path = self._build_path(vertex_to_parent, target_id)
+                return path, min_distance
+            # Update that vertex's neighbors
+            min_vertex = self.vertex_dict[min_vertex_id]
+            for neighbor, weight in min_vertex.iter_neighbors_with_weights():
+                neighbor_id = neighbor.get_id()
+                new_dist = min_distance + weight
+                if new_dist < vertex_to_weight.get(neighbor_id, float('inf')):
+                    vertex_to_weight[neighbor_id] = new_dist
+                    vertex_to_parent[neighbor_id] = min_vertex_id
+                    if neighbor_id not in vertex_to_estimate:
+                        vertex_to_estimate[neighbor_id] = estimate(neighbor_id)
+                    heap.insert_or_decrease(
+                        neighbor_id, new_dist + vertex_to_estimate[neighbor_id])
+        # target vertex NOT FOUND
+        return None
+
+    def build_landmark_index(self, num_landmarks=4, strategy='farthest'):
+        """
+        Precompute a LandmarkIndex for find_shortest_path_alt, and keep it on
+        the graph (as `landmark_index`) until a vertex or edge is added.
+
+        Parameters:
+        num_landmarks (int): How many landmarks to choose.
+        strategy (string): 'farthest' or 'degree'; see LandmarkIndex.build.
+
+        Returns:
+        LandmarkIndex: The new index.
+        """
+        self.landmark_index = LandmarkIndex.build(
+            self.to_csr(), num_landmarks, strategy)
+        return self.landmark_index
+
+    def load_landmark_index(self, filename):
+        """
+        Read a LandmarkIndex saved with landmark_index.save(filename), and
+        keep it on the graph. The graph must have the same vertices, added
+        in the same order, as the graph the index was built for.
+
+        Parameters:
+        filename (string): The relative path of the file to be loaded
+
+        Returns:
+        LandmarkIndex: The index.
+        """
+        self.landmark_index = LandmarkIndex.load(filename, list(self.vertex_dict))
+        return self.landmark_index
+
+    def find_shortest_path_alt(self, start_id, target_id):
+        """
+        Find the shortest path from a start vertex to a destination with A*,
+        guided by the lower bounds of the graph's landmark index (see
+        build_landmark_index).
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        tuple: (list<string>, number) of all vertex ids in the shortest path,
+               from start to end, and the total weight of that path.
+               None if the target cannot be reached from the start.
+        """
+        if self.landmark_index is None:
+            raise ValueError('There is no landmark index; call build_landmark_index first.')
+        lower_bound = self.landmark_index.lower_bound
+        if target_id not in self.vertex_dict:
+            raise KeyError("One or both vertices are not in the graph!")
+        return self._astar(
+            start_id, target_id,
+            lambda vertex_id: lower_bound(vertex_id, target_id))
+
+    def multi_source_shortest_paths(self, sources, workers=None, out=None):
+        """
+        Compute the shortest distances from many sources to every vertex, in
+        parallel over a pool of worker processes that share one copy of the
+        graph's CSR arrays. See graphs.parallel.multi_source_shortest_paths.
+
+        Parameters:
+        sources (iterable<string>): The ids of the source vertices.
+        workers (int): How many processes to use; defaults to os.cpu_count().
+        out (string): Optional path of a file to memory-map the distance
+                      matrix into, one float64 row per source.
+
+        Returns:
+        generator<tuple>: (source_id, distances) as each source finishes, with
+                          distances[i] the distance to the i-th vertex added
+                          to the graph (inf if it is unreachable).
+        """
+        return multi_source_shortest_paths(self, sources, workers, out)
+
     '''All Pairs Shortest Path Finding'''
 
     def floyd_warshall(self):
         """Returns an adjaceny matrix of all-pairs shortest paths in the
-           graph.
+           graph, as a dict of start id -> dest id -> distance.
+           Unreachable pairs are float('inf') apart.
         
+        """
+        vertex_ids, dist, _ = self.floyd_warshall_matrix()
+        return {
+            id1: {id2: float(dist[i][j]) for j, id2 in enumerate(vertex_ids)}
+            for i, id1 in enumerate(vertex_ids)
+        }
+
+    def floyd_warshall_matrix(self):
+        """
+        Compute all-pairs shortest paths with the Floyd-Warshall Algorithm on
+        dense V x V matrices. With NumPy installed, each of the V rounds is a
+        single vectorized minimum over the whole matrix; without it, the same
+        algorithm runs on lists of lists.
+
+        Returns:
+        tuple: (vertex_ids, dist, pred), where dist[i][j] is the length of the
+               shortest path from vertex_ids[i] to vertex_ids[j] (inf if there
+               is none), and pred[i][j] is the index of the vertex just before
+               vertex_ids[j] on that path (-1 if there is none, or if i == j).
+               Pass pred to floyd_warshall_path to rebuild a path.
+
+        Raises:
+        ValueError: if the graph contains a negative-weight cycle.
         """
         # list of all vertex ids
-        all_vertex_ids = list(self.vertex_dict.keys())
-        # init the distances dict
-        dist = dict()
-        for id in all_vertex_ids:
-            dict_for_top_level = dict()
-            for id2 in all_vertex_ids:
-                dict_for_top_level[id2] = float('inf')
-            dist[id] = dict_for_top_level
-        # update the default distances (v -> v is 0)
-        for id in all_vertex_ids:
-            dist[id][id] = 0
-        # update the distances based on edge weights (v1 -> v2)
-        for id in all_vertex_ids:
-            vertex_obj = self.vertex_dict[id]
-            for id2 in all_vertex_ids:
-                if id != id2:
-                    # get the edge weight
-                    pass
-        # build the distances
-        for k in all_vertex_ids:
-            for i in all_vertex_ids:
-                for j in all_vertex_ids:
-                    dist[i][j] = min(dist[i][j], dist[i][k] + dist[k][j])
-        return dist
\ No newline at end of file
+        vertex_ids = list(self.vertex_dict.keys())
+        index = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+        if np is None:
+            dist, pred = self._floyd_warshall_lists(index)
+        else:
+            dist, pred = self._floyd_warshall_numpy(index)
+        # a vertex with a shorter-than-zero path to itself is on a negative cycle
+        if any(dist[i][i] < 0 for i in range(len(vertex_ids))):
+            raise ValueError('The graph contains a negative-weight cycle.')
+        return vertex_ids, dist, pred
+
+    def _floyd_warshall_numpy(self, index):
+        """Floyd-Warshall on NumPy matrices; see floyd_warshall_matrix."""
+        n = len(index)
+        # init the distances: v -> v is 0, and v1 -> v2 is the edge weight
+        dist = np.full((n, n), np.inf)
+        np.fill_diagonal(dist, 0)
+        pred = np.full((n, n), -1, dtype=np.int64)
+        for vertex_id, vertex_obj in self.vertex_dict.items():
+            i = index[vertex_id]
+            for neighbor, weight in vertex_obj.iter_neighbors_with_weights():
+                j = index[neighbor.get_id()]
+                # a self-loop only counts if it is shorter than staying put
+                if weight < dist[i, j]:
+                    dist[i, j] = weight
+                    pred[i, j] = i
+        # scratch matrices, reused every round
+        through_k = np.empty((n, n))
+        improved = np.empty((n, n), dtype=bool)
+        # build the distances, allowing paths through each vertex k in turn
+        for k in range(n):
+            np.add(dist[:, k, np.newaxis], dist[np.newaxis, k, :], out=through_k)
+            np.less(through_k, dist, out=improved)
+            np.minimum(dist, through_k, out=dist)
+            # paths through k end the same way as the path from k
+            np.copyto(pred, pred[np.newaxis, k, :], where=improved)
+        return dist, pred
+
+    def _floyd_warshall_lists(self, index):
+        """Floyd-Warshall on lists of lists; see floyd_warshall_matrix."""
+        n = len(index)
+        # init the distances: v -> v is 0, and v1 -> v2 is the edge weight
+        dist = [[float('inf')] * n for _ in range(n)]
+        pred = [[-1] * n for _ in range(n)]
+        for i in range(n):
+            dist[i][i] = 0
+        for vertex_id, vertex_obj in self.vertex_dict.items():
+            i = index[vertex_id]
+            for neighbor, weight in vertex_obj.iter_neighbors_with_weights():
+                j = index[neighbor.get_id()]
+                # a self-loop only counts if it is shorter than staying put
+                if weight < dist[i][j]:
+                    dist[i][j] = weight
+                    pred[i][j] = i
+        # build the distances, allowing paths through each vertex k in turn
+        for k in range(n):
+            dist_k, pred_k = dist[k], pred[k]
+            for i in range(n):
+                dist_ik, dist_i, pred_i = dist[i][k], dist[i], pred[i]
+                for j in range(n):
+                    if dist_ik + dist_k[j] < dist_i[j]:
+                        dist_i[j] = dist_ik + dist_k[j]
+                        pred_i[j] = pred_k[j]
+        return dist, pred
+
+    def floyd_warshall_path(self, vertex_ids, pred, start_id, target_id):
+        """
+        Rebuild a shortest path from the output of floyd_warshall_matrix.
+
+        Parameters:
+        vertex_ids (list): The vertex ids returned by floyd_warshall_matrix.
+        pred (matrix): The predecessor matrix returned by floyd_warshall_matrix.
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        list<string>: All vertex ids in the shortest path, from start to end,
+                      or None if the target cannot be reached from the start.
+        """
+        index = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+        start, current = index[start_id], index[target_id]
+        path = [target_id]
+        while current != start:
+            current = int(pred[start][current])
+            if current == -1:
+                return None
+            path.append(vertex_ids[current])
+        path.reverse()
+        return path
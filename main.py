@@ -41,7 +41,8 @@ if __name__ == '__main__':
 
     # Search the graph
     print('Performing BFS traversal...')
-    graph.bfs_traversal('A')
+    for vertex_id in graph.iter_bfs('A'):
+        print(f'Processing vertex {vertex_id}')
 
     # Find shortest path
     print('Finding shortest path from vertex A to vertex E...')
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from graphs.graph import Graph
+from util.binary_format import save_graph_binary, load_graph_binary
+from util.file_reader import read_graph_from_file
+
+
+class TestBinaryFormat(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.graph')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def assert_round_trip(self, text_filename):
+        """Save a graph read from a text file, load it back, and compare."""
+        graph = read_graph_from_file(text_filename)
+        expected = graph.to_csr()
+
+        save_graph_binary(graph, self.filename)
+        loaded = load_graph_binary(self.filename)
+
+        self.assertEqual(list(loaded.vertex_ids), list(expected.vertex_ids))
+        self.assertEqual(list(loaded.offsets), list(expected.offsets))
+        self.assertEqual(list(loaded.targets), list(expected.targets))
+        self.assertEqual(loaded.is_directed, expected.is_directed)
+        self.assertEqual(loaded.is_weighted(), expected.is_weighted())
+        if expected.is_weighted():
+            self.assertEqual(list(loaded.weights), list(expected.weights))
+        for vertex_obj in graph.get_vertices():
+            self.assertEqual(
+                loaded.get_neighbors(vertex_obj.get_id()),
+                [neighbor.get_id() for neighbor in vertex_obj.get_neighbors()])
+        return graph, loaded
+
+    def test_round_trip_directed(self):
+        self.assert_round_trip('test_files/graph_small_directed.txt')
+
+    def test_round_trip_undirected(self):
+        graph, loaded = self.assert_round_trip(
+            'test_files/graph_medium_undirected.txt')
+
+        self.assertEqual(
+            loaded.find_shortest_path('A', 'F'), ['A', 'B', 'D', 'F'])
+        self.assertEqual(loaded.bfs_traversal('A'), graph.to_csr().bfs_traversal('A'))
+
+    def test_round_trip_weighted(self):
+        graph, loaded = self.assert_round_trip(
+            'test_files/graph_weighted_undirected.txt')
+
+        self.assertEqual(
+            loaded.find_shortest_path('seattle', 'boise'),
+            graph.find_shortest_path('seattle', 'boise'))
+
+    def test_round_trip_int_ids(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges([(1, 2), (2, 3), (3, 1), (40, 3)], create_missing=True)
+
+        save_graph_binary(graph.freeze(), self.filename)
+        loaded = load_graph_binary(self.filename)
+
+        self.assertEqual(list(loaded.vertex_ids), [1, 2, 3, 40])
+        self.assertEqual(loaded.get_neighbors(40), [3])
+
+    def test_arrays_are_not_copied(self):
+        save_graph_binary(
+            read_graph_from_file('test_files/graph_medium_undirected.txt'),
+            self.filename)
+        loaded = load_graph_binary(self.filename)
+
+        self.assertIsInstance(loaded.targets, memoryview)
+        self.assertTrue(loaded.targets.readonly)
+
+    def test_not_a_binary_graph(self):
+        with open(self.filename, 'wb') as f:
+            f.write(b'G\n1,2,3,4\n' * 10)
+
+        with self.assertRaises(ValueError):
+            load_graph_binary(self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
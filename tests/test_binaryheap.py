@@ -3,7 +3,7 @@
 # https://github.com/UPstartDeveloper/CS-2.1-Trees-Sorting/blob/master/Code/binaryheap_test.py
 
 
-from graphs.binaryheap import BinaryMinHeap, heapify
+from graphs.binaryheap import BinaryMinHeap, IndexedBinaryMinHeap, heapify
 import random
 import unittest
 
@@ -125,5 +125,58 @@ class TestMinHeapify(unittest.TestCase):
             assert i == j
 
 
+class TestIndexedBinaryMinHeap(unittest.TestCase):
+    def test_insert_and_delete_many_random_items(self):
+        heap = IndexedBinaryMinHeap()
+        priorities = random.sample(range(1000), 50)
+        for key, priority in enumerate(priorities):
+            heap.insert((priority, key))
+        assert heap.size() == len(priorities)
+        for priority in sorted(priorities):
+            assert heap.delete_min() == (priority, priorities.index(priority))
+        assert heap.size() == 0
+        assert heap.positions == {}
+
+    def test_positions_track_items(self):
+        heap = IndexedBinaryMinHeap([(9, 'a'), (25, 'b'), (3, 'c'), (5, 'd')])
+        for key, index in heap.positions.items():
+            assert heap.items[index][1] == key
+        assert 'c' in heap
+        assert 'z' not in heap
+        assert heap.get_priority('b') == 25
+
+    def test_decrease_key(self):
+        heap = IndexedBinaryMinHeap([(9, 'a'), (25, 'b'), (3, 'c'), (5, 'd')])
+        heap.decrease_key('b', 1)
+        assert heap.size() == 4
+        assert heap.get_min() == (1, 'b')
+        with self.assertRaises(ValueError):
+            heap.decrease_key('a', 100)
+        with self.assertRaises(KeyError):
+            heap.decrease_key('z', 0)
+        assert [heap.delete_min()[1] for _ in range(4)] == ['b', 'c', 'd', 'a']
+
+    def test_insert_or_decrease(self):
+        heap = IndexedBinaryMinHeap()
+        assert heap.insert_or_decrease('a', 10) is True
+        assert heap.insert_or_decrease('a', 20) is False
+        assert heap.insert_or_decrease('a', 5) is True
+        assert heap.size() == 1
+        assert heap.delete_min() == (5, 'a')
+
+    def test_insert_duplicate_key(self):
+        heap = IndexedBinaryMinHeap()
+        heap.insert((1, 'a'))
+        with self.assertRaises(ValueError):
+            heap.insert((2, 'a'))
+
+    def test_keys_are_never_compared(self):
+        heap = IndexedBinaryMinHeap()
+        heap.insert((1, object()))
+        heap.insert((1, object()))
+        heap.insert((0, object()))
+        assert heap.delete_min()[0] == 0
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
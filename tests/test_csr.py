@@ -0,0 +1,123 @@
+import unittest
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+from graphs.csr import CSRGraph
+from util.file_reader import read_graph_from_file
+
+
+class TestCSRGraph(unittest.TestCase):
+
+    def make_weighted_graph(self):
+        graph = WeightedGraph(is_directed=False)
+        for vertex_id in 'ABCDEFGHJ':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B', 4)
+        graph.add_edge('A','C', 8)
+        graph.add_edge('B','C', 11)
+        graph.add_edge('B','D', 8)
+        graph.add_edge('C','F', 1)
+        graph.add_edge('C','E', 4)
+        graph.add_edge('D','E', 2)
+        graph.add_edge('D','G', 7)
+        graph.add_edge('D','H', 4)
+        graph.add_edge('E','F', 6)
+        graph.add_edge('F','H', 2)
+        graph.add_edge('G','H', 14)
+        graph.add_edge('G','J', 9)
+        graph.add_edge('H','J', 10)
+        return graph
+
+    def test_arrays(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_vertex('C')
+        graph.add_edge('A','B')
+        graph.add_edge('A','C')
+        graph.add_edge('B','C')
+
+        csr = graph.freeze()
+
+        self.assertIsInstance(csr, CSRGraph)
+        self.assertEqual(list(csr.vertex_ids), ['A', 'B', 'C'])
+        self.assertEqual(list(csr.offsets), [0, 2, 3, 3])
+        self.assertEqual(list(csr.targets), [1, 2, 2])
+        self.assertIsNone(csr.weights)
+        self.assertEqual(csr.num_edges(), 3)
+        self.assertEqual(csr.get_neighbors('A'), ['B', 'C'])
+
+    def test_weighted_arrays(self):
+        graph = self.make_weighted_graph()
+
+        csr = graph.to_csr()
+
+        self.assertTrue(csr.is_weighted())
+        self.assertFalse(csr.is_directed)
+        self.assertEqual(csr.num_edges(), 28)
+        self.assertEqual(csr.get_neighbors_with_weights('A'), [('B', 4), ('C', 8)])
+
+    def test_bfs_traversal(self):
+        graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+
+        order = graph.to_csr().bfs_traversal('A')
+
+        self.assertEqual(order, ['A', 'B', 'C', 'D', 'E', 'F'])
+
+    def test_find_shortest_path(self):
+        graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+        csr = graph.to_csr()
+
+        self.assertEqual(csr.find_shortest_path('A', 'F'), ['A', 'B', 'D', 'F'])
+        with self.assertRaises(KeyError):
+            csr.find_shortest_path('A', 'Z')
+
+    def test_find_shortest_path_weighted(self):
+        graph = self.make_weighted_graph()
+
+        self.assertEqual(
+            graph.to_csr().find_shortest_path('A', 'J'),
+            graph.find_shortest_path('A', 'J'))
+
+    def test_find_connected_components(self):
+        graph = Graph(is_directed=False)
+        for vertex_id in 'ABCDEF':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','B')
+        graph.add_edge('A','C')
+        graph.add_edge('B','C')
+        graph.add_edge('D', 'E')
+
+        actual_components = graph.to_csr().find_connected_components()
+        actual_components = [sorted(comp) for comp in actual_components]
+
+        self.assertCountEqual(
+            actual_components, [['A', 'B', 'C'], ['D', 'E'], ['F']])
+
+    def test_topological_sort(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in 'BCDEA':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A','C')
+        graph.add_edge('B','D')
+        graph.add_edge('C','D')
+        graph.add_edge('D','E')
+        graph.add_edge('A','B')
+
+        self.assertEqual(
+            graph.to_csr().topological_sort(), graph.topological_sort())
+
+    def test_long_chain(self):
+        """The frozen traversals must not recurse once per vertex."""
+        graph = Graph(is_directed=True)
+        for i in range(5000):
+            graph.add_vertex(i)
+        for i in range(4999):
+            graph.add_edge(i, i + 1)
+        csr = graph.to_csr()
+
+        self.assertEqual(csr.topological_sort(), list(range(5000)))
+        self.assertEqual(len(csr.find_shortest_path(0, 4999)), 5000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from graphs.disjoint_set import DisjointSet
+
+
+class TestDisjointSet(unittest.TestCase):
+    def test_init(self):
+        sets = DisjointSet(['A', 'B', 'C'])
+        assert len(sets) == 3
+        assert sets.count() == 3
+        assert 'A' in sets
+        assert 'Z' not in sets
+        assert sets.find('B') == 'B'
+
+    def test_add(self):
+        sets = DisjointSet()
+        assert sets.add('A') is True
+        assert sets.add('A') is False
+        assert len(sets) == 1
+        assert sets.count() == 1
+
+    def test_union_and_find(self):
+        sets = DisjointSet(['A', 'B', 'C', 'D', 'E'])
+        assert sets.union('A', 'B') is True
+        assert sets.union('C', 'D') is True
+        assert sets.union('B', 'A') is False
+        assert sets.count() == 3
+        assert sets.connected('A', 'B')
+        assert not sets.connected('A', 'C')
+        assert sets.find('A') == sets.find('B')
+        assert sets.union('B', 'D') is True
+        assert sets.connected('A', 'C')
+        assert sets.count() == 2
+        assert sets.groups() == [['A', 'B', 'C', 'D'], ['E']]
+
+    def test_missing_item(self):
+        sets = DisjointSet(['A'])
+        with self.assertRaises(KeyError):
+            sets.find('Z')
+        with self.assertRaises(KeyError):
+            sets.union('A', 'Z')
+
+    def test_long_chain(self):
+        """Unions along a long chain stay shallow and never recurse."""
+        sets = DisjointSet(range(100000))
+        for i in range(99999):
+            sets.union(i, i + 1)
+        assert sets.count() == 1
+        assert sets.connected(0, 99999)
+
+
+if __name__ == '__main__':
+    unittest.main()
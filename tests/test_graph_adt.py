@@ -1,5 +1,6 @@
 import unittest
-from graphs.graph import Graph
+from graphs.graph import Graph, Vertex
+from graphs.weighted_graph import WeightedGraph
 from util.file_reader import read_graph_from_file
 
 
@@ -37,6 +38,346 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(len(vertex_b.get_neighbors()), 2)
         self.assertEqual(len(vertex_c.get_neighbors()), 2)
 
+    def test_compact_vertices(self):
+        """Vertices have no __dict__, and store their neighbors as indices."""
+        graph = Graph(is_directed=True)
+        vertex_a, vertex_b = graph.add_vertices(['A', 'B'])
+        graph.add_edge('A', 'B')
+        graph.add_edge('A', 'B')
+
+        self.assertFalse(hasattr(vertex_a, '__dict__'))
+        self.assertEqual(list(vertex_a._neighbors), [vertex_b._index])
+        self.assertEqual(vertex_a.get_neighbors(), [vertex_b])
+        # adding a vertex again replaces it, under the same interned index
+        new_b = graph.add_vertex('B')
+        self.assertEqual(new_b._index, vertex_b._index)
+        self.assertEqual(vertex_a.get_neighbors(), [new_b])
+        # vertices outside a graph can still be linked up
+        vertex_x, vertex_y = Vertex('X'), Vertex('Y')
+        vertex_x.add_neighbor(vertex_y)
+        vertex_x.add_neighbor(vertex_a)
+        self.assertEqual(vertex_x.get_neighbors(), [vertex_y, vertex_a])
+        self.assertEqual(str(vertex_x), "X adjacent to ['Y', 'A']")
+
+    def test_high_degree_vertex(self):
+        """A hub with many neighbors is built quickly, without duplicates."""
+        graph = Graph(is_directed=False)
+        hub = graph.add_vertex('hub')
+        graph.add_vertices(range(50000))
+        graph.add_edges([('hub', i) for i in range(50000)])
+        graph.add_edges([('hub', i) for i in range(0, 50000, 7)])
+        graph.add_edge(49999, 'hub')
+
+        self.assertEqual(hub.degree(), 50000)
+        self.assertFalse(hasattr(hub, '_neighbor_set'))
+        self.assertEqual(graph.get_vertex(49999).degree(), 1)
+
+    def test_iter_neighbors(self):
+        graph = Graph(is_directed=False)
+        vertex_a, vertex_b, vertex_c = graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edges([('A','B'), ('A','C')])
+
+        neighbors = vertex_a.iter_neighbors()
+        self.assertEqual(next(neighbors), vertex_b)
+        self.assertEqual(list(neighbors), [vertex_c])
+        self.assertEqual(vertex_a.degree(), 2)
+        self.assertEqual(vertex_b.degree(), 1)
+
+    def test_predecessors(self):
+        graph = Graph(is_directed=True, track_in_edges=True)
+        graph.add_edges([('A','C'), ('B','C'), ('C','D'), ('C','C')], create_missing=True)
+
+        self.assertEqual(graph.get_predecessors('C'), ['A', 'B', 'C'])
+        self.assertEqual(graph.in_degree('C'), 3)
+        self.assertEqual(graph.in_degree('A'), 0)
+        graph.add_edge('D', 'A')
+        self.assertEqual(graph.get_predecessors('A'), ['D'])
+        # adding C again drops its out-edges, but keeps the edges into it
+        graph.add_vertex('C')
+        self.assertEqual(graph.get_predecessors('C'), ['A', 'B'])
+        self.assertEqual(graph.in_degree('D'), 0)
+        with self.assertRaises(KeyError):
+            graph.get_predecessors('Z')
+
+    def test_predecessors_undirected(self):
+        graph = Graph(is_directed=False)
+        graph.add_edges([('A','B'), ('A','C')], create_missing=True)
+
+        self.assertEqual(graph.get_predecessors('A'), ['B', 'C'])
+        self.assertEqual(graph.in_degree('B'), 1)
+        self.assertIs(graph.reverse(), graph)
+
+    def test_reverse(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges([('A','B'), ('B','C'), ('A','C')], create_missing=True)
+
+        reverse = graph.reverse()
+        self.assertEqual(reverse.bfs_traversal('C'), ['C', 'A', 'B'])
+        self.assertEqual(reverse.get_predecessors('A'), ['B', 'C'])
+        # the view shares the graph's storage, so it sees new edges
+        graph.add_edge('C', 'A')
+        self.assertEqual(reverse.get_predecessors('C'), ['A'])
+        self.assertEqual(reverse.get_vertex('A').get_neighbors()[-1].get_id(), 'C')
+        with self.assertRaises(TypeError):
+            reverse.add_edge('A', 'B')
+        # nothing else can change the view either
+        with self.assertRaises(TypeError):
+            reverse.add_vertex('Z')
+        with self.assertRaises(TypeError):
+            reverse.add_vertices(['Y', 'Z'])
+        with self.assertRaises(TypeError):
+            reverse.add_edges([('A', 'Z')], create_missing=True)
+        self.assertEqual(sorted(reverse.vertex_dict), ['A', 'B', 'C'])
+        self.assertIsNone(reverse.get_vertex('Z'))
+
+    def test_reverse_sees_new_vertices(self):
+        """Vertices added to the graph after reverse() show up in the view."""
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B'])
+        graph.add_edge('A', 'B')
+        reverse = graph.reverse()
+        graph.add_vertex('Z')
+        graph.add_edge('Z', 'A')
+
+        self.assertEqual(reverse.bfs_traversal('A'), ['A', 'Z'])
+        self.assertEqual(
+            [vertex.get_id() for vertex in reverse.get_vertex('A').get_neighbors()], ['Z'])
+        self.assertEqual(reverse.topological_sort(), ['B', 'A', 'Z'])
+        self.assertTrue(reverse.is_bipartite())
+        # a vertex added again replaces its proxy, too
+        new_a = graph.add_vertex('A')
+        graph.add_edge('A', 'B')
+        self.assertIs(reverse.get_vertex('A')._vertex, new_a)
+        self.assertEqual(reverse.bfs_traversal('B'), ['B', 'A', 'Z'])
+        self.assertEqual(sorted(reverse.vertex_dict), ['A', 'B', 'Z'])
+
+    def test_track_components(self):
+        graph = Graph(is_directed=False, track_components=True)
+        graph.add_vertices(['A', 'B', 'C', 'D'])
+        self.assertEqual(graph.component_count(), 4)
+
+        graph.add_edges([('A','B'), ('C','D')])
+        self.assertTrue(graph.connected('A', 'B'))
+        self.assertFalse(graph.connected('A', 'C'))
+        self.assertEqual(graph.component_count(), 2)
+        graph.add_edge('B', 'C')
+        graph.add_vertex('E')
+        self.assertTrue(graph.connected('A', 'D'))
+        self.assertEqual(graph.component_of('D'), graph.component_of('A'))
+        self.assertEqual(graph.component_count(), 2)
+
+    def test_components_built_on_demand(self):
+        graph = Graph(is_directed=False)
+        graph.add_edges([('A','B'), ('C','D')], create_missing=True)
+
+        self.assertEqual(graph.component_count(), 2)
+        graph.add_edge('A', 'D')
+        self.assertTrue(graph.connected('B', 'C'))
+        with self.assertRaises(ValueError):
+            Graph(is_directed=True).component_count()
+        with self.assertRaises(ValueError):
+            Graph(is_directed=True, track_components=True)
+
+    def test_iter_edges(self):
+        graph = Graph(is_directed=False)
+        graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edges([('A','B'), ('C','A'), ('B','C')])
+
+        self.assertEqual(
+            list(graph.iter_edges()), [('A', 'B'), ('A', 'C'), ('B', 'C')])
+        vertex_ids, sources, targets = graph.edge_list(as_arrays=True)
+        self.assertEqual(vertex_ids, ['A', 'B', 'C'])
+        self.assertEqual(list(sources), [0, 0, 1])
+        self.assertEqual(list(targets), [1, 2, 2])
+
+    def test_add_vertices_and_edges(self):
+        """Load a graph in bulk."""
+        graph = Graph(is_directed=False)
+        vertex_a, vertex_b, vertex_c = graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edges([('A','B'), ('A','C'), ('B','C')])
+
+        self.assertEqual(len(graph.get_vertices()), 3)
+        self.assertEqual(vertex_a.get_id(), 'A')
+        self.assertEqual(len(vertex_a.get_neighbors()), 2)
+        self.assertEqual(len(vertex_b.get_neighbors()), 2)
+        self.assertEqual(len(vertex_c.get_neighbors()), 2)
+
+    def test_add_edges_missing_vertex(self):
+        """A batch with an unknown endpoint is rejected as a whole."""
+        graph = Graph(is_directed=True)
+        vertex_a, vertex_b = graph.add_vertices(['A', 'B'])
+
+        with self.assertRaises(KeyError):
+            graph.add_edges([('A','B'), ('B','C')])
+        self.assertEqual(len(vertex_a.get_neighbors()), 0)
+        self.assertEqual(len(graph.get_vertices()), 2)
+
+    def test_add_edges_wrong_size(self):
+        """A batch with an edge of the wrong size is rejected as a whole."""
+        graph = Graph(is_directed=True)
+        vertex_a, vertex_b = graph.add_vertices(['A', 'B'])
+
+        with self.assertRaises(ValueError):
+            graph.add_edges([('A','B'), ('B','C','x')], create_missing=True)
+        with self.assertRaises(ValueError):
+            graph.add_edges([('A','B'), ('B',)])
+        self.assertEqual(len(vertex_a.get_neighbors()), 0)
+        self.assertEqual(len(graph.get_vertices()), 2)
+
+    def test_add_edges_create_missing(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertex('A')
+        graph.add_edges(iter([('A','B'), ('C','A')]), create_missing=True)
+
+        self.assertEqual(
+            [vertex.get_id() for vertex in graph.get_vertices()], ['A', 'B', 'C'])
+        self.assertEqual(len(graph.get_vertex('C').get_neighbors()), 1)
+
+    def test_get_vertex_rings(self):
+        filename = 'test_files/graph_medium_undirected.txt'
+        graph = read_graph_from_file(filename)
+
+        rings = graph.find_vertex_rings('A', 5)
+        self.assertEqual(
+            [sorted(ring) for ring in rings], [['A'], ['B','C'], ['D','E'], ['F']])
+        self.assertEqual(graph.find_vertex_rings('A', 1), [['A'], ['B', 'C']])
+        self.assertEqual(graph.find_vertices_n_away('A', 4), [])
+        # no vertex is a negative distance away
+        for distance in [-1, -2]:
+            self.assertEqual(graph.find_vertices_n_away('A', distance), [])
+            self.assertEqual(graph.find_vertex_rings('A', distance), [])
+
+    def test_get_all_vertices_n_away_many(self):
+        filename = 'test_files/graph_medium_undirected.txt'
+        graph = read_graph_from_file(filename)
+
+        self.assertEqual(graph.find_vertices_n_away_many(['A', 'F'], 0), ['A', 'F'])
+        self.assertEqual(
+            sorted(graph.find_vertices_n_away_many(['A', 'F'], 1)), ['B','C','D','E'])
+        self.assertEqual(graph.find_vertices_n_away_many(['A', 'F'], 2), [])
+        with self.assertRaises(KeyError):
+            graph.find_vertices_n_away_many(['A', 'Z'], 1)
+
+    def test_vertices_n_away_dense_graph(self):
+        """Each vertex is expanded once, however many paths reach it."""
+        graph = Graph(is_directed=False)
+        graph.add_edges(
+            [(i, j) for i in range(60) for j in range(i + 1, 60)],
+            create_missing=True)
+
+        self.assertEqual(len(graph.find_vertices_n_away(0, 1)), 59)
+        self.assertEqual(graph.find_vertices_n_away(0, 6), [])
+
+
+class TestShortestPath(unittest.TestCase):
+
+    def make_graph(self):
+        """A directed graph whose last edge offers a shortcut from A to E."""
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B', 'C', 'D', 'E', 'F'])
+        graph.add_edges([
+            ('A','B'), ('B','C'), ('C','D'), ('D','E'), ('F','A'), ('A','E')
+        ])
+        return graph
+
+    def test_find_shortest_path(self):
+        graph = self.make_graph()
+
+        self.assertEqual(graph.find_shortest_path('A', 'E'), ['A', 'E'])
+        self.assertEqual(graph.find_shortest_path('B', 'E'), ['B', 'C', 'D', 'E'])
+        self.assertIsNone(graph.find_shortest_path('E', 'A'))
+
+    def test_find_shortest_path_bidirectional(self):
+        graph = self.make_graph()
+
+        self.assertEqual(
+            graph.find_shortest_path('F', 'E', bidirectional=True), ['F', 'A', 'E'])
+        self.assertEqual(
+            graph.find_shortest_path('B', 'E', bidirectional=True), ['B', 'C', 'D', 'E'])
+        self.assertIsNone(graph.find_shortest_path('E', 'A', bidirectional=True))
+
+    def test_bidirectional_matches_bfs(self):
+        """Both searches find paths of the same length on a grid."""
+        graph = Graph(is_directed=False)
+        graph.add_edges(
+            [((row, col), (row, col + 1)) for row in range(8) for col in range(7)]
+            + [((row, col), (row + 1, col)) for row in range(7) for col in range(8)],
+            create_missing=True)
+
+        for target in [(0, 0), (3, 4), (7, 7), (7, 0)]:
+            path = graph.find_shortest_path((0, 0), target, bidirectional=True)
+            self.assertEqual(
+                len(path), len(graph.find_shortest_path((0, 0), target)))
+            for vertex_id, next_id in zip(path, path[1:]):
+                neighbors = graph.get_vertex(vertex_id).get_neighbors()
+                self.assertIn(next_id, [n.get_id() for n in neighbors])
+
+    def test_long_chain(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges([(i, i + 1) for i in range(3000)], create_missing=True)
+
+        self.assertEqual(graph.find_shortest_path(0, 3000), list(range(3001)))
+        self.assertEqual(
+            graph.find_shortest_path(0, 3000, bidirectional=True), list(range(3001)))
+
+
+class TestLazyTraversals(unittest.TestCase):
+
+    def make_graph(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B', 'C', 'D', 'E'])
+        graph.add_edges([('A','B'), ('A','C'), ('B','D'), ('C','D'), ('D','E')])
+        return graph
+
+    def test_iter_bfs(self):
+        graph = self.make_graph()
+
+        self.assertEqual(list(graph.iter_bfs('A')), ['A', 'B', 'C', 'D', 'E'])
+        self.assertEqual(
+            list(graph.iter_bfs('A', with_info=True)),
+            [('A', 0, None), ('B', 1, 'A'), ('C', 1, 'A'), ('D', 2, 'B'), ('E', 3, 'D')])
+        self.assertEqual(graph.bfs_traversal('C'), ['C', 'D', 'E'])
+
+    def test_iter_dfs(self):
+        graph = self.make_graph()
+
+        self.assertEqual(list(graph.iter_dfs('A')), ['A', 'B', 'D', 'E', 'C'])
+        self.assertEqual(
+            list(graph.iter_dfs('A', with_info=True)),
+            [('A', 0, None), ('B', 1, 'A'), ('D', 2, 'B'), ('E', 3, 'D'), ('C', 1, 'A')])
+
+    def test_iter_bfs_layers(self):
+        graph = self.make_graph()
+
+        self.assertEqual(
+            list(graph.iter_bfs_layers('A')), [['A'], ['B', 'C'], ['D'], ['E']])
+
+    def test_traversal_is_lazy(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['A', 'B'])
+        traversal = graph.iter_bfs('A')
+        self.assertEqual(next(traversal), 'A')
+        # A's neighbors are not looked at until the next vertex is requested
+        graph.add_edge('A', 'B')
+        self.assertEqual(list(traversal), ['B'])
+
+    def test_missing_start(self):
+        graph = self.make_graph()
+
+        with self.assertRaises(KeyError):
+            graph.iter_bfs('Z')
+        with self.assertRaises(KeyError):
+            graph.iter_dfs('Z')
+        with self.assertRaises(KeyError):
+            graph.iter_bfs_layers('Z')
+
+    def test_long_chain(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges([(i, i + 1) for i in range(5000)], create_missing=True)
+
+        self.assertEqual(list(graph.iter_dfs(0)), list(range(5001)))
+
+
 class TestReadGraphFromFile(unittest.TestCase):
     def test_read_directed_graph_from_file(self):
         filename = 'test_files/graph_small_directed.txt'
@@ -70,6 +411,34 @@ class TestReadGraphFromFile(unittest.TestCase):
         self.assertEqual(len(vertex3.get_neighbors()), 1)
         self.assertEqual(len(vertex4.get_neighbors()), 2)
 
+    def test_read_weighted_graph_from_file(self):
+        filename = 'test_files/graph_weighted_undirected.txt'
+        graph = read_graph_from_file(filename)
+
+        self.assertIsInstance(graph, WeightedGraph)
+        self.assertFalse(graph.is_directed)
+        self.assertEqual(len(graph.get_vertices()), 4)
+        self.assertEqual(
+            graph.find_shortest_path('seattle', 'boise'),
+            (['seattle', 'spokane', 'boise'], 569.5))
+        self.assertEqual(
+            graph.get_vertex('spokane').get_neighbors_with_weights()[1][1], 290.5)
+
+    def test_read_graph_in_batches(self):
+        filename = 'test_files/graph_medium_undirected.txt'
+        reports = list()
+        graph = read_graph_from_file(
+            filename, batch_size=2,
+            progress=lambda done, total: reports.append((done, total)))
+
+        self.assertEqual(len(graph.get_vertex('D').get_neighbors()), 4)
+        # 9 edges in batches of 2
+        self.assertEqual(len(reports), 5)
+        self.assertEqual(reports[-1][0], reports[-1][1])
+        self.assertEqual(
+            [done for done, total in reports],
+            sorted(done for done, total in reports))
+
     def test_improper_graph_type(self):
         filename = 'test_files/improper_graph_type.txt'
 
@@ -84,6 +453,17 @@ class TestReadGraphFromFile(unittest.TestCase):
 
         self.assertEqual(len(path_from_A_to_F), 4)
 
+    def test_find_shortest_path_bidirectional(self):
+        filename = 'test_files/graph_medium_undirected.txt'
+        graph = read_graph_from_file(filename)
+
+        path_from_A_to_F = graph.find_shortest_path('A', 'F', bidirectional=True)
+
+        self.assertEqual(len(path_from_A_to_F), 4)
+        self.assertEqual(path_from_A_to_F[0], 'A')
+        self.assertEqual(path_from_A_to_F[-1], 'F')
+        self.assertEqual(graph.find_shortest_path('A', 'A', bidirectional=True), ['A'])
+
     def test_get_all_vertices_n_away(self):
         filename = 'test_files/graph_medium_undirected.txt'
         graph = read_graph_from_file(filename)
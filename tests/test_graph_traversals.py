@@ -1,6 +1,6 @@
 import unittest
 from gradescope_utils.autograder_utils.decorators import weight, visibility
-from graphs.graph import Graph
+from graphs.graph import Graph, CycleError
 
 
 class TestBipartite(unittest.TestCase):
@@ -48,6 +48,62 @@ class TestBipartite(unittest.TestCase):
 
         self.assertTrue(graph.is_bipartite())
 
+    @weight(3)
+    def test_is_bipartite_empty(self):
+        """Test that a graph with no vertices is bipartite."""
+        self.assertTrue(Graph(is_directed=False).is_bipartite())
+        self.assertEqual(
+            Graph(is_directed=False).is_bipartite(return_witness=True), (True, [[], []]))
+
+    @weight(3)
+    def test_not_bipartite_second_component(self):
+        """Test that an odd cycle is found outside the first component."""
+        graph = Graph(is_directed=False)
+        graph.add_edges([
+            ('A','B'), ('C','D'), ('D','E'), ('E','F'), ('F','G'), ('G','C')
+        ], create_missing=True)
+
+        self.assertFalse(graph.is_bipartite())
+        is_bipartite, odd_cycle = graph.is_bipartite(return_witness=True)
+        self.assertFalse(is_bipartite)
+        self.assertEqual(len(odd_cycle), 6)
+        self.assertEqual(sorted(odd_cycle[:-1]), ['C', 'D', 'E', 'F', 'G'])
+        self.assertEqual(odd_cycle[0], odd_cycle[-1])
+
+    @weight(3)
+    def test_is_bipartite_witness(self):
+        """Test that a bipartite graph is split into its two sides."""
+        graph = Graph(is_directed=True)
+        graph.add_edges([
+            ('A','x'), ('B','x'), ('B','y'), ('C','y'), ('z','D')
+        ], create_missing=True)
+
+        self.assertEqual(
+            graph.is_bipartite(return_witness=True),
+            (True, [['A', 'B', 'C', 'z'], ['x', 'y', 'D']]))
+        graph.add_edge('A', 'B')
+        self.assertEqual(
+            graph.is_bipartite(return_witness=True), (False, ['x', 'A', 'B', 'x']))
+
+    @weight(3)
+    def test_is_bipartite_keeps_no_in_edges(self):
+        """Checking a directed graph does not start its in-edge index."""
+        graph = Graph(is_directed=True)
+        graph.add_edges([('A','x'), ('B','x'), ('B','y'), ('y','C')], create_missing=True)
+
+        self.assertTrue(graph.is_bipartite())
+        self.assertIsNone(graph.get_vertex('x')._in_neighbors)
+        graph.add_edge('C', 'B')
+        self.assertEqual(
+            graph.is_bipartite(return_witness=True), (False, ['y', 'B', 'C', 'y']))
+        self.assertIsNone(graph.get_vertex('x')._in_neighbors)
+        # a graph that keeps the index gets the same answer from it
+        graph = Graph(is_directed=True, track_in_edges=True)
+        graph.add_edges([('A','x'), ('B','x'), ('B','y'), ('y','C'), ('C','B')],
+                        create_missing=True)
+        self.assertEqual(
+            graph.is_bipartite(return_witness=True), (False, ['y', 'B', 'C', 'y']))
+
 
 class TestConnectedComponents(unittest.TestCase):
     @weight(10)
@@ -76,6 +132,17 @@ class TestConnectedComponents(unittest.TestCase):
 
         self.assertCountEqual(expected_components, actual_components)
 
+    @weight(3)
+    def test_connected_components_long_chain(self):
+        """A path longer than the recursion limit is one component."""
+        graph = Graph(is_directed=False)
+        graph.add_edges([(i, i + 1) for i in range(5000)], create_missing=True)
+        graph.add_vertex('lonely')
+
+        actual_components = graph.find_connected_components()
+
+        self.assertEqual(actual_components, [list(range(5001)), ['lonely']])
+
 
 class TestFindPathDfs(unittest.TestCase):
     @weight(10)
@@ -92,6 +159,63 @@ class TestFindPathDfs(unittest.TestCase):
         self.assertEqual(path, ['A', 'B', 'C'])
 
 
+class TestStronglyConnectedComponents(unittest.TestCase):
+    @weight(5)
+    def test_strongly_connected_components(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges([
+            ('A','B'), ('B','C'), ('C','A'), ('C','D'), ('D','E'),
+            ('E','D'), ('F','E'), ('F','G')
+        ], create_missing=True)
+
+        components = graph.strongly_connected_components()
+
+        self.assertEqual(
+            sorted(sorted(component) for component in components),
+            [['A', 'B', 'C'], ['D', 'E'], ['F'], ['G']])
+        # no edge leads back to an earlier component
+        position = {
+            vertex_id: i for i, component in enumerate(components)
+            for vertex_id in component
+        }
+        for vertex_id1, vertex_id2 in graph.iter_edges():
+            self.assertLessEqual(position[vertex_id1], position[vertex_id2])
+
+    @weight(3)
+    def test_strongly_connected_components_long_cycle(self):
+        """A cycle through more vertices than the recursion limit."""
+        graph = Graph(is_directed=True)
+        graph.add_edges([(i, (i + 1) % 5000) for i in range(5000)], create_missing=True)
+        graph.add_edges([(0, 'tail')], create_missing=True)
+
+        components = graph.strongly_connected_components()
+
+        self.assertEqual(len(components), 2)
+        self.assertEqual(sorted(components[0]), list(range(5000)))
+        self.assertEqual(components[1], ['tail'])
+
+    @weight(5)
+    def test_condensation(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges([
+            ('A','B'), ('B','A'), ('A','C'), ('B','C'), ('C','D'), ('D','C'),
+            ('B','E')
+        ], create_missing=True)
+
+        condensed, components = graph.condensation()
+
+        self.assertEqual(len(components), 3)
+        index = {
+            vertex_id: i for i, component in enumerate(components)
+            for vertex_id in component
+        }
+        self.assertEqual(
+            sorted(condensed.iter_edges()),
+            sorted([(index['A'], index['C']), (index['A'], index['E'])]))
+        self.assertFalse(condensed.contains_cycle())
+        self.assertEqual(condensed.topological_sort()[0], index['A'])
+
+
 class TestContainsCycle(unittest.TestCase):
     @weight(4)
     def test_contains_cycle(self):
@@ -132,6 +256,42 @@ class TestContainsCycle(unittest.TestCase):
 
         self.assertFalse(graph.contains_cycle())
 
+    @weight(3)
+    def test_contains_cycle_undirected(self):
+        """An undirected edge is not a cycle, but a triangle is."""
+        graph = Graph(is_directed=False)
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_vertex('C')
+        graph.add_edge('A','B')
+        graph.add_edge('B','C')
+        self.assertFalse(graph.contains_cycle())
+
+        graph.add_edge('C','A')
+        self.assertTrue(graph.contains_cycle())
+
+    @weight(3)
+    def test_contains_cycle_long_chain(self):
+        """A cycle through more vertices than the recursion limit."""
+        graph = Graph(is_directed=True)
+        graph.add_edges([(i, i + 1) for i in range(5000)], create_missing=True)
+        self.assertFalse(graph.contains_cycle())
+
+        graph.add_edge(5000, 0)
+        self.assertTrue(graph.contains_cycle())
+
+    @weight(3)
+    def test_find_cycle(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges([('A','B'), ('B','C'), ('C','D'), ('D','B')], create_missing=True)
+        self.assertEqual(graph.find_cycle(), ['B', 'C', 'D', 'B'])
+
+        graph = Graph(is_directed=False)
+        graph.add_edges([('A','B'), ('B','C')], create_missing=True)
+        self.assertIsNone(graph.find_cycle())
+        graph.add_edge('A','C')
+        self.assertEqual(graph.find_cycle(), ['A', 'B', 'C', 'A'])
+
 
 class TestTopologicalSort(unittest.TestCase):
     @weight(10)
@@ -155,6 +315,40 @@ class TestTopologicalSort(unittest.TestCase):
         topo_sort = graph.topological_sort()
 
         self.assertIn(topo_sort, possible_sorts)
+
+    @weight(3)
+    def test_topological_sort_long_chain(self):
+        """A dependency chain longer than the recursion limit."""
+        graph = Graph(is_directed=True)
+        graph.add_vertices(range(5000, -1, -1))
+        graph.add_edges([(i, i + 1) for i in range(5000)])
+
+        self.assertEqual(graph.topological_sort(), list(range(5001)))
+
+    @weight(5)
+    def test_topological_levels(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertices(['E', 'D', 'C', 'B', 'A', 'F'])
+        graph.add_edges([
+            ('A','C'), ('B','C'), ('B','D'), ('C','E'), ('D','E'), ('A','E')
+        ])
+
+        self.assertEqual(
+            graph.topological_levels(), [['B', 'A', 'F'], ['D', 'C'], ['E']])
+        self.assertEqual(Graph().topological_levels(), [])
+
+    @weight(3)
+    def test_topological_levels_cycle(self):
+        graph = Graph(is_directed=True)
+        graph.add_edges([('A','B'), ('B','C'), ('C','D'), ('D','B')], create_missing=True)
+
+        with self.assertRaisesRegex(ValueError, r"\['B', 'C', 'D', 'B'\]"):
+            graph.topological_levels()
+        with self.assertRaises(CycleError) as context:
+            graph.topological_levels()
+        self.assertEqual(context.exception.cycle, ['B', 'C', 'D', 'B'])
+        with self.assertRaises(ValueError):
+            Graph(is_directed=False).topological_levels()
         
 
 if __name__ == '__main__':
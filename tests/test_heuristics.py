@@ -0,0 +1,27 @@
+import unittest
+from graphs.heuristics import (
+    euclidean_distance, haversine_distance, coordinate_heuristic
+)
+
+
+class TestHeuristics(unittest.TestCase):
+    def test_euclidean_distance(self):
+        self.assertEqual(euclidean_distance((0, 0), (3, 4)), 5)
+
+    def test_haversine_distance(self):
+        paris, london = (48.8566, 2.3522), (51.5074, -0.1278)
+        self.assertAlmostEqual(haversine_distance(paris, london), 343.5, delta=1)
+        self.assertEqual(haversine_distance(paris, paris), 0)
+
+    def test_coordinate_heuristic(self):
+        heuristic = coordinate_heuristic({'A': (0, 0), 'B': (6, 8)}, scale=0.5)
+        self.assertEqual(heuristic('A', 'B'), 5)
+
+        manhattan = coordinate_heuristic(
+            {'A': (0, 0), 'B': (6, 8)},
+            metric=lambda p, q: abs(p[0] - q[0]) + abs(p[1] - q[1]))
+        self.assertEqual(manhattan('A', 'B'), 14)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import random
+import tempfile
+import unittest
+from graphs.weighted_graph import WeightedGraph
+from graphs.landmarks import LandmarkIndex
+
+
+class TestLandmarkIndex(unittest.TestCase):
+
+    def make_random_graph(self, is_directed, seed):
+        rng = random.Random(seed)
+        graph = WeightedGraph(is_directed=is_directed)
+        graph.add_vertices(range(60))
+        weights = {
+            (rng.randrange(60), rng.randrange(60)): rng.randint(1, 20)
+            for _ in range(150)
+        }
+        graph.add_edges([(u, v, w) for (u, v), w in weights.items()])
+        return graph
+
+    def assert_matches_dijkstra(self, graph):
+        for start_id in range(0, 60, 7):
+            for target_id in range(0, 60, 5):
+                expected = graph.find_shortest_path(start_id, target_id)
+                actual = graph.find_shortest_path_alt(start_id, target_id)
+                if expected is None:
+                    self.assertIsNone(actual)
+                else:
+                    self.assertEqual(actual[1], expected[1])
+                    self.assertEqual(actual[0][0], start_id)
+                    self.assertEqual(actual[0][-1], target_id)
+
+    def test_lower_bounds(self):
+        for is_directed in (True, False):
+            graph = self.make_random_graph(is_directed, seed=1)
+            index = graph.build_landmark_index(num_landmarks=3)
+            self.assertEqual(len(index.landmarks), 3)
+            for start_id in range(0, 60, 3):
+                for target_id in range(0, 60, 4):
+                    result = graph.find_shortest_path(start_id, target_id)
+                    distance = float('inf') if result is None else result[1]
+                    self.assertLessEqual(
+                        index.lower_bound(start_id, target_id), distance)
+
+    def test_alt_directed(self):
+        graph = self.make_random_graph(True, seed=2)
+        graph.build_landmark_index(num_landmarks=4, strategy='farthest')
+        self.assert_matches_dijkstra(graph)
+
+    def test_alt_undirected_degree(self):
+        graph = self.make_random_graph(False, seed=3)
+        graph.build_landmark_index(num_landmarks=4, strategy='degree')
+        self.assert_matches_dijkstra(graph)
+
+    def test_farthest_landmarks_cover_components(self):
+        graph = WeightedGraph(is_directed=False)
+        graph.add_edges(
+            [('A', 'B', 1), ('B', 'C', 1), ('X', 'Y', 1)], create_missing=True)
+
+        index = graph.build_landmark_index(num_landmarks=2)
+
+        self.assertEqual(len({'A', 'B', 'C'} & set(index.landmarks)), 1)
+        self.assertEqual(len({'X', 'Y'} & set(index.landmarks)), 1)
+        self.assertEqual(index.lower_bound('A', 'X'), float('inf'))
+        self.assertIsNone(graph.find_shortest_path_alt('A', 'Y'))
+
+    def test_invalidated_on_change(self):
+        graph = self.make_random_graph(True, seed=4)
+        graph.build_landmark_index()
+
+        graph.add_edge(1, 2, 1)
+
+        self.assertIsNone(graph.landmark_index)
+        with self.assertRaises(ValueError):
+            graph.find_shortest_path_alt(1, 2)
+
+    def test_save_and_load(self):
+        graph = self.make_random_graph(True, seed=5)
+        index = graph.build_landmark_index(num_landmarks=3)
+        handle, filename = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            index.save(filename)
+            graph.landmark_index = None
+            loaded = graph.load_landmark_index(filename)
+
+            self.assertEqual(loaded.landmarks, index.landmarks)
+            for vertex_id in range(0, 60, 6):
+                self.assertEqual(
+                    loaded.lower_bound(vertex_id, 0), index.lower_bound(vertex_id, 0))
+            self.assert_matches_dijkstra(graph)
+            with self.assertRaises(ValueError):
+                LandmarkIndex.load(filename, list(range(10)))
+        finally:
+            os.remove(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from array import array
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+from graphs.parallel import multi_source_shortest_paths
+
+
+class TestMultiSourceShortestPaths(unittest.TestCase):
+
+    def make_graph(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges([
+            ('A', 'B', 4), ('A', 'C', 1), ('C', 'B', 2), ('B', 'D', 5),
+            ('D', 'A', 1), ('E', 'D', 3)
+        ], create_missing=True)
+        return graph
+
+    def expected_rows(self, graph, sources):
+        """Distances computed one source at a time with Dijkstra."""
+        inf = float('inf')
+        rows = dict()
+        for source_id in sources:
+            row = list()
+            for target_id in graph.vertex_dict:
+                result = graph.find_shortest_path(source_id, target_id)
+                row.append(inf if result is None else result[1])
+            rows[source_id] = row
+        return rows
+
+    def test_serial(self):
+        graph = self.make_graph()
+        sources = ['A', 'E', 'B']
+
+        results = dict(graph.multi_source_shortest_paths(sources, workers=1))
+
+        self.assertEqual(
+            {source_id: list(row) for source_id, row in results.items()},
+            self.expected_rows(graph, sources))
+
+    def test_process_pool(self):
+        graph = self.make_graph()
+        sources = ['A', 'B', 'C', 'D', 'E']
+
+        results = dict(graph.multi_source_shortest_paths(sources, workers=2))
+
+        self.assertEqual(
+            {source_id: list(row) for source_id, row in results.items()},
+            self.expected_rows(graph, sources))
+
+    def test_output_file(self):
+        graph = self.make_graph()
+        sources = ['E', 'A']
+        handle, filename = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            results = dict(graph.multi_source_shortest_paths(
+                sources, workers=2, out=filename))
+            expected = self.expected_rows(graph, sources)
+
+            self.assertEqual(list(results['A']), expected['A'])
+            matrix = array('d')
+            with open(filename, 'rb') as f:
+                matrix.frombytes(f.read())
+            self.assertEqual(list(matrix), expected['E'] + expected['A'])
+        finally:
+            os.remove(filename)
+
+    def test_unweighted_hops(self):
+        graph = Graph(is_directed=False)
+        graph.add_edges([(1, 2), (2, 3), (3, 4)], create_missing=True)
+
+        results = dict(multi_source_shortest_paths(graph.to_csr(), [1, 3], workers=2))
+
+        self.assertEqual(list(results[1]), [0, 1, 2, 3])
+        self.assertEqual(list(results[3]), [2, 1, 0, 1])
+
+    def test_missing_source(self):
+        graph = self.make_graph()
+
+        with self.assertRaises(KeyError):
+            graph.multi_source_shortest_paths(['A', 'Z'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,11 @@
+import math
 import unittest
+from decimal import Decimal
+from fractions import Fraction
+from unittest import mock
+from graphs import weighted_graph
 from graphs.weighted_graph import WeightedVertex, WeightedGraph
+from graphs.heuristics import euclidean_distance
 
 
 class TestWeightedGraph(unittest.TestCase):
@@ -21,6 +27,143 @@ class TestWeightedGraph(unittest.TestCase):
         self.assertTrue(isinstance(vertex_added, WeightedVertex))
         self.assertEqual(vertex_added.id, vertex_id)
 
+    def test_compact_weights(self):
+        graph = WeightedGraph(is_directed=True)
+        vertex_a, vertex_b, vertex_c = graph.add_vertices(['A', 'B', 'C'])
+        graph.add_edge('A', 'B', 3)
+        graph.add_edge('A', 'B', 5)
+
+        self.assertFalse(hasattr(vertex_a, '__dict__'))
+        self.assertEqual(vertex_a._weights.typecode, 'q')
+        self.assertEqual(vertex_a.get_neighbors_with_weights(), [(vertex_b, 3)])
+        # the weights switch to floats once one of them is not an int
+        graph.add_edge('A', 'C', 2.5)
+        self.assertEqual(vertex_a._weights.typecode, 'd')
+        self.assertEqual(
+            vertex_a.neighbors_dict, {'B': (vertex_b, 3), 'C': (vertex_c, 2.5)})
+        self.assertEqual(
+            list(vertex_a.iter_neighbors_with_weights()), [(vertex_b, 3), (vertex_c, 2.5)])
+        self.assertEqual(vertex_a.degree(), 2)
+
+    def test_exact_weights(self):
+        """Weights that don't fit an array are kept exactly, in a list."""
+        graph = WeightedGraph(is_directed=True)
+        vertex_a, vertex_b, vertex_c, vertex_d = graph.add_vertices(['A', 'B', 'C', 'D'])
+        graph.add_edge('A', 'B', 2 ** 63 - 1)
+        self.assertEqual(vertex_a._weights.typecode, 'q')
+        graph.add_edge('A', 'C', 2 ** 70)
+        self.assertEqual(vertex_a._weights, [2 ** 63 - 1, 2 ** 70])
+        self.assertEqual(vertex_a.neighbors_dict['C'], (vertex_c, 2 ** 70))
+        # floats only replace the ints while they would hold them exactly
+        graph.add_edge('B', 'C', 2 ** 60)
+        graph.add_edge('B', 'D', 0.5)
+        self.assertEqual(vertex_b._weights, [2 ** 60, 0.5])
+        graph.add_edge('C', 'D', Fraction(1, 3))
+        graph.add_edge('C', 'A', 0.25)
+        self.assertEqual(vertex_c._weights, [Fraction(1, 3), 0.25])
+        graph.add_edge('D', 'A', 1)
+        graph.add_edge('D', 'B', Decimal('0.1'))
+        self.assertEqual(vertex_d.get_neighbors_with_weights(),
+                         [(vertex_a, 1), (vertex_b, Decimal('0.1'))])
+
+        graph = WeightedGraph(is_directed=False)
+        graph.add_edges([
+            ('A', 'B', Fraction(1, 3)), ('B', 'C', Fraction(1, 6)), ('A', 'C', 1)
+        ], create_missing=True)
+        self.assertEqual(graph.find_shortest_path('A', 'C'), (['A', 'B', 'C'], Fraction(1, 2)))
+        self.assertEqual(graph.weight_stats(), (False, 1))
+
+    def test_high_degree_vertex(self):
+        """Adding an edge to a hub again keeps its first weight."""
+        graph = WeightedGraph(is_directed=True)
+        hub = graph.add_vertex('hub')
+        graph.add_vertices(range(50000))
+        graph.add_edges([('hub', i, i) for i in range(50000)])
+        graph.add_edges([('hub', i, 0) for i in range(0, 50000, 7)])
+
+        self.assertEqual(hub.degree(), 50000)
+        self.assertEqual(hub.neighbors_dict[49994], (graph.get_vertex(49994), 49994))
+
+    def test_reverse(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges([('A', 'B', 1), ('B', 'C', 2), ('A', 'C', 4)], create_missing=True)
+
+        reverse = graph.reverse()
+        self.assertEqual(reverse.find_shortest_path('C', 'A'), (['C', 'B', 'A'], 3))
+        self.assertEqual(reverse.get_predecessors_with_weights('A'), [('B', 1), ('C', 4)])
+        graph.add_edge('C', 'A', 0.5)
+        self.assertEqual(graph.get_predecessors_with_weights('A'), [('C', 0.5)])
+        self.assertEqual(reverse.find_shortest_path('A', 'C'), (['A', 'C'], 0.5))
+        with self.assertRaises(TypeError):
+            reverse.add_edge('A', 'B', 1)
+        with self.assertRaises(TypeError):
+            reverse.add_edges([('A', 'Z', 1)], create_missing=True)
+        with self.assertRaises(TypeError):
+            reverse.add_vertex('Z')
+        self.assertNotIn('Z', reverse.vertex_dict)
+
+    def test_reverse_sees_new_vertices(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges([('A', 'B', 1)], create_missing=True)
+        reverse = graph.reverse()
+        graph.add_vertex('Z')
+        graph.add_edge('Z', 'A', 2)
+
+        self.assertEqual(reverse.find_shortest_path('B', 'Z'), (['B', 'A', 'Z'], 3))
+        # a vertex added again keeps its in-edges, but not its out-edges
+        graph.add_vertex('A')
+        self.assertIsNone(reverse.find_shortest_path('B', 'Z'))
+        graph.add_edge('A', 'B', 4)
+        self.assertEqual(reverse.find_shortest_path('B', 'Z'), (['B', 'A', 'Z'], 6))
+        self.assertEqual(reverse.get_predecessors_with_weights('Z'), [('A', 2)])
+
+    def test_reverse_drops_stale_caches(self):
+        """A change to the graph clears what its reverse view has cached."""
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges([('B', 'A', 1), ('C', 'B', 1), ('D', 'C', 1)], create_missing=True)
+
+        reverse = graph.reverse()
+        self.assertEqual(
+            reverse.find_shortest_path('A', 'D', method='auto'), (['A', 'B', 'C', 'D'], 3))
+        reverse.build_landmark_index(num_landmarks=2)
+        graph.add_edge('D', 'A', 5)
+        self.assertIsNone(reverse.landmark_index)
+        self.assertEqual(reverse.weight_stats(), (True, 5))
+        self.assertEqual(
+            reverse.find_shortest_path('A', 'D', method='auto'), (['A', 'B', 'C', 'D'], 3))
+        self.assertEqual(
+            reverse.find_shortest_path('A', 'D'), (['A', 'B', 'C', 'D'], 3))
+
+    def test_track_components(self):
+        graph = WeightedGraph(is_directed=False, track_components=True)
+        graph.add_edges([('A', 'B', 3), ('C', 'D', 4)], create_missing=True)
+        self.assertEqual(graph.component_count(), 2)
+
+        graph.add_edge('B', 'C', 1)
+        self.assertTrue(graph.connected('A', 'D'))
+        self.assertEqual(graph.component_count(), 1)
+
+    def test_add_edges(self):
+        graph = WeightedGraph(is_directed=False)
+        graph.add_vertices(['A', 'B'])
+        graph.add_edges([('A', 'B', 3), ('B', 'C', 4)], create_missing=True)
+
+        self.assertEqual(len(graph.vertex_dict), 3)
+        self.assertEqual(graph.find_shortest_path('A', 'C'), (['A', 'B', 'C'], 7))
+
+    def test_add_edges_missing_vertex(self):
+        graph = WeightedGraph()
+        graph.add_vertices(['A', 'B'])
+
+        with self.assertRaises(ValueError):
+            graph.add_edges([('A', 'B', 3), ('B', 'C', 4)])
+        self.assertEqual(graph.vertex_dict['A'].get_neighbors(), [])
+        # so is a batch with an edge that has no weight
+        with self.assertRaises(ValueError):
+            graph.add_edges([('A', 'B', 3), ('B', 'C')], create_missing=True)
+        self.assertEqual(graph.vertex_dict['A'].get_neighbors(), [])
+        self.assertEqual(len(graph.vertex_dict), 2)
+
 
 class TestGraph(unittest.TestCase):
     
@@ -70,23 +213,315 @@ class TestGraph(unittest.TestCase):
 
         self.assertEqual(sorted(graph.minimum_spanning_tree_kruskal()), expected_mst)
 
+    def test_iter_edges(self):
+        graph = self.make_large_graph()
+
+        edges = list(graph.iter_edges())
+
+        self.assertEqual(len(edges), 14)
+        self.assertEqual(edges[:3], [('A', 'B', 4), ('A', 'C', 8), ('B', 'C', 11)])
+        self.assertEqual(edges, graph.edge_list())
+
+    def test_iter_edges_directed(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges([('A', 'B', 1), ('B', 'A', 2), ('B', 'B', 3)], create_missing=True)
+
+        self.assertEqual(
+            graph.edge_list(), [('A', 'B', 1), ('B', 'A', 2), ('B', 'B', 3)])
+
+    def test_edge_list_as_arrays(self):
+        graph = self.make_large_graph()
+
+        vertex_ids, sources, targets, weights = graph.edge_list(as_arrays=True)
+
+        self.assertEqual(len(sources), 14)
+        self.assertEqual(
+            [(vertex_ids[s], vertex_ids[t], w) for s, t, w in zip(sources, targets, weights)],
+            graph.edge_list())
+        self.assertEqual(memoryview(weights).format, 'd')
+
+    def test_mst_kruskal_forest(self):
+        """A disconnected graph has a minimum spanning forest."""
+        graph = self.make_large_graph()
+        graph.add_edges([('X', 'Y', 5), ('Y', 'Z', 1), ('X', 'Z', 3)], create_missing=True)
+
+        mst = graph.minimum_spanning_tree_kruskal()
+
+        self.assertEqual(len(mst), 10)
+        self.assertIn(('X', 'Z', 3), mst)
+        self.assertIn(('Y', 'Z', 1), mst)
+        self.assertEqual(WeightedGraph().minimum_spanning_tree_kruskal(), [])
+
     def test_mst_prim(self):
         """Create a weighted graph."""
         graph = self.make_large_graph()
 
         expected_mst_weight = 37
 
+        mst_edges, mst_weight = graph.minimum_spanning_tree_prim()
+
+        self.assertEqual(mst_weight, expected_mst_weight)
+        self.assertEqual(len(mst_edges), 8)
+        self.assertEqual(sum(weight for _, _, weight in mst_edges), mst_weight)
+
+    def test_mst_prim_matches_kruskal(self):
+        """Both algorithms agree when the minimum spanning tree is unique."""
+        graph = WeightedGraph(is_directed=False)
+        graph.add_edges([
+            ('A', 'B', 1), ('B', 'C', 2), ('A', 'C', 3), ('C', 'D', 4),
+            ('B', 'D', 5), ('D', 'E', 6), ('A', 'E', 7)
+        ], create_missing=True)
+
         self.assertEqual(
-            graph.minimum_spanning_tree_prim(), expected_mst_weight)
+            graph.minimum_spanning_tree_prim(),
+            (graph.minimum_spanning_tree_kruskal(), 13))
+
+    def test_mst_prim_forest(self):
+        """A disconnected graph has a minimum spanning forest."""
+        graph = self.make_large_graph()
+        graph.add_edges([('X', 'Y', 5), ('Y', 'Z', 1), ('X', 'Z', 3)], create_missing=True)
+        graph.add_vertex('lonely')
+
+        mst_edges, mst_weight = graph.minimum_spanning_tree_prim()
+
+        self.assertEqual(len(mst_edges), 10)
+        self.assertEqual(mst_weight, 37 + 4)
+        self.assertEqual(WeightedGraph().minimum_spanning_tree_prim(), ([], 0))
 
 
     def test_shortest_path(self):
         graph = self.make_large_graph()
 
-        expected_shortest_path = 21
+        expected_shortest_path = (['A', 'C', 'F', 'H', 'J'], 21)
 
         self.assertEqual(
             graph.find_shortest_path('A', 'J'), expected_shortest_path)
 
+    def test_shortest_path_to_start(self):
+        graph = self.make_large_graph()
+
+        self.assertEqual(graph.find_shortest_path('A', 'A'), (['A'], 0))
+
+    def test_shortest_path_not_found(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_vertex('C')
+        graph.add_edge('A', 'B', 1)
+        graph.add_edge('C', 'A', 1)
+
+        self.assertIsNone(graph.find_shortest_path('A', 'C'))
+        with self.assertRaises(KeyError):
+            graph.find_shortest_path('A', 'Z')
+        self.assertIsNone(graph.find_shortest_path('A', 'C', bidirectional=True))
+        with self.assertRaises(KeyError):
+            graph.find_shortest_path('A', 'Z', bidirectional=True)
+
+    def test_shortest_path_bidirectional(self):
+        graph = self.make_large_graph()
+
+        self.assertEqual(
+            graph.find_shortest_path('A', 'J', bidirectional=True),
+            (['A', 'C', 'F', 'H', 'J'], 21))
+        self.assertEqual(
+            graph.find_shortest_path('A', 'A', bidirectional=True), (['A'], 0))
+        for target_id in 'BCDEFGHJ':
+            self.assertEqual(
+                graph.find_shortest_path('G', target_id, bidirectional=True)[1],
+                graph.find_shortest_path('G', target_id)[1])
+
+    def test_shortest_path_integer_methods(self):
+        graph = self.make_large_graph()
+        expected_shortest_path = (['A', 'C', 'F', 'H', 'J'], 21)
+
+        self.assertEqual(graph.weight_stats(), (True, 14))
+        self.assertEqual(
+            graph.find_shortest_path('A', 'J', method='dial'), expected_shortest_path)
+        with mock.patch.object(graph, '_dial_shortest_path',
+                               wraps=graph._dial_shortest_path) as dial:
+            self.assertEqual(
+                graph.find_shortest_path('A', 'J', method='auto'),
+                expected_shortest_path)
+            dial.assert_called_once_with('A', 'J', 14)
+        with self.assertRaises(ValueError):
+            graph.find_shortest_path('A', 'J', method='0-1')
+        with self.assertRaises(ValueError):
+            graph.find_shortest_path('A', 'J', method='fibonacci')
+        # a fractional weight rules out the bucket queue
+        graph.add_edge('A', 'J', 21.5)
+        self.assertEqual(graph.weight_stats(), (False, 21.5))
+        with self.assertRaises(ValueError):
+            graph.find_shortest_path('A', 'J', method='dial')
+        self.assertEqual(
+            graph.find_shortest_path('A', 'J', method='auto'), expected_shortest_path)
+        # so do infinite and NaN weights, without crashing the check
+        graph.add_edge('B', 'J', math.inf)
+        self.assertEqual(graph.weight_stats(), (False, math.inf))
+        self.assertEqual(
+            graph.find_shortest_path('A', 'J', method='auto'), expected_shortest_path)
+        graph.add_edge('C', 'J', math.nan)
+        self.assertFalse(graph.weight_stats()[0])
+
+    def test_shortest_path_zero_one(self):
+        # a transit network: riding is free, each transfer costs 1
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges([
+            ('A', 'B', 0), ('B', 'C', 0), ('C', 'D', 1), ('A', 'E', 1),
+            ('E', 'D', 0), ('D', 'F', 0), ('B', 'F', 1), ('F', 'A', 1)
+        ], create_missing=True)
+        graph.add_vertex('G')
+
+        for method in ['0-1', 'dial', 'auto', 'dijkstra']:
+            self.assertEqual(
+                graph.find_shortest_path('A', 'F', method=method)[1], 1)
+            self.assertEqual(
+                graph.find_shortest_path('A', 'C', method=method), (['A', 'B', 'C'], 0))
+            self.assertIsNone(graph.find_shortest_path('A', 'G', method=method))
+
+    def test_shortest_path_bidirectional_directed(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges([
+            ('A', 'B', 1), ('B', 'C', 1), ('C', 'D', 1), ('D', 'E', 1),
+            ('A', 'E', 5), ('E', 'A', 1), ('B', 'D', 3), ('C', 'E', 1.5)
+        ], create_missing=True)
+
+        self.assertEqual(
+            graph.find_shortest_path('A', 'E', bidirectional=True),
+            (['A', 'B', 'C', 'E'], 3.5))
+        self.assertEqual(
+            graph.find_shortest_path('E', 'D', bidirectional=True),
+            (['E', 'A', 'B', 'C', 'D'], 4))
+        self.assertEqual(graph.get_predecessors_with_weights('E'),
+                         [('A', 5), ('C', 1.5), ('D', 1)])
+        # the in-edge index is kept up to date as edges are added
+        graph.add_edge('A', 'D', 1)
+        self.assertEqual(
+            graph.find_shortest_path('A', 'E', bidirectional=True),
+            (['A', 'D', 'E'], 2))
+    def make_grid(self, size):
+        """A weighted grid, with the coordinates of each vertex."""
+        graph = WeightedGraph(is_directed=False)
+        coordinates = dict()
+        for row in range(size):
+            for col in range(size):
+                coordinates[(row, col)] = (row, col)
+                graph.add_vertex((row, col))
+        for row in range(size):
+            for col in range(size):
+                if col + 1 < size:
+                    graph.add_edge((row, col), (row, col + 1), 1 + (row * col) % 3)
+                if row + 1 < size:
+                    graph.add_edge((row, col), (row + 1, col), 1 + (row + col) % 2)
+        return graph, coordinates
+
+    def test_shortest_path_astar(self):
+        graph, coordinates = self.make_grid(12)
+        estimates = list()
+
+        def heuristic(vertex_id, target_id):
+            estimates.append(vertex_id)
+            return euclidean_distance(coordinates[vertex_id], coordinates[target_id])
+
+        path, weight = graph.find_shortest_path_astar((0, 0), (11, 0), heuristic)
+
+        self.assertEqual(weight, graph.find_shortest_path((0, 0), (11, 0))[1])
+        self.assertEqual(path[0], (0, 0))
+        self.assertEqual(path[-1], (11, 0))
+        # the heuristic steers the search away from most of the grid
+        self.assertLess(len(estimates), 12 * 12 / 2)
+
+    def test_shortest_path_astar_coordinates(self):
+        graph, coordinates = self.make_grid(6)
+
+        for target_id in [(5, 5), (0, 3), (0, 0)]:
+            self.assertEqual(
+                graph.find_shortest_path_astar((0, 0), target_id, coordinates)[1],
+                graph.find_shortest_path((0, 0), target_id)[1])
+
+    def test_shortest_path_astar_haversine(self):
+        graph = WeightedGraph(is_directed=True)
+        coordinates = {
+            'paris': (48.8566, 2.3522), 'lyon': (45.764, 4.8357),
+            'geneva': (46.2044, 6.1432), 'milan': (45.4642, 9.19),
+        }
+        graph.add_edges([
+            ('paris', 'lyon', 465), ('lyon', 'geneva', 150),
+            ('geneva', 'milan', 320), ('lyon', 'milan', 520),
+            ('paris', 'geneva', 540)
+        ], create_missing=True)
+
+        self.assertEqual(
+            graph.find_shortest_path_astar(
+                'paris', 'milan', coordinates, metric='haversine'),
+            (['paris', 'geneva', 'milan'], 860))
+        self.assertIsNone(
+            graph.find_shortest_path_astar('milan', 'paris', coordinates, 'haversine'))
+
+    def test_shortest_path_astar_without_heuristic(self):
+        graph = self.make_large_graph()
+
+        self.assertEqual(
+            graph.find_shortest_path_astar('A', 'J'), graph.find_shortest_path('A', 'J'))
+
+    def test_floyd_warshall(self):
+        graph = self.make_large_graph()
+
+        dist = graph.floyd_warshall()
+
+        self.assertEqual(dist['A']['J'], 21)
+        self.assertEqual(dist['J']['A'], 21)
+        self.assertEqual(dist['E']['E'], 0)
+        for start_id in graph.vertex_dict:
+            for target_id in graph.vertex_dict:
+                _, weight = graph.find_shortest_path(start_id, target_id)
+                self.assertEqual(dist[start_id][target_id], weight)
+
+    def test_floyd_warshall_path(self):
+        graph = self.make_large_graph()
+
+        vertex_ids, dist, pred = graph.floyd_warshall_matrix()
+
+        self.assertEqual(
+            graph.floyd_warshall_path(vertex_ids, pred, 'A', 'J'),
+            ['A', 'C', 'F', 'H', 'J'])
+        self.assertEqual(graph.floyd_warshall_path(vertex_ids, pred, 'A', 'A'), ['A'])
+
+    def test_floyd_warshall_directed(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges(
+            [('A', 'B', 4), ('B', 'C', -2), ('A', 'C', 3), ('D', 'A', 1)],
+            create_missing=True)
+
+        vertex_ids, dist, pred = graph.floyd_warshall_matrix()
+
+        self.assertEqual(graph.floyd_warshall()['A']['C'], 2)
+        self.assertEqual(graph.floyd_warshall()['C']['A'], float('inf'))
+        self.assertEqual(
+            graph.floyd_warshall_path(vertex_ids, pred, 'D', 'C'), ['D', 'A', 'B', 'C'])
+        self.assertIsNone(graph.floyd_warshall_path(vertex_ids, pred, 'C', 'A'))
+
+    def test_floyd_warshall_negative_cycle(self):
+        graph = WeightedGraph(is_directed=True)
+        graph.add_edges(
+            [('A', 'B', 1), ('B', 'C', -3), ('C', 'A', 1)], create_missing=True)
+
+        with self.assertRaises(ValueError):
+            graph.floyd_warshall()
+
+    def test_floyd_warshall_without_numpy(self):
+        """The pure-Python fallback gives the same answers."""
+        graph = self.make_large_graph()
+        graph.add_vertex('lonely')
+        expected = graph.floyd_warshall()
+
+        with mock.patch.object(weighted_graph, 'np', None):
+            vertex_ids, dist, pred = graph.floyd_warshall_matrix()
+            self.assertEqual(graph.floyd_warshall(), expected)
+        self.assertIsInstance(dist, list)
+        self.assertEqual(
+            graph.floyd_warshall_path(vertex_ids, pred, 'A', 'J'),
+            ['A', 'C', 'F', 'H', 'J'])
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Binary graph files hold a frozen CSRGraph, laid out as:
+
+    header    MAGIC, version, flags, V, E, size of the id table in bytes
+    id table  int ids:    V int64 values
+              string ids: V + 1 int64 offsets, then the UTF-8 bytes of all ids
+    offsets   V + 1 int64 values
+    targets   E int32 values
+    weights   E float64 values (weighted graphs only)
+
+Every section starts on an 8-byte boundary, and numbers are little-endian.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from graphs.csr import CSRGraph
+
+MAGIC = b'GRAPHCSR'
+VERSION = 1
+HEADER = struct.Struct('<8sHHxxxxqqq')
+
+# flag bits
+DIRECTED = 1
+WEIGHTED = 2
+INT_IDS = 4
+
+
+def _padding(size):
+    """Return the number of bytes needed to round size up to a multiple of 8."""
+    return -size % 8
+
+
+def _encode_ids(vertex_ids):
+    """
+    Encode the id table.
+
+    Arguments:
+    vertex_ids (list): The id of the vertex at each index (all ints or all strings)
+
+    Returns:
+    tuple: (bytes, boolean) the encoded table, and whether the ids are ints
+    """
+    if all(type(vertex_id) is int for vertex_id in vertex_ids):
+        return array('q', vertex_ids).tobytes(), True
+    if not all(isinstance(vertex_id, str) for vertex_id in vertex_ids):
+        raise TypeError('Only graphs whose ids are all ints or all strings '
+                        'can be saved in the binary format')
+    encoded = [vertex_id.encode('utf-8') for vertex_id in vertex_ids]
+    offsets = array('q', [0])
+    for id_bytes in encoded:
+        offsets.append(offsets[-1] + len(id_bytes))
+    return offsets.tobytes() + b''.join(encoded), False
+
+
+def _decode_ids(buffer, num_vertices, int_ids):
+    """Decode the id table, given a memoryview over exactly its bytes."""
+    if int_ids:
+        return buffer.cast('q').tolist()
+    offset_bytes = 8 * (num_vertices + 1)
+    offsets = buffer[:offset_bytes].cast('q')
+    text = bytes(buffer[offset_bytes:])
+    return [
+        text[offsets[i]:offsets[i + 1]].decode('utf-8')
+        for i in range(num_vertices)
+    ]
+
+
+def save_graph_binary(graph, filename):
+    """
+    Write a graph to the specified filename in the binary format.
+
+    Arguments:
+    graph (Graph or CSRGraph): The graph to save; Graph and WeightedGraph
+    objects are frozen with to_csr() first
+    filename (string): The relative path of the file to be written
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.to_csr()
+    id_table, int_ids = _encode_ids(list(csr.vertex_ids))
+    flags = (
+        (DIRECTED if csr.is_directed else 0)
+        | (WEIGHTED if csr.is_weighted() else 0)
+        | (INT_IDS if int_ids else 0)
+    )
+    sections = [id_table, array('q', csr.offsets), array('i', csr.targets)]
+    if csr.is_weighted():
+        sections.append(array('d', csr.weights))
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, csr.num_vertices(),
+                            csr.num_edges(), len(id_table)))
+        for section in sections:
+            if isinstance(section, array):
+                if sys.byteorder != 'little':
+                    section.byteswap()
+                section = section.tobytes()
+            f.write(section)
+            f.write(bytes(_padding(len(section))))
+
+
+def load_graph_binary(filename):
+    """
+    Memory-map a file written by save_graph_binary, and return it as a
+    read-only CSRGraph.
+
+    The offsets, targets and weights arrays are views straight into the
+    mapped file, so they are not copied into memory, and several processes
+    loading the same file share a single copy through the OS page cache.
+    Only the id table is decoded.
+
+    Arguments:
+    filename (string): The relative path of the file to be loaded
+
+    Returns:
+    CSRGraph: The frozen graph
+    """
+    if sys.byteorder != 'little':
+        raise ValueError('Binary graph files can only be mapped on '
+                         'little-endian machines')
+    with open(filename, 'rb') as f:
+        # the mapping stays open for as long as the views into it are alive
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mapped)
+    if len(buffer) < HEADER.size:
+        raise ValueError('This file is not a binary graph')
+    magic, version, flags, num_vertices, num_edges, id_table_size = (
+        HEADER.unpack_from(buffer)
+    )
+    if magic != MAGIC:
+        raise ValueError('This file is not a binary graph')
+    if version != VERSION:
+        raise ValueError(f'Unsupported binary graph version: {version}')
+
+    def section(start, size):
+        """Return the view of one section, and where the next one starts."""
+        end = start + size
+        if end > len(buffer):
+            raise ValueError('This binary graph file is truncated')
+        return buffer[start:end], end + _padding(size)
+
+    id_table, start = section(HEADER.size, id_table_size)
+    offsets, start = section(start, 8 * (num_vertices + 1))
+    targets, start = section(start, 4 * num_edges)
+    weights = None
+    if flags & WEIGHTED:
+        weights, start = section(start, 8 * num_edges)
+        weights = weights.cast('d')
+    vertex_ids = _decode_ids(id_table, num_vertices, flags & INT_IDS)
+    return CSRGraph(vertex_ids, offsets.cast('q'), targets.cast('i'),
+                    weights, is_directed=bool(flags & DIRECTED))
@@ -1,46 +1,117 @@
+import os
+from itertools import islice
 from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
 
 
-def read_graph_from_file(filename):
+def parse_edge(line):
+    """
+    Parse one edge line of a graph file, such as "(A,B)" or "(A,B,3)".
+
+    Arguments:
+    line (string): The text of the line, without the trailing newline
+
+    Returns:
+    tuple: (vertex_id1, vertex_id2) for unweighted edges, or
+    (vertex_id1, vertex_id2, weight) for weighted ones
+    """
+    fields = [field.strip() for field in line.strip().strip('()').split(',')]
+    if len(fields) == 2:
+        return fields[0], fields[1]
+    if len(fields) == 3:
+        return fields[0], fields[1], parse_weight(fields[2])
+    raise ValueError(f'Invalid edge: {line}')
+
+
+def parse_weight(text):
+    """Return the weight as an int if it is a whole number, else a float."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def iter_edges(lines):
+    """
+    Lazily parse edge lines, skipping blank ones.
+
+    Arguments:
+    lines (iterable<string>): The edge lines of a graph file
+
+    Returns:
+    generator<tuple>: One parsed edge (see parse_edge) per non-blank line
+    """
+    for line in lines:
+        if line.strip():
+            yield parse_edge(line)
+
+
+def read_graph_from_file(filename, batch_size=10000, progress=None):
     """
     Read in data from the specified filename, and create and return a graph
     object corresponding to that data.
 
+    The file is streamed one line at a time, and the edges are added to the
+    graph in batches of `batch_size`, so memory use does not grow with the
+    size of the file. If the edges have a third field, e.g. "(A,B,3)", a
+    WeightedGraph is returned.
+
     Arguments:
     filename (string): The relative path of the file to be processed
+    batch_size (integer): How many edges to parse before adding them
+    progress (callable): Optional, called as progress(bytes_read, total_bytes)
+    after every batch
 
     Returns:
     Graph: A directed or undirected Graph object containing the specified
     vertices and edges
     """
-    # Open the file
-    with open(filename) as f:
-        # read in all lines from the file, without the '\n' characters
-        lines = [line[:-1] for line in f.readlines()]
+    total_bytes = os.path.getsize(filename)
+    # Open the file in binary mode, so we can count the bytes read so far
+    with open(filename, 'rb') as f:
+        bytes_read = 0
+
+        def lines():
+            """Decode the file line by line, keeping count of the bytes."""
+            nonlocal bytes_read
+            for raw_line in f:
+                bytes_read += len(raw_line)
+                yield raw_line.decode('utf-8').rstrip('\r\n')
+
+        line_iter = lines()
         # Use the first line (D/G) to create a directed/undirected graph
-        directed_char = lines[0]
+        directed_char = next(line_iter, '').strip()
         # raise a ValueError if needed
         if not (directed_char == 'G' or directed_char == 'D'):
-            raise ValueError('This graph has an invalid type') 
+            raise ValueError('This graph has an invalid type')
         is_directed = (directed_char == 'D')
-        graph = Graph(is_directed)
-        # Use the second line to add the vertices to the graph
-        vertex_ids = lines[1].split(',')
-        for id in vertex_ids:
-            graph.add_vertex(id)
-        # Use the 3rd+ line to add the edges to the graph
-        for index, line in enumerate(lines):
-            if index >= 2:
-                # get ids of the vertices
-                ids = line[1:4].split(',')
-                # add an edge from the first vertex to the second
-                vertex1, vertex2 = ids[0], ids[1]
-                graph.add_edge(vertex1, vertex2)
+        # The second line lists the vertices
+        vertex_ids = [
+            vertex_id.strip() for vertex_id in next(line_iter, '').split(',')
+            if vertex_id.strip()
+        ]
+        # Peek at the first edge, to tell if the graph is weighted
+        edge_iter = iter_edges(line_iter)
+        first_edge = next(edge_iter, None)
+        is_weighted = first_edge is not None and len(first_edge) == 3
+        graph = WeightedGraph(is_directed) if is_weighted else Graph(is_directed)
+        graph.add_vertices(vertex_ids)
+        # Use the 3rd+ line to add the edges to the graph, a batch at a time
+        batch = [first_edge] if first_edge is not None else []
+        batch.extend(islice(edge_iter, batch_size - len(batch)))
+        while batch:
+            if any(len(edge) != len(first_edge) for edge in batch):
+                raise ValueError('Either all edges or none must have weights')
+            graph.add_edges(batch)
+            if progress is not None:
+                progress(bytes_read, total_bytes)
+            batch = list(islice(edge_iter, batch_size))
         # Return the Graph
         return graph
 
+
 if __name__ == '__main__':
     filename = 'test.txt'
     graph = read_graph_from_file(filename)
 
-    print(graph)
\ No newline at end of file
+    print(graph)